@@ -30,7 +30,7 @@ if not JWT_SECRET_KEY:
 
 # ── Import services needed at startup ──────────────────────────────────
 from backend.database.db_config import test_connection, get_database_info
-from backend.services.prediction_service import PredictionService
+from backend.services.model_registry import ModelRegistry
 
 # ── Import blueprint registrar ─────────────────────────────────────────
 from backend.routes import register_blueprints
@@ -68,6 +68,17 @@ def revoked_token_callback(jwt_header, jwt_payload):
 # ── Register all route blueprints ──────────────────────────────────────
 register_blueprints(app)
 
+# Batch jobs interrupted by a restart are resumed once per deploy by
+# backend/scripts/resume_batch_jobs.py, not by every worker at import
+
+# ── Re-score students whose data changed (dirty-student queue) ────────
+from backend.services.rescore_service import RescoreService
+RescoreService.start_worker()
+
+# ── Deliver queued email (outbox) ──────────────────────────────────────
+from backend.services.outbox_service import OutboxService
+OutboxService.start_worker()
+
 # ══════════════════════════════════════════════════════════════════════
 # HEALTH CHECK
 # ══════════════════════════════════════════════════════════════════════
@@ -123,8 +134,9 @@ def print_startup_message():
     print(f"🔐 Authentication : JWT ({app.config['JWT_ACCESS_TOKEN_EXPIRES']}s tokens)")
     print(f"💾 Database       : PostgreSQL")
     print(f"🌐 CORS           : Enabled")
-    print(f"🤖 ML Model       : {'Loaded' if PredictionService.model else 'Using dummy predictions'}")
-    print(f"📦 Routes         : 13 blueprint files")
+    model = ModelRegistry.get_active()
+    print(f"🤖 ML Model       : {f'Loaded (version {model.version})' if model.model else 'Using dummy predictions'}")
+    print(f"📦 Routes         : 14 blueprint files")
     print(f"🔖 Version        : 3.0 (Refactored)")
     print("\n🔑 Default Accounts:")
     print("   Admin:   admin@scholarsense.com")
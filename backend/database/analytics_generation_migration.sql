@@ -0,0 +1,42 @@
+-- ============================================
+-- ANALYTICS GENERATION - Cross-process overview invalidation
+-- ScholarSense - AI-Powered Academic Intelligence System
+-- Every write to a table the school overview reads advances one
+-- sequence; AnalyticsService compares it with the generation its
+-- cached snapshot was built at, so writes from any process (other
+-- gunicorn workers, background workers, CLI scripts) invalidate it.
+-- Statement-level triggers: one nextval per statement, not per row,
+-- and sequences never block concurrent writers.
+-- ============================================
+
+CREATE SEQUENCE IF NOT EXISTS analytics_overview_generation;
+
+CREATE OR REPLACE FUNCTION bump_analytics_overview_generation()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM nextval('analytics_overview_generation');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    source_table TEXT;
+BEGIN
+    FOREACH source_table IN ARRAY ARRAY[
+        'students', 'academic_records', 'student_latest_risk',
+        'attendance', 'behavioral_incidents', 'communications'
+    ]
+    LOOP
+        EXECUTE format(
+            'DROP TRIGGER IF EXISTS bump_analytics_overview ON %I', source_table
+        );
+        EXECUTE format(
+            'CREATE TRIGGER bump_analytics_overview '
+            'AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_analytics_overview_generation()',
+            source_table
+        );
+    END LOOP;
+    RAISE NOTICE '✅ analytics overview generation triggers created successfully!';
+END $$;
@@ -0,0 +1,48 @@
+-- ============================================
+-- ATTENDANCE INDEXES - Bulk upsert target and date-window scans
+-- ScholarSense - AI-Powered Academic Intelligence System
+-- AttendanceService.mark_bulk_attendance upserts whole-day rows
+-- (period 'all_day') with INSERT ... ON CONFLICT on schema.sql's
+-- UNIQUE(student_id, attendance_date, period); rows for other periods
+-- are never touched. idx_attendance_student_date backs per-student
+-- date-window scans (stats, low attendance).
+--
+-- An earlier version of this migration deleted rows that differed only
+-- by period and enforced one row per student per day
+-- (uq_attendance_student_date). If that version ran, restore the
+-- deleted period rows from a backup taken before it.
+-- ============================================
+
+-- Databases created from the ORM models may not have the column yet
+ALTER TABLE attendance ADD COLUMN IF NOT EXISTS period VARCHAR(20) DEFAULT 'all_day';
+
+-- Conflict target, unless schema.sql's UNIQUE constraint already provides it
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_index i
+        WHERE i.indrelid = 'attendance'::regclass
+          AND i.indisunique
+          AND (
+              SELECT array_agg(a.attname::text ORDER BY k.ord)
+              FROM unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)
+              JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+          ) = ARRAY['student_id', 'attendance_date', 'period']
+    ) THEN
+        CREATE UNIQUE INDEX uq_attendance_student_date_period
+            ON attendance(student_id, attendance_date, period);
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_attendance_student_date
+    ON attendance(student_id, attendance_date);
+
+-- One-row-per-day index from the earlier version: contradicts the
+-- per-period constraint
+DROP INDEX IF EXISTS uq_attendance_student_date;
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ attendance indexes created successfully!';
+END $$;
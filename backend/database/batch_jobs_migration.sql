@@ -0,0 +1,37 @@
+-- ============================================
+-- BATCH JOBS TABLE - Async batch predictions
+-- ScholarSense - AI-Powered Academic Intelligence System
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    id              SERIAL PRIMARY KEY,
+    status          VARCHAR(20) NOT NULL DEFAULT 'queued'
+                    CHECK (status IN ('queued', 'running', 'completed', 'failed')),
+    filters         JSONB,
+    triggered_by    INTEGER REFERENCES users(id),
+    total           INTEGER DEFAULT 0,
+    done            INTEGER DEFAULT 0,
+    success         INTEGER DEFAULT 0,
+    skipped         INTEGER DEFAULT 0,
+    failed          INTEGER DEFAULT 0,
+    risk_summary    JSONB,
+    results         JSONB,
+    error_message   TEXT,
+    worker_id       VARCHAR(64),
+    created_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at      TIMESTAMP,
+    finished_at     TIMESTAMP,
+    updated_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Run owner: a worker only writes to (and heartbeats) jobs it still owns
+ALTER TABLE batch_jobs ADD COLUMN IF NOT EXISTS worker_id VARCHAR(64);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_batch_jobs_status     ON batch_jobs(status);
+CREATE INDEX IF NOT EXISTS idx_batch_jobs_created_at ON batch_jobs(created_at);
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ batch_jobs table created successfully!';
+END $$;
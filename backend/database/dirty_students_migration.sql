@@ -0,0 +1,26 @@
+-- ============================================
+-- DIRTY STUDENTS - Incremental re-scoring queue
+-- ScholarSense - AI-Powered Academic Intelligence System
+-- Written alongside marks / attendance / incident / academic changes;
+-- drained by RescoreService (background worker or nightly script),
+-- which leases rows while it scores them and deletes them afterwards.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS dirty_students (
+    student_id  INTEGER PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    reason      VARCHAR(30),
+    marked_at   TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    claimed_at  TIMESTAMP,
+    claimed_by  VARCHAR(64)
+);
+
+-- Lease taken by a re-scoring batch (expires after RESCORE_LEASE_SECONDS)
+ALTER TABLE dirty_students ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP;
+ALTER TABLE dirty_students ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(64);
+
+CREATE INDEX IF NOT EXISTS idx_dirty_students_marked_at ON dirty_students(marked_at);
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ dirty_students table created successfully!';
+END $$;
@@ -0,0 +1,51 @@
+-- ============================================
+-- EMAIL OUTBOX - Durable outbound email queue
+-- ScholarSense - AI-Powered Academic Intelligence System
+-- The API only inserts rows here (in the same transaction as the
+-- communication / notification they belong to); OutboxService workers
+-- deliver them with retries and per-domain rate limits.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id               SERIAL PRIMARY KEY,
+    idempotency_key  VARCHAR(200) NOT NULL UNIQUE,
+    source_type      VARCHAR(20)  NOT NULL
+                     CHECK (source_type IN ('communication', 'notification', 'report')),
+    source_id        INTEGER,
+    from_addr        VARCHAR(255) NOT NULL,
+    to_email         VARCHAR(255) NOT NULL,
+    to_domain        VARCHAR(255) NOT NULL,
+    subject          VARCHAR(500),
+    message          TEXT NOT NULL,
+    status           VARCHAR(20)  NOT NULL DEFAULT 'queued'
+                     CHECK (status IN ('queued', 'sending', 'sent', 'failed')),
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    max_attempts     INTEGER NOT NULL DEFAULT 6,
+    next_attempt_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_at        TIMESTAMP,
+    locked_by        VARCHAR(64),
+    last_error       TEXT,
+    created_at       TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at          TIMESTAMP
+);
+
+-- Claim owner: a worker only settles (and heartbeats) rows it still holds
+ALTER TABLE email_outbox ADD COLUMN IF NOT EXISTS locked_by VARCHAR(64);
+
+-- Workers only ever look at due rows
+CREATE INDEX IF NOT EXISTS idx_outbox_due
+    ON email_outbox(next_attempt_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_outbox_sending
+    ON email_outbox(locked_at) WHERE status = 'sending';
+CREATE INDEX IF NOT EXISTS idx_outbox_source
+    ON email_outbox(source_type, source_id);
+
+-- Communications now start out 'queued' and are settled by the worker
+ALTER TABLE communications DROP CONSTRAINT IF EXISTS communications_status_check;
+ALTER TABLE communications ADD CONSTRAINT communications_status_check
+    CHECK (status IN ('queued', 'sent', 'failed', 'pending'));
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ email_outbox table created successfully!';
+END $$;
@@ -0,0 +1,60 @@
+-- ============================================
+-- STUDENT LATEST RISK - Projection of newest prediction per student
+-- ScholarSense - AI-Powered Academic Intelligence System
+-- Kept up to date by PredictionService on every prediction write.
+-- Re-run the backfill (or backend/scripts/rebuild_latest_risk.py)
+-- after editing risk_predictions by hand.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS student_latest_risk (
+    student_id           INTEGER PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    prediction_id        INTEGER NOT NULL REFERENCES risk_predictions(id) ON DELETE CASCADE,
+    risk_level           INTEGER NOT NULL CHECK (risk_level BETWEEN 0 AND 3),
+    risk_label           VARCHAR(20) NOT NULL,
+    confidence_score     DECIMAL(5,2) NOT NULL,
+    probability_low      DECIMAL(5,2),
+    probability_medium   DECIMAL(5,2),
+    probability_high     DECIMAL(5,2),
+    probability_critical DECIMAL(5,2),
+    model_version        VARCHAR(20),
+    prediction_date      TIMESTAMP,
+    predicted_at         TIMESTAMP,
+    updated_at           TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_latest_risk_level ON student_latest_risk(risk_level);
+CREATE INDEX IF NOT EXISTS idx_latest_risk_label ON student_latest_risk(risk_label);
+CREATE INDEX IF NOT EXISTS idx_latest_risk_order
+    ON student_latest_risk(risk_level, confidence_score, student_id);
+
+-- Backfill / rebuild from prediction history
+INSERT INTO student_latest_risk (
+    student_id, prediction_id, risk_level, risk_label, confidence_score,
+    probability_low, probability_medium, probability_high, probability_critical,
+    model_version, prediction_date, predicted_at, updated_at
+)
+SELECT DISTINCT ON (student_id)
+    student_id, id, risk_level, risk_label, confidence_score,
+    probability_low, probability_medium, probability_high, probability_critical,
+    model_version, prediction_date, created_at, CURRENT_TIMESTAMP
+FROM risk_predictions
+ORDER BY student_id, id DESC
+ON CONFLICT (student_id) DO UPDATE SET
+    prediction_id        = EXCLUDED.prediction_id,
+    risk_level           = EXCLUDED.risk_level,
+    risk_label           = EXCLUDED.risk_label,
+    confidence_score     = EXCLUDED.confidence_score,
+    probability_low      = EXCLUDED.probability_low,
+    probability_medium   = EXCLUDED.probability_medium,
+    probability_high     = EXCLUDED.probability_high,
+    probability_critical = EXCLUDED.probability_critical,
+    model_version        = EXCLUDED.model_version,
+    prediction_date      = EXCLUDED.prediction_date,
+    predicted_at         = EXCLUDED.predicted_at,
+    updated_at           = CURRENT_TIMESTAMP;
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ student_latest_risk table created and backfilled!';
+END $$;
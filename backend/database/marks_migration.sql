@@ -0,0 +1,32 @@
+-- ============================================
+-- MARKS UNIQUE KEYS - Conflict targets for bulk marks entry
+-- ScholarSense - AI-Powered Academic Intelligence System
+-- MarksService.enter_marks_bulk upserts marks_entry on
+-- (student_id, semester, exam_type) and academic_records on
+-- (student_id, semester) with INSERT ... ON CONFLICT.
+-- ============================================
+
+-- Remove duplicates (keep the most recent row) before enforcing uniqueness
+DELETE FROM marks_entry a
+USING marks_entry b
+WHERE a.student_id = b.student_id
+  AND a.semester   = b.semester
+  AND a.exam_type  = b.exam_type
+  AND a.id < b.id;
+
+DELETE FROM academic_records a
+USING academic_records b
+WHERE a.student_id = b.student_id
+  AND a.semester   = b.semester
+  AND a.id < b.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_marks_student_semester_exam
+    ON marks_entry(student_id, semester, exam_type);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_academic_student_semester
+    ON academic_records(student_id, semester);
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ marks unique keys created successfully!';
+END $$;
@@ -2,7 +2,7 @@
 SQLAlchemy ORM Models
 ScholarSense - AI-Powered Academic Intelligence System
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Time, Text, DECIMAL, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Time, Text, DECIMAL, ForeignKey, CheckConstraint, Index, Computed
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
@@ -54,6 +54,8 @@ class Student(Base):
     __tablename__ = 'students'
     __table_args__ = (
         CheckConstraint('grade BETWEEN 6 AND 10', name='valid_grade'),
+        Index('idx_students_search_trgm', 'search_text',
+              postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'}),
     )
     
     id = Column(Integer, primary_key=True, index=True)
@@ -73,6 +75,11 @@ class Student(Base):
     is_active = Column(Boolean, default=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Lower-cased name / ID / parent text for trigram search (needs pg_trgm)
+    search_text = Column(Text, Computed(
+        "lower(first_name || ' ' || last_name || ' ' || student_id || ' ' || "
+        "coalesce(parent_name, ''))", persisted=True
+    ))
     
     # Relationships
     academic_records = relationship("AcademicRecord", back_populates="student", cascade="all, delete-orphan")
@@ -127,6 +134,9 @@ class Student(Base):
 class AcademicRecord(Base):
     """Academic performance records"""
     __tablename__ = 'academic_records'
+    __table_args__ = (
+        Index('uq_academic_student_semester', 'student_id', 'semester', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey('students.id', ondelete='CASCADE'), nullable=False, index=True)
@@ -176,11 +186,18 @@ class AcademicRecord(Base):
 
 class Attendance(Base):
     __tablename__ = 'attendance'
+    __table_args__ = (
+        # Conflict target for bulk upserts (schema.sql's UNIQUE constraint)
+        Index('uq_attendance_student_date_period',
+              'student_id', 'attendance_date', 'period', unique=True),
+        Index('idx_attendance_student_date', 'student_id', 'attendance_date'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     student_id = Column(Integer, ForeignKey('students.id'), nullable=False)
     attendance_date = Column(Date, nullable=False)
     status = Column(String(20), nullable=False)
+    period = Column(String(20), default='all_day', server_default='all_day')
     remarks = Column(Text)  # ← ADD THIS IF MISSING
     marked_by = Column(Integer, ForeignKey('users.id'))
     created_at = Column(DateTime, default=datetime.now)
@@ -256,6 +273,10 @@ class BehavioralIncident(Base):
 class MarksEntry(Base):
     """Marks entry records per student per exam"""
     __tablename__ = 'marks_entry'
+    __table_args__ = (
+        Index('uq_marks_student_semester_exam', 'student_id', 'semester', 'exam_type',
+              unique=True),
+    )
 
     id              = Column(Integer, primary_key=True, index=True)
     student_id      = Column(
@@ -404,6 +425,8 @@ class RiskPrediction(Base):
     model_version = Column(String(20), default='1.0')
     predicted_by = Column(Integer, ForeignKey('users.id'))
     created_at = Column(DateTime, default=datetime.utcnow)
+    feature_hash = Column(String(64))         # sha256 of encoded features + model version
+    last_confirmed_at = Column(DateTime)      # last time identical inputs re-confirmed it
     
     # Relationships
     student = relationship("Student", back_populates="predictions")
@@ -425,7 +448,121 @@ class RiskPrediction(Base):
             'probability_medium': float(self.probability_medium) if self.probability_medium else None,
             'probability_high': float(self.probability_high) if self.probability_high else None,
             'probability_critical': float(self.probability_critical) if self.probability_critical else None,
-            'model_version': self.model_version
+            'model_version': self.model_version,
+            'last_confirmed_at': self.last_confirmed_at.isoformat() if self.last_confirmed_at else None
+        }
+
+
+# ============================================
+# LATEST RISK PROJECTION
+# ============================================
+class StudentLatestRisk(Base):
+    """
+    One row per student mirroring their newest RiskPrediction.
+    Maintained on every prediction write so dashboards never have to
+    scan the whole prediction history.
+    """
+    __tablename__ = 'student_latest_risk'
+    __table_args__ = (
+        # Serves the risk-ordered keyset scan in BatchService.get_all_predictions
+        Index('idx_latest_risk_order', 'risk_level', 'confidence_score', 'student_id'),
+    )
+
+    student_id           = Column(Integer, ForeignKey('students.id', ondelete='CASCADE'),
+                                  primary_key=True)
+    prediction_id        = Column(Integer, ForeignKey('risk_predictions.id', ondelete='CASCADE'),
+                                  nullable=False)
+    risk_level           = Column(Integer, nullable=False, index=True)
+    risk_label           = Column(String(20), nullable=False, index=True)
+    confidence_score     = Column(DECIMAL(5, 2), nullable=False)
+    probability_low      = Column(DECIMAL(5, 2))
+    probability_medium   = Column(DECIMAL(5, 2))
+    probability_high     = Column(DECIMAL(5, 2))
+    probability_critical = Column(DECIMAL(5, 2))
+    model_version        = Column(String(20))
+    prediction_date      = Column(DateTime)
+    predicted_at         = Column(DateTime)   # created_at of the prediction row
+    feature_hash         = Column(String(64))
+    last_confirmed_at    = Column(DateTime)
+    updated_at           = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    student    = relationship("Student",        foreign_keys=[student_id])
+    prediction = relationship("RiskPrediction", foreign_keys=[prediction_id])
+
+    def __repr__(self):
+        return (f"<StudentLatestRisk(student_id={self.student_id}, "
+                f"risk='{self.risk_label}', prediction_id={self.prediction_id})>")
+
+    def to_dict(self):
+        """Same shape as RiskPrediction.to_dict() for the mirrored prediction"""
+        return {
+            'id': self.prediction_id,
+            'student_id': self.student_id,
+            'prediction_date': self.prediction_date.isoformat() if self.prediction_date else None,
+            'risk_level': self.risk_level,
+            'risk_label': self.risk_label,
+            'confidence_score': float(self.confidence_score) if self.confidence_score else None,
+            'probability_low': float(self.probability_low) if self.probability_low else None,
+            'probability_medium': float(self.probability_medium) if self.probability_medium else None,
+            'probability_high': float(self.probability_high) if self.probability_high else None,
+            'probability_critical': float(self.probability_critical) if self.probability_critical else None,
+            'model_version': self.model_version,
+            'last_confirmed_at': self.last_confirmed_at.isoformat() if self.last_confirmed_at else None
+        }
+
+
+# ============================================
+# BATCH JOB MODEL
+# ============================================
+class BatchJob(Base):
+    """Background batch prediction jobs (queued → running → completed/failed)"""
+    __tablename__ = 'batch_jobs'
+
+    id            = Column(Integer, primary_key=True, index=True)
+    status        = Column(String(20), nullable=False, default='queued', index=True)
+    filters       = Column(JSONB)
+    triggered_by  = Column(Integer, ForeignKey('users.id'))
+    total         = Column(Integer, default=0)
+    done          = Column(Integer, default=0)
+    success       = Column(Integer, default=0)
+    skipped       = Column(Integer, default=0)
+    failed        = Column(Integer, default=0)
+    risk_summary  = Column(JSONB)
+    results       = Column(JSONB)
+    error_message = Column(Text)
+    worker_id     = Column(String(64))
+    created_at    = Column(DateTime, default=datetime.utcnow)
+    started_at    = Column(DateTime)
+    finished_at   = Column(DateTime)
+    updated_at    = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    trigger_user  = relationship("User", foreign_keys=[triggered_by])
+
+    def __repr__(self):
+        return (f"<BatchJob(id={self.id}, status='{self.status}', "
+                f"done={self.done}/{self.total})>")
+
+    def to_dict(self):
+        """Progress view (results are fetched separately, paginated)"""
+        return {
+            'job_id'       : self.id,
+            'status'       : self.status,
+            'filters'      : self.filters or {},
+            'triggered_by' : self.triggered_by,
+            'total'        : self.total or 0,
+            'done'         : self.done or 0,
+            'success'      : self.success or 0,
+            'skipped'      : self.skipped or 0,
+            'failed'       : self.failed or 0,
+            'progress_pct' : round((self.done or 0) / self.total * 100, 1)
+                             if self.total else 0.0,
+            'risk_summary' : self.risk_summary or {},
+            'error_message': self.error_message,
+            'created_at'   : self.created_at.isoformat()  if self.created_at  else None,
+            'started_at'   : self.started_at.isoformat()  if self.started_at  else None,
+            'finished_at'  : self.finished_at.isoformat() if self.finished_at else None
         }
 
 
@@ -489,6 +626,12 @@ class Notification(Base):
                                  ondelete='SET NULL'), nullable=True)
     error_message      = Column(Text, nullable=True)
 
+    __table_args__ = (
+        # Covers the cooldown lookup in NotificationService._is_in_cooldown
+        Index('idx_notifications_cooldown', 'student_id', 'notification_type',
+              'status', sent_at.desc(), postgresql_include=['created_at']),
+    )
+
     # Relationships
     student        = relationship("Student",        foreign_keys=[student_id])
     academic_record= relationship("AcademicRecord", foreign_keys=[academic_record_id])
@@ -515,3 +658,86 @@ class Notification(Base):
             'prediction_id'    : self.prediction_id,
             'error_message'    : self.error_message
         }
+
+
+# ============================================
+# DIRTY STUDENTS (incremental re-scoring queue)
+# ============================================
+class DirtyStudent(Base):
+    """
+    Students whose inputs changed since their last prediction.
+    One row per student: repeated writes only move marked_at forward
+    (and drop any lease). The re-scorer leases rows while it scores
+    them and deletes the ones nobody re-marked in the meantime.
+    """
+    __tablename__ = 'dirty_students'
+
+    student_id = Column(Integer, ForeignKey('students.id', ondelete='CASCADE'),
+                        primary_key=True)
+    reason     = Column(String(30))   # marks / attendance / incident / academic
+    marked_at  = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    claimed_at = Column(DateTime)       # lease start, None while waiting
+    claimed_by = Column(String(64))     # batch holding the lease
+
+    def __repr__(self):
+        return f"<DirtyStudent(student_id={self.student_id}, reason='{self.reason}')>"
+
+
+# ============================================
+# EMAIL OUTBOX (durable outbound email queue)
+# ============================================
+class EmailOutbox(Base):
+    """
+    Outbound email waiting for (or done with) delivery.
+    queued → sending → sent, or back to queued with a later
+    next_attempt_at after a transient failure, and failed once
+    max_attempts is reached or the server rejects it permanently.
+    """
+    __tablename__ = 'email_outbox'
+
+    id              = Column(Integer, primary_key=True, index=True)
+    idempotency_key = Column(String(200), nullable=False, unique=True)
+    source_type     = Column(String(20), nullable=False)   # communication / notification / report
+    source_id       = Column(Integer)
+    from_addr       = Column(String(255), nullable=False)
+    to_email        = Column(String(255), nullable=False)
+    to_domain       = Column(String(255), nullable=False)
+    subject         = Column(String(500))
+    message         = Column(Text, nullable=False)         # full RFC 822 message
+    status          = Column(String(20), nullable=False, default='queued')
+    attempts        = Column(Integer, nullable=False, default=0)
+    max_attempts    = Column(Integer, nullable=False, default=6)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_at       = Column(DateTime)                     # refreshed while sending
+    locked_by       = Column(String(64))                   # claiming batch
+    last_error      = Column(Text)
+    created_at      = Column(DateTime, default=datetime.utcnow)
+    sent_at         = Column(DateTime)
+
+    __table_args__ = (
+        Index('idx_outbox_due', 'next_attempt_at',
+              postgresql_where=(status == 'queued')),
+        Index('idx_outbox_sending', 'locked_at',
+              postgresql_where=(status == 'sending')),
+        Index('idx_outbox_source', 'source_type', 'source_id'),
+    )
+
+    def __repr__(self):
+        return (f"<EmailOutbox(id={self.id}, to='{self.to_email}', "
+                f"status='{self.status}', attempts={self.attempts})>")
+
+    def to_dict(self):
+        return {
+            'id'             : self.id,
+            'source_type'    : self.source_type,
+            'source_id'      : self.source_id,
+            'to_email'       : self.to_email,
+            'subject'        : self.subject,
+            'status'         : self.status,
+            'attempts'       : self.attempts,
+            'max_attempts'   : self.max_attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error'     : self.last_error,
+            'created_at'     : self.created_at.isoformat() if self.created_at else None,
+            'sent_at'        : self.sent_at.isoformat() if self.sent_at else None
+        }
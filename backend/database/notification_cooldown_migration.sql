@@ -0,0 +1,19 @@
+-- ============================================
+-- NOTIFICATION COOLDOWN INDEX
+-- ScholarSense - AI-Powered Academic Intelligence System
+-- Cooldown checks look up the latest sent / queued alert of one type
+-- for one student. This index answers them (and the sweep's
+-- recent-alerts aggregate) with an index-only scan: sent_at for
+-- delivered alerts, created_at (INCLUDE) for ones still queued.
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_notifications_cooldown
+    ON notifications(student_id, notification_type, status, sent_at DESC)
+    INCLUDE (created_at);
+
+ANALYZE notifications;
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ notification cooldown index created successfully!';
+END $$;
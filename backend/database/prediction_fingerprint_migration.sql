@@ -0,0 +1,24 @@
+-- ============================================
+-- PREDICTION FINGERPRINTS - Skip re-scoring unchanged inputs
+-- ScholarSense - AI-Powered Academic Intelligence System
+-- feature_hash = sha256 of the encoded feature vector + model version.
+-- When a new request hashes to the student's latest prediction, the
+-- service only bumps last_confirmed_at instead of inserting a row.
+-- ============================================
+
+ALTER TABLE risk_predictions
+    ADD COLUMN IF NOT EXISTS feature_hash      VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS last_confirmed_at TIMESTAMP;
+
+ALTER TABLE student_latest_risk
+    ADD COLUMN IF NOT EXISTS feature_hash      VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS last_confirmed_at TIMESTAMP;
+
+-- Existing rows: confirmed when created, no fingerprint (re-scored once)
+UPDATE risk_predictions    SET last_confirmed_at = created_at   WHERE last_confirmed_at IS NULL;
+UPDATE student_latest_risk SET last_confirmed_at = predicted_at WHERE last_confirmed_at IS NULL;
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ prediction fingerprint columns added successfully!';
+END $$;
@@ -133,6 +133,7 @@ CREATE INDEX IF NOT EXISTS idx_students_active ON students(is_active);
 CREATE INDEX IF NOT EXISTS idx_students_student_id ON students(student_id);
 CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance(attendance_date);
 CREATE INDEX IF NOT EXISTS idx_attendance_student ON attendance(student_id);
+CREATE INDEX IF NOT EXISTS idx_attendance_student_date ON attendance(student_id, attendance_date);
 CREATE INDEX IF NOT EXISTS idx_academic_student ON academic_records(student_id);
 CREATE INDEX IF NOT EXISTS idx_academic_semester ON academic_records(semester);
 CREATE INDEX IF NOT EXISTS idx_behavioral_student ON behavioral_incidents(student_id);
@@ -0,0 +1,23 @@
+-- ============================================
+-- STUDENT SEARCH - Trigram index over name / ID / parent
+-- ScholarSense - AI-Powered Academic Intelligence System
+-- Backs GET /api/students/search (StudentService.search_students):
+-- substring, prefix and fuzzy matches all use the GIN index.
+-- ============================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE students
+    ADD COLUMN IF NOT EXISTS search_text TEXT
+    GENERATED ALWAYS AS (
+        lower(first_name || ' ' || last_name || ' ' || student_id || ' ' ||
+              coalesce(parent_name, ''))
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_students_search_trgm
+    ON students USING gin (search_text gin_trgm_ops);
+
+DO $$
+BEGIN
+    RAISE NOTICE '✅ student search index created successfully!';
+END $$;
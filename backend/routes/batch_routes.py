@@ -1,8 +1,9 @@
 # backend/routes/batch_routes.py
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
+from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from backend.services.batch_service import BatchService
+from backend.services.batch_job_service import BatchJobService
 
 batch_bp = Blueprint('batch', __name__)
 
@@ -26,17 +27,89 @@ def run_batch_predictions():
         return jsonify({'error': str(e)}), 500
 
 
+# POST /api/batch/jobs  — queue a background batch run
+@batch_bp.route('/api/batch/jobs', methods=['POST'])
+@jwt_required()
+def submit_batch_job():
+    try:
+        data = request.get_json() or {}
+        filters = {
+            'grade':   data.get('grade'),
+            'section': data.get('section'),
+        }
+        result = BatchJobService.submit_job(
+            filters=filters, triggered_by=int(get_jwt_identity())
+        )
+        if result.get('status') != 'success':
+            return jsonify(result), 500
+        return jsonify(result), 202
+    except Exception as e:
+        print(f"❌ Batch job submit error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+# GET /api/batch/jobs
+@batch_bp.route('/api/batch/jobs', methods=['GET'])
+@jwt_required()
+def list_batch_jobs():
+    try:
+        limit  = request.args.get('limit', 20, type=int)
+        result = BatchJobService.list_jobs(limit=limit)
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"❌ List batch jobs error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+# GET /api/batch/jobs/<job_id>  — progress polling
+@batch_bp.route('/api/batch/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_batch_job(job_id):
+    try:
+        result = BatchJobService.get_job(job_id)
+        if result.get('status') != 'success':
+            return jsonify(result), 404
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"❌ Get batch job error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+# GET /api/batch/jobs/<job_id>/results?page=&per_page=
+@batch_bp.route('/api/batch/jobs/<int:job_id>/results', methods=['GET'])
+@jwt_required()
+def get_batch_job_results(job_id):
+    try:
+        result = BatchJobService.get_job_results(
+            job_id,
+            page     = request.args.get('page', 1, type=int),
+            per_page = request.args.get('per_page', 100, type=int)
+        )
+        if result.get('status') != 'success':
+            code = 404 if 'not found' in result.get('message', '') else 409
+            return jsonify(result), code
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"❌ Get batch job results error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 # GET /api/batch/predictions
 @batch_bp.route('/api/batch/predictions', methods=['GET'])
 @jwt_required()
 def get_batch_predictions():
     try:
         filters = {
-            'grade':   request.args.get('grade', type=int),
-            'section': request.args.get('section'),
-            'limit':   request.args.get('limit', 100, type=int),
+            'grade':      request.args.get('grade', type=int),
+            'section':    request.args.get('section'),
+            'risk_label': request.args.get('risk_label'),
+            'limit':      request.args.get('limit', 100, type=int),
+            'cursor':     request.args.get('cursor'),
+            'count_only': request.args.get('count_only', '').lower() in ('1', 'true'),
         }
         result = BatchService.get_all_predictions(filters=filters)
+        if result.get('status') == 'error':
+            return jsonify(result), 400
         return jsonify(result), 200
     except Exception as e:
         print(f"❌ Get batch predictions error: {e}")
@@ -1,14 +1,15 @@
 # backend/routes/communication_routes.py
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 import os
-import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
+from email.utils import make_msgid
 from email import encoders
 
 from backend.services.communication_service import CommunicationService
+from backend.services.outbox_service import OutboxService
 from backend.services.pdf_service import PDFService
 from backend.database.db_config import SessionLocal
 from backend.database.models import Student
@@ -25,10 +26,14 @@ def send_communication():
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         sent_by = get_jwt_identity()
-        result  = CommunicationService.send_communication(data, sent_by=sent_by)
+        result  = CommunicationService.send_communication(
+            data, sent_by=sent_by,
+            idempotency_key=request.headers.get('Idempotency-Key')
+        )
         if result.get('status') == 'error':
             return jsonify(result), 400
-        return jsonify(result), 200
+        # Queued for the outbox worker; a replayed key returns the original
+        return jsonify(result), 200 if result.get('duplicate') else 202
     except Exception as e:
         print(f"❌ Send communication error: {e}")
         return jsonify({'error': str(e)}), 500
@@ -47,14 +52,15 @@ def send_batch_communications():
         comm_type   = data.get('communication_type', 'Risk Alert')
         extra_data  = data.get('extra_data', {})
         result = CommunicationService.batch_send(
-            student_ids = student_ids,
-            comm_type   = comm_type,
-            extra_data  = extra_data,
-            sent_by     = sent_by
+            student_ids     = student_ids,
+            comm_type       = comm_type,
+            extra_data      = extra_data,
+            sent_by         = sent_by,
+            idempotency_key = request.headers.get('Idempotency-Key')
         )
         if result.get('status') == 'error':
             return jsonify(result), 400
-        return jsonify(result), 200
+        return jsonify(result), 202
     except Exception as e:
         print(f"❌ Batch communication error: {e}")
         return jsonify({'error': str(e)}), 500
@@ -92,6 +98,21 @@ def get_communication_stats():
         return jsonify({'error': str(e)}), 500
 
 
+# GET /api/communications/outbox
+@communication_bp.route('/api/communications/outbox', methods=['GET'])
+@jwt_required()
+def get_outbox_stats():
+    claims = get_jwt()
+    if claims.get('role') != 'admin':
+        return jsonify({'error': 'Admin access required'}), 403
+    try:
+        result = OutboxService.get_stats()
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"❌ Get outbox stats error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 # GET /api/communications/templates
 @communication_bp.route('/api/communications/templates', methods=['GET'])
 @jwt_required()
@@ -141,8 +162,6 @@ def send_report_email():
         # Build email
         email_user = os.getenv('EMAIL_USER')
         email_password = os.getenv('EMAIL_PASSWORD')
-        email_host = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
-        email_port = int(os.getenv('EMAIL_PORT', 587))
         from_name = os.getenv('EMAIL_FROM_NAME', 'ScholarSense')
 
         if not email_user or not email_password:
@@ -152,6 +171,7 @@ def send_report_email():
         msg['From']    = f"{from_name} <{email_user}>"
         msg['To']      = student.parent_email
         msg['Subject'] = f"Academic Report - {student.first_name} {student.last_name}"
+        msg['Message-ID'] = make_msgid(domain=email_user.rsplit('@', 1)[-1])
 
         body = (
             f"Dear {student.parent_name or 'Parent'},\n\n"
@@ -170,14 +190,26 @@ def send_report_email():
         )
         msg.attach(part)
 
-        # Send
-        with smtplib.SMTP(email_host, email_port) as server:
-            server.ehlo()
-            server.starttls()
-            server.login(email_user, email_password)
-            server.send_message(msg)
-
-        return jsonify({'status': 'success', 'message': 'Report emailed'}), 200
+        # Queue for the outbox worker
+        key = request.headers.get('Idempotency-Key')
+        outbox_id = OutboxService.enqueue(
+            db,
+            source_type     = 'report',
+            source_id       = student.id,
+            from_addr       = email_user,
+            to_email        = student.parent_email,
+            message         = msg.as_string(),
+            subject         = msg['Subject'],
+            idempotency_key = f"report:{key}" if key else f"report:{msg['Message-ID']}"
+        )
+        db.commit()
+        if outbox_id is None:
+            return jsonify({'status': 'success', 'message': 'Report already queued',
+                            'duplicate': True}), 200
+        OutboxService.wake()
+
+        return jsonify({'status': 'success', 'message': 'Report queued for delivery',
+                        'outbox_id': outbox_id}), 202
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
     finally:
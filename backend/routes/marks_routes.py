@@ -29,6 +29,41 @@ def enter_marks():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+# POST /api/marks/bulk
+# JSON: {"semester", "exam_type", "rows": [{student_id, math_score, ...}]}
+# CSV:  multipart "file" (or text/csv body) + semester / exam_type fields
+@marks_bp.route('/api/marks/bulk', methods=['POST'])
+@jwt_required()
+def enter_marks_bulk():
+    try:
+        claims = get_jwt()
+        if claims.get('role') not in ['admin', 'teacher']:
+            return jsonify({'error': 'Admin or Teacher access required'}), 403
+
+        upload = request.files.get('file')
+        if upload or request.mimetype == 'text/csv':
+            raw  = upload.read() if upload else request.get_data()
+            rows = MarksService.parse_marks_csv(raw.decode('utf-8-sig'))
+            semester  = request.form.get('semester')  or request.args.get('semester')
+            exam_type = request.form.get('exam_type') or request.args.get('exam_type')
+        else:
+            data = request.get_json()
+            if not data:
+                return jsonify({'error': 'No data provided'}), 400
+            rows      = data.get('rows', [])
+            semester  = data.get('semester')
+            exam_type = data.get('exam_type')
+
+        entered_by = get_jwt_identity()
+        result = MarksService.enter_marks_bulk(rows, semester, exam_type, entered_by)
+        if result.get('status') == 'error':
+            return jsonify(result), 400
+        return jsonify(result), 201
+    except Exception as e:
+        print(f"❌ Bulk marks error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 # GET /api/marks/<grade>/<section>
 @marks_bp.route('/api/marks/<int:grade>/<section>', methods=['GET'])
 @jwt_required()
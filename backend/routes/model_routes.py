@@ -0,0 +1,45 @@
+# backend/routes/model_routes.py
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt
+
+from backend.services.model_registry import ModelRegistry
+
+model_bp = Blueprint('models', __name__)
+
+
+# GET /api/models  — registered versions + the one this process serves
+@model_bp.route('/api/models', methods=['GET'])
+@jwt_required()
+def list_models():
+    try:
+        return jsonify({
+            'status':   'success',
+            'active':   ModelRegistry.get_active().to_dict(),
+            'versions': ModelRegistry.list_versions()
+        }), 200
+    except Exception as e:
+        print(f"❌ List models error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+# POST /api/models/activate  — hot-swap to another version
+@model_bp.route('/api/models/activate', methods=['POST'])
+@jwt_required()
+def activate_model():
+    try:
+        claims = get_jwt()
+        if claims.get('role') != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+
+        data    = request.get_json() or {}
+        version = data.get('version')
+        if not version:
+            return jsonify({'error': 'version is required'}), 400
+
+        result = ModelRegistry.activate(str(version))
+        if result.get('status') != 'success':
+            return jsonify(result), 400
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"❌ Activate model error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
@@ -70,8 +70,8 @@ def send_manual_notification(student_id):
             custom_message    = message
         )
 
-        if result['status'] == 'sent':
-            return jsonify(result), 200
+        if result['status'] == 'queued':
+            return jsonify(result), 202
         return jsonify({'error': result.get('message', 'Send failed')}), 500
 
     except Exception as e:
@@ -85,14 +85,14 @@ def check_and_notify_student(student_id):
     try:
         results = NotificationService.check_and_notify_academic(student_id=student_id)
 
-        sent    = [r for r in results if r.get('status') == 'sent']
+        queued  = [r for r in results if r.get('status') == 'queued']
         failed  = [r for r in results if r.get('status') == 'failed']
         skipped = [r for r in results if r.get('status') in ('no_trigger', 'skipped', 'cooldown')]
 
         return jsonify({
             'student_id'   : student_id,
             'total_checked': len(results),
-            'sent'         : len(sent),
+            'queued'       : len(queued),
             'failed'       : len(failed),
             'skipped'      : len(skipped),
             'results'      : results
@@ -107,38 +107,15 @@ def check_and_notify_student(student_id):
 def bulk_notification_check():
     try:
         data    = request.get_json() or {}
-        grade   = data.get('grade')
-        section = data.get('section')
-
-        from backend.database.db_config import SessionLocal
-        from backend.database.models import Student as StudentModel
-
-        db = SessionLocal()
-        try:
-            query = db.query(StudentModel).filter(StudentModel.is_active == True)
-            if grade:
-                query = query.filter(StudentModel.grade == grade)
-            if section:
-                query = query.filter(StudentModel.section == section)
-            students = query.all()
-            total    = len(students)
-        finally:
-            db.close()
-
-        print(f"🔄 Bulk notification check: {total} students")
-
-        summary = {'total_students': total, 'sent': 0, 'failed': 0, 'no_trigger': 0, 'skipped': 0}
-
-        for student in students:
-            results = NotificationService.check_and_notify_academic(student_id=student.id)
-            for r in results:
-                status = r.get('status', 'skipped')
-                if   status == 'sent'      : summary['sent']       += 1
-                elif status == 'failed'    : summary['failed']     += 1
-                elif status == 'no_trigger': summary['no_trigger'] += 1
-                else                       : summary['skipped']    += 1
-
-        print(f"✅ Bulk check complete: {summary}")
+        summary = NotificationService.sweep(
+            grade       = data.get('grade'),
+            section     = data.get('section'),
+            student_ids = data.get('student_ids'),
+            rules       = data.get('rules')
+        )
+        if summary.get('status') == 'error':
+            return jsonify({'error': summary['message']}), 500
+
         return jsonify(summary), 200
 
     except Exception as e:
@@ -90,12 +90,12 @@ def predict_batch():
                 'error': 'Students array is empty'
             }), 400
         
-        # Process each student
-        results = []
+        # Validate each student
+        valid_students = []
+        valid_index = []
         errors = []
         
         for idx, student in enumerate(students):
-            # Validate
             is_valid, error_msg = validate_student_data(student)
             if not is_valid:
                 errors.append({
@@ -104,15 +104,17 @@ def predict_batch():
                     'error': error_msg
                 })
                 continue
-            
-            # Predict
-            result = model_service.predict_risk(student)
+            valid_students.append(student)
+            valid_index.append(idx)
+        
+        # Predict all valid students with one vectorized model call
+        results = model_service.predict_risk_batch(valid_students)
+        
+        for idx, student, result in zip(valid_index, valid_students, results):
             result['student_index'] = idx
             
             if 'student_id' in student:
                 result['student_id'] = student['student_id']
-            
-            results.append(result)
         
         return jsonify({
             'success': True,
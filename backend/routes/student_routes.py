@@ -2,7 +2,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt
 
-from backend.services.student_service import StudentService
+from backend.services.student_service import StudentService, SEARCH_MAX_RESULTS
 
 student_bp = Blueprint('students', __name__)
 
@@ -26,18 +26,10 @@ def get_students():
         if per_page < 1 or per_page > 1000:
             per_page = 50
 
-        if search:
-            students = StudentService.search_students(search)
-            # Apply pagination to search results
-            total = len(students)
-            start = (page - 1) * per_page
-            end = start + per_page
-            paginated_students = students[start:end]
-        else:
-            students, total = StudentService.get_all_students_paginated(
-                grade=grade, section=section, page=page, per_page=per_page
-            )
-            paginated_students = students
+        paginated_students, total = StudentService.get_all_students_paginated(
+            grade=grade, section=section, search=search,
+            page=page, per_page=per_page
+        )
 
         return jsonify({
             'students': paginated_students,
@@ -53,6 +45,25 @@ def get_students():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+# GET /api/students/search?q=<term>&limit=<n>
+@student_bp.route('/api/students/search', methods=['GET'])
+@jwt_required()
+def search_students():
+    try:
+        term  = request.args.get('q', '')
+        limit = request.args.get('limit', SEARCH_MAX_RESULTS, type=int)
+        students = StudentService.search_students(term, limit=limit)
+        return jsonify({
+            'students': students,
+            'total':    len(students),
+            'query':    term,
+            'limit':    min(max(limit or SEARCH_MAX_RESULTS, 1), SEARCH_MAX_RESULTS)
+        }), 200
+    except Exception as e:
+        print(f"❌ Search students error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 # GET /api/students/count
 @student_bp.route('/api/students/count', methods=['GET'])
 @jwt_required()
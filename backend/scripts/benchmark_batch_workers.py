@@ -0,0 +1,207 @@
+"""
+Batch Prediction Worker Benchmark
+ScholarSense - AI-Powered Academic Intelligence System
+
+Seeds a synthetic dataset (students tagged with the BENCH- prefix, one
+academic record each plus recent attendance), then times
+BatchService.run_batch_predictions with 1, 2, 4 and 8 worker processes.
+Runs cover every active student, so point DB_NAME at a scratch database:
+the script refuses to run while any non-BENCH student is active.
+
+Usage:
+    python backend/scripts/benchmark_batch_workers.py [--students 20000]
+           [--workers 1 2 4 8] [--keep]
+
+Options:
+    --students: Number of synthetic students to seed (default 20000)
+    --workers:  Worker counts to compare (default 1 2 4 8)
+    --keep:     Keep the synthetic rows afterwards (default: delete them)
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from datetime import date, timedelta
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert, delete, select, func
+
+from backend.database.db_config import engine
+from backend.database.models import Student, AcademicRecord, Attendance, RiskPrediction
+from backend.services.batch_service import BatchService
+
+# ── Constants ──────────────────────────────────────────────────────────────────
+BENCH_PREFIX    = "BENCH-"
+GRADES          = [6, 7, 8, 9, 10]
+SECTIONS        = ['A', 'B', 'C', 'D']
+ATTENDANCE_DAYS = 20
+INSERT_CHUNK    = 2000
+
+random.seed(42)
+
+
+# ==============================================================================
+# STEP 0 — GUARD REAL DATA
+# ==============================================================================
+
+def count_real_students():
+    """Active students outside the synthetic cohort (runs would score them)"""
+    students = Student.__table__
+    with engine.connect() as conn:
+        return conn.execute(
+            select(func.count()).select_from(students).where(
+                students.c.is_active.is_(True),
+                students.c.student_id.notlike(f"{BENCH_PREFIX}%")
+            )
+        ).scalar()
+
+
+# ==============================================================================
+# STEP 1 — SEED SYNTHETIC DATA
+# ==============================================================================
+
+def seed_students(n_students):
+    """Insert n synthetic students with academic + attendance rows"""
+    print(f"\n🌱 Seeding {n_students} synthetic students...")
+    today = date.today()
+
+    with engine.begin() as conn:
+        for start in range(0, n_students, INSERT_CHUNK):
+            count = min(INSERT_CHUNK, n_students - start)
+            students = [{
+                'student_id':           f"{BENCH_PREFIX}{start + i:06d}",
+                'first_name':           'Bench',
+                'last_name':            f"Student{start + i}",
+                'grade':                random.choice(GRADES),
+                'section':              random.choice(SECTIONS),
+                'gender':               random.choice(['Male', 'Female']),
+                'date_of_birth':        today - timedelta(days=365 * random.randint(11, 16)),
+                'socioeconomic_status': random.choice(['Low', 'Medium', 'High']),
+                'parent_education':     random.choice(['None', 'High School', 'Graduate', 'Post-Graduate']),
+                'is_active':            True,
+            } for i in range(count)]
+            ids = conn.execute(
+                insert(Student.__table__).values(students).returning(Student.__table__.c.id)
+            ).scalars().all()
+
+            academics, attendance = [], []
+            for sid in ids:
+                gpa = round(random.uniform(25, 98), 2)
+                academics.append({
+                    'student_id':                 sid,
+                    'semester':                   'BENCH',
+                    'current_gpa':                gpa,
+                    'previous_gpa':               round(random.uniform(25, 98), 2),
+                    'grade_trend':                round(random.uniform(-10, 10), 2),
+                    'failed_subjects':            random.randint(0, 3) if gpa < 50 else 0,
+                    'assignment_submission_rate': round(random.uniform(50, 100), 2),
+                    'math_score':                 round(random.uniform(20, 100), 2),
+                    'science_score':              round(random.uniform(20, 100), 2),
+                    'english_score':              round(random.uniform(20, 100), 2),
+                    'social_score':               round(random.uniform(20, 100), 2),
+                    'language_score':             round(random.uniform(20, 100), 2),
+                    'recorded_date':              today,
+                })
+                for day in range(1, ATTENDANCE_DAYS + 1):
+                    attendance.append({
+                        'student_id':      sid,
+                        'attendance_date': today - timedelta(days=day),
+                        'status':          'present' if random.random() < 0.85 else 'absent',
+                    })
+
+            conn.execute(insert(AcademicRecord.__table__).values(academics))
+            for a_start in range(0, len(attendance), INSERT_CHUNK * 5):
+                conn.execute(insert(Attendance.__table__).values(
+                    attendance[a_start:a_start + INSERT_CHUNK * 5]
+                ))
+            print(f"   ✅ {start + count}/{n_students} students seeded")
+
+
+def cleanup():
+    """Delete every synthetic row (predictions/attendance first)"""
+    print("\n🧹 Removing synthetic benchmark data...")
+    bench_ids = select(Student.__table__.c.id).where(
+        Student.__table__.c.student_id.like(f"{BENCH_PREFIX}%")
+    )
+    with engine.begin() as conn:
+        conn.execute(delete(RiskPrediction.__table__).where(
+            RiskPrediction.__table__.c.student_id.in_(bench_ids)))
+        conn.execute(delete(Attendance.__table__).where(
+            Attendance.__table__.c.student_id.in_(bench_ids)))
+        conn.execute(delete(AcademicRecord.__table__).where(
+            AcademicRecord.__table__.c.student_id.in_(bench_ids)))
+        conn.execute(delete(Student.__table__).where(
+            Student.__table__.c.student_id.like(f"{BENCH_PREFIX}%")))
+    print("   ✅ Done")
+
+
+# ==============================================================================
+# STEP 2 — RUN BENCHMARK
+# ==============================================================================
+
+def run_benchmark(worker_counts):
+    """Time a whole-school batch run for each worker count"""
+    print("\n⏱️  Running batch predictions...")
+    timings = {}
+    for workers in worker_counts:
+        started = time.perf_counter()
+        result  = BatchService.run_batch_predictions(filters={}, workers=workers)
+        elapsed = time.perf_counter() - started
+
+        if result.get('status') != 'success':
+            print(f"   ❌ {workers} worker(s): {result.get('message')}")
+            continue
+
+        total = result['data']['summary']['total']
+        timings[workers] = elapsed
+        print(f"   {workers:>2} worker(s): {elapsed:7.2f}s "
+              f"({total / elapsed:8.0f} students/s)")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch prediction workers')
+    parser.add_argument('--students', type=int, default=20000,
+                        help='Number of synthetic students to seed')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Worker counts to compare')
+    parser.add_argument('--keep', action='store_true',
+                        help='Keep synthetic rows after the benchmark')
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("  ⏱️  SCHOLARSENSE — BATCH PREDICTION WORKER BENCHMARK")
+    print("=" * 70)
+
+    real_students = count_real_students()
+    if real_students:
+        print(f"\n❌ {real_students} active non-{BENCH_PREFIX} student(s) found. "
+              f"Batch runs would write predictions for them; point DB_NAME "
+              f"at a scratch database.")
+        sys.exit(1)
+
+    cleanup()
+    seed_students(args.students)
+    try:
+        timings = run_benchmark(args.workers)
+    finally:
+        if not args.keep:
+            cleanup()
+
+    if timings:
+        baseline = timings.get(min(timings))
+        print("\n" + "=" * 70)
+        print("  📊 SPEEDUP vs fewest workers")
+        print("=" * 70)
+        for workers, elapsed in sorted(timings.items()):
+            print(f"  {workers:>2} worker(s): {baseline / elapsed:5.2f}x")
+        print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
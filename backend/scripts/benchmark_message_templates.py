@@ -0,0 +1,115 @@
+"""
+Message Template Benchmark
+ScholarSense - AI-Powered Academic Intelligence System
+
+Renders N personalised parent emails (subject, plain text, HTML and the
+full MIME message) two ways and reports messages per second:
+- per-message: str.format on the raw template, markdown → HTML with
+  re.sub, HTML wrapper rebuilt, MIMEMultipart + as_string()
+  (how CommunicationService built emails before the template engine)
+- compiled:    template_engine.MessageTemplate.render + cached MimeLayout
+No database or SMTP server is needed.
+
+Usage:
+    python backend/scripts/benchmark_message_templates.py [--messages 10000]
+           [--template "Risk Alert"]
+"""
+
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.communication_service import (
+    CommunicationService, TEMPLATES, EMAIL_LAYOUT, _compiled_template
+)
+
+SENDER = 'school@scholarsense.local'
+
+
+class FakeStudent:
+    def __init__(self, i):
+        self.full_name    = f"Student {i}"
+        self.parent_name  = f"Parent {i}"
+        self.parent_email = f"parent{i}@example.com"
+        self.grade        = 6 + i % 5
+        self.section      = 'ABC'[i % 3]
+
+
+def extra_for(i):
+    return {'gpa': 40 + i % 50, 'risk_label': 'High', 'failed_subjects': i % 4,
+            'semester': 'Term 1 2026', 'custom_message': 'Please see **the note** below.'}
+
+
+def per_message(template_type, students):
+    """Baseline: everything from scratch for every message"""
+    template = TEMPLATES[template_type]
+    for i, student in enumerate(students):
+        extra = extra_for(i)
+        values = CommunicationService._template_values(student, extra)
+        subject = template['subject'].format(**values)
+        body    = template['body'].format(**values)
+
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From']    = f"ScholarSense <{SENDER}>"
+        msg['To']      = f"{student.parent_name} <{student.parent_email}>"
+        msg.attach(MIMEText(body.replace('**', '').replace('*', ''), 'plain'))
+        html_body = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', body)
+        html_body = html_body.replace('\n', '<br/>').replace('- ', '&nbsp;&nbsp;• ')
+        msg.attach(MIMEText(EMAIL_LAYOUT.replace('{content}', html_body), 'html'))
+        msg.as_string()
+
+
+def compiled(template_type, students):
+    """Template engine: slot fills plus a pre-built MIME skeleton"""
+    template = _compiled_template(template_type)
+    layout   = template.mime(SENDER, 'ScholarSense')
+    for i, student in enumerate(students):
+        rendered = template.render(
+            CommunicationService._template_values(student, extra_for(i))
+        )
+        layout.build(student.parent_email, rendered.subject, rendered.text,
+                     rendered.html, to_name=student.parent_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parent email rendering')
+    parser.add_argument('--messages', type=int, default=10000,
+                        help='Messages to render per run')
+    parser.add_argument('--template', default='Risk Alert', choices=sorted(TEMPLATES),
+                        help='Template to render')
+    args = parser.parse_args()
+
+    students = [FakeStudent(i) for i in range(args.messages)]
+
+    print("\n" + "=" * 65)
+    print("  ✉️  SCHOLARSENSE — MESSAGE TEMPLATE BENCHMARK")
+    print("=" * 65)
+    print(f"  {args.messages} messages | template '{args.template}'")
+
+    started = time.perf_counter()
+    per_message(args.template, students)
+    baseline = time.perf_counter() - started
+
+    _compiled_template(args.template)              # compile outside the timing
+    started = time.perf_counter()
+    compiled(args.template, students)
+    fast = time.perf_counter() - started
+
+    print(f"\n  {'mode':<14} {'seconds':>9} {'msg/s':>10}")
+    print(f"  {'per-message':<14} {baseline:>9.2f} {args.messages / baseline:>10.0f}")
+    print(f"  {'compiled':<14} {fast:>9.2f} {args.messages / fast:>10.0f}")
+    print(f"\n  ✅ {baseline / fast:.1f}x faster compiled")
+    print("=" * 65 + "\n")
+
+
+if __name__ == "__main__":
+    main()
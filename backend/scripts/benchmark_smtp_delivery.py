@@ -0,0 +1,162 @@
+"""
+SMTP Delivery Benchmark
+ScholarSense - AI-Powered Academic Intelligence System
+
+Sends a batch of parent-sized messages to a local stand-in SMTP server
+(aiosmtpd, with AUTH) two ways and reports messages per second:
+- per-message: new connection + EHLO + LOGIN + QUIT for every message
+  (how the services sent mail before the pooled engine)
+- pooled:      mail_delivery.SMTPPool, bounded concurrency
+Every SMTP command answered by the stand-in waits --latency-ms to model
+the round trip to a real provider. TLS is not simulated, so against
+Gmail (STARTTLS handshake per connection) the gap is wider.
+
+Requires: pip install aiosmtpd
+
+Usage:
+    python backend/scripts/benchmark_smtp_delivery.py [--messages 400]
+           [--pool-size 4] [--latency-ms 5]
+"""
+
+import sys
+import time
+import asyncio
+import smtplib
+import argparse
+import warnings
+from pathlib import Path
+from email.mime.text import MIMEText
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.mail_delivery import SMTPPool
+
+# aiosmtpd's own AUTH internals warn about a deprecated attribute
+warnings.filterwarnings('ignore', message='Session.login_data is deprecated')
+
+HOST     = '127.0.0.1'
+USER     = 'bench@scholarsense.local'
+PASSWORD = 'bench'
+
+
+class SinkHandler:
+    """Accepts everything, after an artificial per-command delay"""
+
+    def __init__(self, latency):
+        self.latency  = latency
+        self.received = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.latency)
+        session.host_name = hostname
+        return responses
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        await asyncio.sleep(self.latency)
+        envelope.mail_from = address
+        envelope.mail_options.extend(mail_options)
+        return '250 OK'
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        await asyncio.sleep(self.latency)
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.latency)
+        self.received += 1
+        return '250 Message accepted for delivery'
+
+
+def accept_any(server, session, envelope, mechanism, auth_data):
+    from aiosmtpd.smtp import AuthResult
+    return AuthResult(success=True)
+
+
+def build_messages(n):
+    body = "Dear Parent,\n\n" + "Progress update line.\n" * 40
+    messages = []
+    for i in range(n):
+        msg = MIMEText(body)
+        msg['Subject'] = f"Progress update #{i}"
+        msg['From']    = USER
+        msg['To']      = f"parent{i}@example.com"
+        messages.append((USER, msg['To'], msg.as_string()))
+    return messages
+
+
+def send_per_message(port, messages):
+    """Baseline: one authenticated connection per message"""
+    for from_addr, to_addr, message in messages:
+        with smtplib.SMTP(HOST, port) as server:
+            server.ehlo()
+            server.login(USER, PASSWORD)
+            server.sendmail(from_addr, to_addr, message)
+
+
+def send_pooled(port, messages, pool_size):
+    pool   = SMTPPool(HOST, port, USER, PASSWORD, size=pool_size, starttls=False)
+    errors = [e for e in pool.send_many(messages) if e is not None]
+    pool.close()
+    if errors:
+        raise errors[0]
+    return pool.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pooled SMTP delivery')
+    parser.add_argument('--messages', type=int, default=400,
+                        help='Messages per run')
+    parser.add_argument('--pool-size', type=int, default=4,
+                        help='Pooled connections / concurrent sends')
+    parser.add_argument('--latency-ms', type=float, default=5.0,
+                        help='Delay per SMTP command at the stand-in server')
+    parser.add_argument('--port', type=int, default=8025,
+                        help='Local port for the stand-in server')
+    args = parser.parse_args()
+
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        print("❌ aiosmtpd is not installed (pip install aiosmtpd)")
+        sys.exit(1)
+
+    print("\n" + "=" * 65)
+    print("  📧 SCHOLARSENSE — SMTP DELIVERY BENCHMARK")
+    print("=" * 65)
+    print(f"  {args.messages} messages | pool size {args.pool_size} | "
+          f"{args.latency_ms:g} ms per SMTP command")
+
+    handler    = SinkHandler(args.latency_ms / 1000)
+    controller = Controller(
+        handler, hostname=HOST, port=args.port,
+        authenticator=accept_any, auth_require_tls=False
+    )
+    controller.start()
+    try:
+        messages = build_messages(args.messages)
+
+        started = time.perf_counter()
+        send_per_message(args.port, messages)
+        baseline = time.perf_counter() - started
+
+        started = time.perf_counter()
+        stats   = send_pooled(args.port, messages, args.pool_size)
+        pooled  = time.perf_counter() - started
+    finally:
+        controller.stop()
+
+    print(f"\n  {'mode':<14} {'seconds':>9} {'msg/s':>9} {'logins':>8}")
+    print(f"  {'per-message':<14} {baseline:>9.2f} {args.messages / baseline:>9.0f} "
+          f"{args.messages:>8}")
+    print(f"  {'pooled':<14} {pooled:>9.2f} {args.messages / pooled:>9.0f} "
+          f"{stats['connects']:>8}")
+    print(f"\n  ✅ Server accepted {handler.received} of {2 * args.messages} messages, "
+          f"{baseline / pooled:.1f}x faster pooled")
+    print("=" * 65 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Model Artifact Converter (pickle → joblib + JSON sidecar)
+ScholarSense - AI-Powered Academic Intelligence System
+
+Adds model.joblib, preprocessing.json and (for gradient boosting) the
+compiled .npy node arrays to existing registry versions in place,
+keeping the version name (so stored predictions stay valid) and the
+original .pkl files. Each converted version is then reloaded
+both ways and checked for identical predictions on random inputs; on a
+mismatch the joblib files are removed again and pickle stays in use.
+
+Usage:
+    python backend/scripts/convert_model_artifacts.py [--version V | --all]
+           [--samples 2000]
+
+Options:
+    --version: Version to convert (default: the active version)
+    --all:     Convert every registered pickle version
+    --samples: Random rows used for the parity check (default 2000)
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from backend.services.model_registry import ModelRegistry, JOBLIB_FILES, COMPILED_FILES
+
+random_state = np.random.default_rng(42)
+
+
+def timed_load(version, artifact_format):
+    started = time.perf_counter()
+    bundle  = ModelRegistry.load(version, artifact_format=artifact_format)
+    return bundle, (time.perf_counter() - started) * 1000
+
+
+def check_parity(old, new, samples):
+    """True if both bundles encode, scale and predict identically"""
+    if old.encoder_lookups != new.encoder_lookups:
+        print("   ❌ Encoder vocabularies differ")
+        return False
+
+    n_features = int(getattr(old.model, 'n_features_in_', 0)) or len(new.scaler.scale_)
+    X = random_state.normal(size=(samples, n_features)) * 10
+    if old.scaler is not None:
+        if not np.allclose(old.scaler.transform(X), new.scaler.transform(X)):
+            print("   ❌ Scaler output differs")
+            return False
+        X = old.scaler.transform(X)
+
+    if not np.array_equal(old.model.predict_proba(X), new.model.predict_proba(X)):
+        print("   ❌ Model probabilities differ")
+        return False
+    if new.predictor is not new.model and not np.allclose(
+            old.model.predict_proba(X), new.predictor.predict_proba(X), rtol=0, atol=1e-9):
+        print("   ❌ Memory-mapped compiled probabilities differ")
+        return False
+    print(f"   ✅ Parity on {samples} random rows")
+    return True
+
+
+def convert(version, samples):
+    print(f"\n🔄 Converting model version {version}...")
+    result = ModelRegistry.convert_to_joblib(version)
+    if result['status'] != 'success':
+        print(f"   ❌ {result['message']}")
+        return False
+
+    old, pickle_ms = timed_load(version, 'pickle')
+    new, joblib_ms = timed_load(version, 'joblib')
+    print(f"   ⏱️  Load time: pickle {pickle_ms:.1f} ms → joblib {joblib_ms:.1f} ms")
+
+    if not check_parity(old, new, samples):
+        directory = ModelRegistry._version_dir(version)
+        for filename in (*JOBLIB_FILES.values(), *COMPILED_FILES.values()):
+            (directory / filename).unlink(missing_ok=True)
+        print("   ⚠️  Joblib artifacts removed; version keeps using pickle")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert model artifacts to joblib + JSON')
+    group  = parser.add_mutually_exclusive_group()
+    group.add_argument('--version', default=None, help='Version to convert')
+    group.add_argument('--all', action='store_true', help='Convert every pickle version')
+    parser.add_argument('--samples', type=int, default=2000,
+                        help='Random rows for the parity check')
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("  📦 SCHOLARSENSE — MODEL ARTIFACT CONVERTER")
+    print("=" * 70)
+
+    if args.all:
+        versions = [v['version'] for v in ModelRegistry.list_versions()
+                    if v['format'] == 'pickle']
+    else:
+        versions = [args.version or ModelRegistry.active_version()]
+
+    if not versions:
+        print("\n✅ Nothing to convert")
+        return
+
+    failed = [v for v in versions if not convert(v, args.samples)]
+    print("\n" + "=" * 70)
+    print(f"  Converted {len(versions) - len(failed)}/{len(versions)} versions")
+    print("=" * 70 + "\n")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+COPY Bulk Loader
+ScholarSense - AI-Powered Academic Intelligence System
+
+Loads students, academic records and attendance with PostgreSQL COPY
+from in-memory CSV buffers, one chunk of students per transaction:
+- student ids are pre-allocated from students_id_seq in one query per
+  chunk, so child rows reference them without a flush per student
+- rows are plain tuples written straight into the COPY buffer; no ORM
+  instances pass through the session, so memory stays flat
+- imported students with an academic record are queued in
+  dirty_students for the rescore worker
+
+Used by import_uci_data.py and import_students_csv.py.
+"""
+
+import io
+import csv
+import time
+from datetime import datetime
+from sqlalchemy import text
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from backend.services.rescore_service import RescoreService
+
+# ── Constants ──────────────────────────────────────────────────────────────────
+DEFAULT_CHUNK_SIZE = 2000      # students per COPY round / transaction
+
+STUDENT_COLUMNS = (
+    'id', 'student_id', 'first_name', 'last_name', 'grade', 'section',
+    'gender', 'date_of_birth', 'parent_name', 'parent_phone', 'parent_email',
+    'socioeconomic_status', 'parent_education', 'enrollment_date', 'is_active',
+    'created_at', 'updated_at',
+)
+ACADEMIC_COLUMNS = (
+    'student_id', 'semester', 'current_gpa', 'previous_gpa', 'grade_trend',
+    'failed_subjects', 'total_subjects', 'assignment_submission_rate',
+    'math_score', 'science_score', 'english_score', 'social_score',
+    'language_score', 'recorded_date', 'created_at', 'updated_at',
+)
+ATTENDANCE_COLUMNS = (
+    'student_id', 'attendance_date', 'status', 'remarks', 'marked_by',
+    'created_at', 'updated_at',
+)
+# Attendance keyed by student code, resolved to ids after COPY
+STAGING_COLUMNS = ('student_code', 'attendance_date', 'status', 'remarks')
+
+DIRTY_REASON = 'import'
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process in MB (None if unknown)"""
+    if resource is None:
+        return None
+    # ru_maxrss is KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class CopyLoader:
+    """Chunked COPY writer for students and their child rows"""
+
+    def __init__(self, db, mark_dirty=True):
+        self.db         = db
+        self.mark_dirty = mark_dirty
+        self.counts     = {'students': 0, 'academic_records': 0, 'attendance': 0}
+        self.started    = time.perf_counter()
+
+    # ──────────────────────────────────────────
+    # LOW LEVEL
+    # ──────────────────────────────────────────
+
+    def allocate_ids(self, n):
+        """Reserve n student ids from the sequence in one round trip"""
+        return self.db.execute(
+            text("SELECT nextval('students_id_seq') FROM generate_series(1, :n)"),
+            {'n': n}
+        ).scalars().all()
+
+    def copy_rows(self, table, columns, rows):
+        """COPY tuples into table (None → NULL); returns the row count"""
+        if not rows:
+            return 0
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        # Same connection (and transaction) as the session
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+        return len(rows)
+
+    # ──────────────────────────────────────────
+    # CHUNKS
+    # ──────────────────────────────────────────
+
+    def load_chunk(self, students, academics=(), attendance=()):
+        """
+        COPY one chunk and commit it
+        Args:
+            students:   dicts with STUDENT_COLUMNS keys ('id' pre-allocated)
+            academics:  dicts with ACADEMIC_COLUMNS keys
+            attendance: tuples in ATTENDANCE_COLUMNS order (without the
+                        timestamps), the bulk of the rows
+        """
+        now = datetime.utcnow()
+        try:
+            self.counts['students'] += self.copy_rows('students', STUDENT_COLUMNS, [
+                tuple(s.get(col) for col in STUDENT_COLUMNS[:-2]) + (now, now)
+                for s in students
+            ])
+            self.counts['academic_records'] += self.copy_rows(
+                'academic_records', ACADEMIC_COLUMNS, [
+                    tuple(a.get(col) for col in ACADEMIC_COLUMNS[:-2]) + (now, now)
+                    for a in academics
+                ]
+            )
+            self.counts['attendance'] += self.copy_rows(
+                'attendance', ATTENDANCE_COLUMNS,
+                [row + (now, now) for row in attendance]
+            )
+            if self.mark_dirty and academics:
+                RescoreService.mark_dirty(
+                    self.db, [a['student_id'] for a in academics], DIRTY_REASON
+                )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def load_attendance_by_code(self, rows):
+        """
+        COPY attendance keyed by student code (students.student_id) into a
+        staging table, then resolve ids with one INSERT ... SELECT join
+        Args:
+            rows: (student_code, attendance_date, status, remarks) tuples
+        Returns: rows whose student code matched no student
+        Days already recorded for a student are left as they are.
+        """
+        try:
+            self.db.execute(text(
+                "CREATE TEMP TABLE IF NOT EXISTS attendance_staging ("
+                " student_code VARCHAR(50), attendance_date DATE,"
+                " status VARCHAR(20), remarks TEXT"
+                ") ON COMMIT DELETE ROWS"
+            ))
+            self.copy_rows('attendance_staging', STAGING_COLUMNS, rows)
+            inserted = self.db.execute(text("""
+                INSERT INTO attendance (student_id, attendance_date, status, period,
+                                        remarks, created_at, updated_at)
+                SELECT s.id, st.attendance_date, st.status, 'all_day', st.remarks,
+                       now(), now()
+                FROM attendance_staging st
+                JOIN students s ON s.student_id = st.student_code
+                ON CONFLICT (student_id, attendance_date, period) DO NOTHING
+                RETURNING student_id
+            """)).scalars().all()
+            unmatched = self.db.execute(text("""
+                SELECT count(*) FROM attendance_staging st
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM students s WHERE s.student_id = st.student_code
+                )
+            """)).scalar()
+            if self.mark_dirty:
+                RescoreService.mark_dirty(self.db, inserted, DIRTY_REASON)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.counts['attendance'] += len(inserted)
+        return unmatched
+
+    # ──────────────────────────────────────────
+    # REPORTING
+    # ──────────────────────────────────────────
+
+    def report(self):
+        """Counts, elapsed time, rows/s and peak memory so far"""
+        elapsed = time.perf_counter() - self.started
+        rows    = sum(self.counts.values())
+        return {
+            **self.counts,
+            'rows': rows,
+            'seconds': round(elapsed, 2),
+            'rows_per_second': round(rows / elapsed) if elapsed > 0 else 0,
+            'peak_memory_mb': peak_memory_mb(),
+        }
+
+    def print_progress(self):
+        stats  = self.report()
+        memory = (f"{stats['peak_memory_mb']:.0f} MB peak"
+                  if stats['peak_memory_mb'] is not None else "memory n/a")
+        print(f"   ⏳ {stats['students']:>7} students | {stats['rows']:>9} rows | "
+              f"{stats['rows_per_second']:>8} rows/s | {memory}")
+
+    def print_summary(self):
+        stats = self.report()
+        print(f"  📥 Students imported    : {stats['students']}")
+        print(f"  📚 Academic records     : {stats['academic_records']}")
+        print(f"  📋 Attendance records   : {stats['attendance']}")
+        print(f"  ⏱️  Elapsed              : {stats['seconds']}s "
+              f"({stats['rows_per_second']} rows/s)")
+        if stats['peak_memory_mb'] is not None:
+            print(f"  🧠 Peak memory          : {stats['peak_memory_mb']:.0f} MB")
+        return stats
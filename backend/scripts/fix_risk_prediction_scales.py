@@ -16,6 +16,7 @@ sys.path.insert(0, str(project_root))
 from sqlalchemy import text  # noqa: E402
 
 from backend.database.db_config import SessionLocal  # noqa: E402
+from backend.services.prediction_service import PredictionService  # noqa: E402
 
 
 def main():
@@ -53,6 +54,13 @@ def main():
         db.commit()
         print(f"Rows updated (confidence_score > 100): {r1.rowcount}")
         print(f"Rows updated (any probability > 100): {r2.rowcount}")
+
+        # Keep the latest-prediction projection in sync with the fixed rows
+        rebuilt = PredictionService.rebuild_latest_risk()
+        if 'error' in rebuilt:
+            print(f"Latest risk rebuild failed: {rebuilt['error']}")
+            sys.exit(1)
+        print(f"Latest risk rows rebuilt: {rebuilt['students']}")
     except Exception as e:
         db.rollback()
         print(f"Error: {e}")
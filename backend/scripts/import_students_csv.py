@@ -0,0 +1,160 @@
+"""
+Student CSV Bulk Importer
+ScholarSense - AI-Powered Academic Intelligence System
+
+Streams a students CSV (optionally with each student's academic record
+on the same row) and an optional attendance CSV into PostgreSQL with
+COPY, a chunk at a time, so a whole campus loads in seconds with flat
+memory. Existing students are kept; new ones get ids from the sequence.
+
+Students CSV columns:
+    first_name, last_name, grade                       (required)
+    student_id, section, gender, date_of_birth, parent_name, parent_phone,
+    parent_email, socioeconomic_status, parent_education, enrollment_date
+    semester, current_gpa, previous_gpa, grade_trend, failed_subjects,
+    total_subjects, assignment_submission_rate, math_score, science_score,
+    english_score, social_score, language_score, recorded_date
+    (an academic record is created when current_gpa is filled in;
+     student_id defaults to <prefix><id>)
+
+Attendance CSV columns:
+    student_id (the student code), attendance_date, status[, remarks]
+
+Usage:
+    python backend/scripts/import_students_csv.py [students.csv]
+           [--attendance attendance.csv] [--chunk-size 2000] [--prefix STU]
+"""
+
+import sys
+import csv
+import argparse
+from datetime import date
+from itertools import islice
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.db_config import SessionLocal
+from backend.scripts.copy_loader import (
+    CopyLoader, DEFAULT_CHUNK_SIZE, STUDENT_COLUMNS, ACADEMIC_COLUMNS
+)
+
+REQUIRED_COLUMNS   = ('first_name', 'last_name', 'grade')
+ATTENDANCE_COLUMNS = ('student_id', 'attendance_date', 'status')
+# CSV columns that belong to the academic record, not the student
+ACADEMIC_FIELDS  = [c for c in ACADEMIC_COLUMNS
+                    if c not in ('student_id', 'created_at', 'updated_at')]
+STUDENT_FIELDS   = [c for c in STUDENT_COLUMNS
+                    if c not in ('id', 'created_at', 'updated_at')]
+
+
+def read_chunks(path, chunk_size, required):
+    """Yield lists of cleaned row dicts ('' → None) from a CSV file"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader  = csv.DictReader(f)
+        missing = [c for c in required if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"{path}: missing columns {', '.join(missing)}")
+        while True:
+            chunk = [
+                {(k or '').strip(): (v.strip() or None) if isinstance(v, str) else v
+                 for k, v in row.items()}
+                for row in islice(reader, chunk_size)
+            ]
+            if not chunk:
+                return
+            yield chunk
+
+
+def student_rows(chunk, ids, prefix):
+    """(students, academics) dicts for one chunk with pre-allocated ids"""
+    students, academics = [], []
+    semester = f"Term 1 {date.today().year}"
+    for student_db_id, row in zip(ids, chunk):
+        student = {field: row.get(field) for field in STUDENT_FIELDS}
+        student['id']         = student_db_id
+        student['student_id'] = row.get('student_id') or f"{prefix}{student_db_id:04d}"
+        student['is_active']  = row.get('is_active') or True
+        students.append(student)
+
+        if row.get('current_gpa') is not None:
+            academic = {field: row.get(field) for field in ACADEMIC_FIELDS}
+            academic['student_id'] = student_db_id
+            academic['semester']   = row.get('semester') or semester
+            academic['failed_subjects'] = row.get('failed_subjects') or 0
+            academic['total_subjects']  = row.get('total_subjects') or 5
+            if academic['grade_trend'] is None and row.get('previous_gpa') is not None:
+                academic['grade_trend'] = round(
+                    float(row['current_gpa']) - float(row['previous_gpa']), 2
+                )
+            academic['recorded_date'] = row.get('recorded_date') or date.today()
+            academics.append(academic)
+    return students, academics
+
+
+def import_students(loader, path, chunk_size, prefix):
+    print(f"\n📥 Importing students from {path}...")
+    for chunk in read_chunks(path, chunk_size, REQUIRED_COLUMNS):
+        ids = loader.allocate_ids(len(chunk))
+        students, academics = student_rows(chunk, ids, prefix)
+        loader.load_chunk(students, academics)
+        loader.print_progress()
+
+
+def import_attendance(loader, path, chunk_size):
+    print(f"\n📋 Importing attendance from {path}...")
+    unmatched = 0
+    for chunk in read_chunks(path, chunk_size, ATTENDANCE_COLUMNS):
+        unmatched += loader.load_attendance_by_code([
+            (row.get('student_id'), row.get('attendance_date'),
+             (row.get('status') or '').lower() or None, row.get('remarks'))
+            for row in chunk
+        ])
+        loader.print_progress()
+    if unmatched:
+        print(f"   ⚠️  {unmatched} attendance rows matched no student code")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-import students from CSV via COPY')
+    parser.add_argument('students', nargs='?', default=None,
+                        help='Students CSV (optional when only loading attendance)')
+    parser.add_argument('--attendance', default=None,
+                        help='Attendance CSV keyed by student code')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Rows per COPY round / transaction')
+    parser.add_argument('--prefix', default='STU',
+                        help='Student code prefix when the CSV has no student_id')
+    args = parser.parse_args()
+
+    if not args.students and not args.attendance:
+        parser.error('nothing to import: pass a students CSV and/or --attendance')
+
+    print("\n" + "=" * 65)
+    print("  🎓 SCHOLARSENSE — CSV BULK IMPORT")
+    print("=" * 65)
+
+    db = SessionLocal()
+    try:
+        loader = CopyLoader(db)
+        if args.students:
+            import_students(loader, args.students, args.chunk_size, args.prefix)
+        if args.attendance:
+            import_attendance(loader, args.attendance, args.chunk_size)
+    except Exception as e:
+        print(f"\n❌ Import failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print("\n" + "=" * 65)
+    print("  ✅ IMPORT COMPLETE — SUMMARY")
+    print("=" * 65)
+    loader.print_summary()
+    print("=" * 65 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,24 @@ Hybrid Approach:
 - Generated Indian names, contact details, school structure
 - Maps UCI columns → ScholarSense PostgreSQL schema
 
+Rows are streamed in chunks and loaded with PostgreSQL COPY
+(see copy_loader.py), so memory stays flat for large campuses.
+
 Usage:
-    python backend/scripts/import_uci_data.py
+    python backend/scripts/import_uci_data.py [--count 400]
+           [--chunk-size 2000] [--append] [--yes]
+
+Options:
+    --count:      Students to generate (UCI rows are reused beyond ~1000)
+    --chunk-size: Students per COPY round / transaction
+    --append:     Keep existing students instead of clearing them
+    --yes:        Skip the confirmation prompts
 """
 
 import sys
 import os
+import argparse
+from functools import lru_cache
 from pathlib import Path
 
 # Add project root to Python path
@@ -26,8 +38,8 @@ from datetime import datetime, date, timedelta
 from sqlalchemy import text
 
 # Import project modules
-from backend.database.db_config import engine, SessionLocal
-from backend.database.models import Student, AcademicRecord, Attendance, RiskPrediction
+from backend.database.db_config import SessionLocal
+from backend.scripts.copy_loader import CopyLoader, DEFAULT_CHUNK_SIZE
 from backend.scripts.indian_names import (
     FIRST_NAMES_MALE, FIRST_NAMES_FEMALE, LAST_NAMES,
     PARENT_FIRST_NAMES_MALE, PARENT_FIRST_NAMES_FEMALE
@@ -35,7 +47,7 @@ from backend.scripts.indian_names import (
 from backend.scripts.uci_column_mapping import (
     AGE_TO_GRADE, SECTIONS,
     derive_socioeconomic_status, derive_parent_education,
-    derive_risk_label, uci_grade_to_percent,
+    uci_grade_to_percent,
     derive_submission_rate, PASS_MARK
 )
 
@@ -285,22 +297,28 @@ def generate_academic_record(uci_row, student_db_id):
 # STEP 4 — GENERATE ATTENDANCE RECORDS FROM UCI ABSENCES
 # ==============================================================================
 
+@lru_cache(maxsize=1)
+def recent_school_days(today, n=90):
+    """Last n school days (Mon-Fri) before today, newest first"""
+    school_days = []
+    current     = today - timedelta(days=1)
+    while len(school_days) < n:
+        if current.weekday() < 5:   # Mon=0 ... Fri=4
+            school_days.append(current)
+        current -= timedelta(days=1)
+    return tuple(school_days)
+
+
 def generate_attendance_records(uci_row, student_db_id):
     """
     Generate daily attendance records from UCI absences count.
     Spreads absences realistically over the last 90 days.
+    Returns tuples in copy_loader.ATTENDANCE_COLUMNS order (without
+    timestamps), ready for COPY.
     """
     absences_total = int(uci_row.get('absences', 0))
     records        = []
-    today          = date.today()
-
-    # Generate last 90 school days (Mon-Fri only)
-    school_days = []
-    current     = today - timedelta(days=1)
-    while len(school_days) < 90:
-        if current.weekday() < 5:   # Mon=0 ... Fri=4
-            school_days.append(current)
-        current -= timedelta(days=1)
+    school_days    = recent_school_days(date.today())
 
     # Cap absences to available school days
     absences_total = min(absences_total, len(school_days) - 5)
@@ -318,13 +336,7 @@ def generate_attendance_records(uci_row, student_db_id):
             # 5% chance of 'late', rest 'present'
             status = 'late' if random.random() < 0.05 else 'present'
 
-        records.append({
-            'student_id'     : student_db_id,
-            'attendance_date': school_day,
-            'status'         : status,
-            'remarks'        : None,
-            'marked_by'      : None,
-        })
+        records.append((student_db_id, school_day, status, None, None))
 
     return records
 
@@ -367,41 +379,46 @@ def clear_existing_data(db):
 # STEP 6 — ASSIGN STUDENTS TO GRADES EVENLY
 # ==============================================================================
 
-def assign_grades_to_rows(df):
+def iter_assignments(df, count=TOTAL_TARGET):
     """
-    Assign each UCI row to a grade (6-10) evenly.
-    Returns list of (uci_row, grade, section) tuples.
+    Stream (uci_row, grade, section) for count students, spreading them
+    evenly over grades 6-10. UCI rows are shuffled once and reused in
+    turn when count exceeds the dataset (e.g. seeding a large campus).
     """
-    total    = min(len(df), TOTAL_TARGET)
-    df_sample = df.sample(n=total, random_state=42).reset_index(drop=True)
-
-    assignments = []
-    grade_counts = {6: 0, 7: 0, 8: 0, 9: 0, 10: 0}
-    per_grade    = total // 5
-
-    for _, row in df_sample.iterrows():
-        # Find grade that still needs students
-        assigned_grade = None
-        for g in [6, 7, 8, 9, 10]:
-            if grade_counts[g] < per_grade:
-                assigned_grade = g
-                break
-
-        if assigned_grade is None:
-            break
+    rows         = df.sample(frac=1, random_state=42).to_dict('records')
+    grades       = sorted(STUDENTS_PER_GRADE)
+    grade_counts = {g: 0 for g in grades}
 
-        section = SECTIONS[grade_counts[assigned_grade] % len(SECTIONS)]
-        grade_counts[assigned_grade] += 1
-        assignments.append((row, assigned_grade, section))
-
-    return assignments, grade_counts
+    for i in range(count):
+        grade   = grades[i % len(grades)]
+        section = SECTIONS[grade_counts[grade] % len(SECTIONS)]
+        grade_counts[grade] += 1
+        yield rows[i % len(rows)], grade, section
 
 
 # ==============================================================================
 # MAIN IMPORT FUNCTION
 # ==============================================================================
 
-def run_import():
+def load_chunk(loader, chunk, used_names):
+    """Generate and COPY one chunk of (uci_row, grade, section) assignments"""
+    ids        = loader.allocate_ids(len(chunk))
+    students   = []
+    academics  = []
+    attendance = []
+    for student_db_id, (uci_row, grade, section) in zip(ids, chunk):
+        student = generate_student_record(
+            uci_row, student_db_id, grade, section, used_names
+        )
+        student['id'] = student_db_id
+        students.append(student)
+        academics.append(generate_academic_record(uci_row, student_db_id))
+        attendance.extend(generate_attendance_records(uci_row, student_db_id))
+    loader.load_chunk(students, academics, attendance)
+
+
+def run_import(count=TOTAL_TARGET, chunk_size=DEFAULT_CHUNK_SIZE,
+               append=False, assume_yes=False):
     """Main function to run the full UCI import pipeline"""
 
     print("\n" + "=" * 65)
@@ -412,124 +429,40 @@ def run_import():
     df = load_uci_data()
 
     # ── Confirmation prompt ─────────────────────────────────────────────────
-    print(f"\n⚠️  WARNING: This will DELETE all existing student data!")
-    print(f"   New data: ~{TOTAL_TARGET} students from UCI dataset")
-    confirm = input("\n   Type 'YES' to continue: ").strip()
-
-    if confirm != 'YES':
-        print("\n❌ Import cancelled.")
-        sys.exit(0)
+    if not append and not assume_yes:
+        print(f"\n⚠️  WARNING: This will DELETE all existing student data!")
+        print(f"   New data: ~{count} students from UCI dataset")
+        confirm = input("\n   Type 'YES' to continue: ").strip()
 
-    # ── Assign grades ───────────────────────────────────────────────────────
-    print("\n📊 Assigning students to grades...")
-    assignments, grade_counts = assign_grades_to_rows(df)
-    print(f"   Total to import: {len(assignments)} students")
+        if confirm != 'YES':
+            print("\n❌ Import cancelled.")
+            sys.exit(0)
 
     # ── Database session ────────────────────────────────────────────────────
     db = SessionLocal()
 
     try:
         # ── Clear existing data ─────────────────────────────────────────────
-        clear_existing_data(db)
-
-        # ── Import loop ─────────────────────────────────────────────────────
-        print(f"\n⏳ Importing students...")
-        print(f"   {'Progress':<15} {'Student':<25} {'Grade':<8} {'Section'}")
-        print(f"   {'-'*55}")
-
-        used_names           = set()
-        students_imported    = 0
-        attendance_imported  = 0
-        failed_rows          = 0
-
-        # Collect features + labels for ML retraining
-        ml_features = []
-        ml_labels   = []
-
-        for idx, (uci_row, grade, section) in enumerate(assignments, 1):
-
-            try:
-                # ── 1. Generate student record ──────────────────────────────
-                student_data = generate_student_record(
-                    uci_row, idx, grade, section, used_names
-                )
-
-                # ── 2. Insert student into DB ───────────────────────────────
-                student = Student(**student_data)
-                db.add(student)
-                db.flush()   # Get the auto-generated student.id
-
-                # ── 3. Generate + insert academic record ────────────────────
-                academic_data = generate_academic_record(uci_row, student.id)
-                academic      = AcademicRecord(**academic_data)
-                db.add(academic)
-
-                # ── 4. Generate + insert attendance records ──────────────────
-                att_records = generate_attendance_records(uci_row, student.id)
-                for att in att_records:
-                    attendance = Attendance(**att)
-                    db.add(attendance)
-                attendance_imported += len(att_records)
-
-                # ── 5. Collect ML features for retraining ───────────────────
-                absences  = int(uci_row.get('absences', 0))
-                failures  = int(uci_row.get('failures', 0))
-                g3        = int(uci_row.get('G3', 10))
-                risk_level, _ = derive_risk_label(g3, failures, absences)
-
-                ml_features.append([
-                    student_data['age'],
-                    grade,
-                    1 if student_data['gender'] == 'Male' else 0,
-                    {'Low': 0, 'Medium': 1, 'High': 2}.get(
-                        student_data['socioeconomic_status'], 1),
-                    {'None': 0, 'High School': 1,
-                     'Graduate': 2, 'Post-Graduate': 3}.get(
-                        student_data['parent_education'], 1),
-                    academic_data['current_gpa'],
-                    academic_data['previous_gpa'],
-                    academic_data['grade_trend'],
-                    # attendance rate
-                    round(
-                        (len(att_records) - absences)
-                        / max(len(att_records), 1) * 100, 2
-                    ),
-                    academic_data['failed_subjects'],
-                    academic_data['assignment_submission_rate'],
-                    failures,   # behavioral proxy
-                    academic_data['math_score'],
-                    academic_data['science_score'],
-                    academic_data['english_score'],
-                    academic_data['social_score'],
-                    academic_data['language_score'],
-                ])
-                ml_labels.append(risk_level)
-
-                students_imported += 1
-
-                # ── Progress display ─────────────────────────────────────────
-                if idx % 20 == 0 or idx == len(assignments):
-                    pct  = int((idx / len(assignments)) * 100)
-                    bar  = '█' * (pct // 5) + '░' * (20 - pct // 5)
-                    name = (f"{student_data['first_name']} "
-                            f"{student_data['last_name']}")
-                    print(f"   [{bar}] {pct:3}%  "
-                          f"{name:<25} Gr.{grade}  {section}")
-
-            except Exception as e:
-                failed_rows += 1
-                print(f"\n   ⚠️  Row {idx} failed: {e}")
-                db.rollback()
-                # Re-open session and continue
-                db = SessionLocal()
-                continue
-
-        # ── Commit all records ───────────────────────────────────────────────
-        db.commit()
-        print(f"\n   ✅ Database commit successful!")
+        if not append:
+            clear_existing_data(db)
+
+        # ── Import loop (one COPY round per chunk) ──────────────────────────
+        print(f"\n⏳ Importing {count} students in chunks of {chunk_size}...")
+        loader     = CopyLoader(db)
+        used_names = set()
+        chunk      = []
+
+        for assignment in iter_assignments(df, count):
+            chunk.append(assignment)
+            if len(chunk) == chunk_size:
+                load_chunk(loader, chunk, used_names)
+                loader.print_progress()
+                chunk = []
+        if chunk:
+            load_chunk(loader, chunk, used_names)
+            loader.print_progress()
 
     except Exception as e:
-        db.rollback()
         print(f"\n❌ Import failed: {e}")
         import traceback
         traceback.print_exc()
@@ -542,25 +475,31 @@ def run_import():
     print("\n" + "=" * 65)
     print("  ✅ IMPORT COMPLETE — SUMMARY")
     print("=" * 65)
-    print(f"  📥 Students imported    : {students_imported}")
-    print(f"  📋 Attendance records   : {attendance_imported}")
-    print(f"  ⚠️  Failed rows          : {failed_rows}")
-    print(f"\n  📊 Students per grade:")
-    for g, count in grade_counts.items():
-        bar = '█' * (count // 4)
-        print(f"     Grade {g}  : {count:3} students  {bar}")
+    stats = loader.print_summary()
     print("=" * 65)
-
-    # ── Return ML data for retraining ────────────────────────────────────────
-    return ml_features, ml_labels
+    return stats
 
 
 # ==============================================================================
 # ENTRY POINT
 # ==============================================================================
 
-if __name__ == "__main__":
-    ml_features, ml_labels = run_import()
+def main():
+    parser = argparse.ArgumentParser(description='Import UCI-based students')
+    parser.add_argument('--count', type=int, default=TOTAL_TARGET,
+                        help='Students to generate')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Students per COPY round / transaction')
+    parser.add_argument('--append', action='store_true',
+                        help='Keep existing students (e.g. adding a campus)')
+    parser.add_argument('--yes', action='store_true',
+                        help='Skip the confirmation prompts')
+    args = parser.parse_args()
+
+    run_import(args.count, args.chunk_size, args.append, args.yes)
+
+    if args.yes:
+        return
 
     # ── Ask if user wants to retrain ML model ───────────────────────────────
     print("\n🤖 ML Model Retraining")
@@ -575,3 +514,7 @@ if __name__ == "__main__":
         print("\n   ⏭️  Skipping model retraining.")
 
     print("\n🎉 Enhancement 1 — Phase 2 Complete!\n")
+
+
+if __name__ == "__main__":
+    main()
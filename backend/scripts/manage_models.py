@@ -0,0 +1,130 @@
+"""
+Model Registry Management
+ScholarSense - AI-Powered Academic Intelligence System
+
+Lists registered model versions, publishes a directory of flat
+artifacts (e.g. the output of scripts/train_model.py) as a new version,
+and switches the active version. Running API workers follow ACTIVE
+within MODEL_REGISTRY_POLL_SECONDS; use POST /api/models/activate to
+switch a worker immediately.
+
+Usage:
+    python backend/scripts/manage_models.py list
+    python backend/scripts/manage_models.py register [--from-dir DIR]
+           [--version NAME] [--format joblib|pickle] [--activate]
+    python backend/scripts/manage_models.py activate VERSION
+    python backend/scripts/manage_models.py seal [VERSION]
+
+seal records the checksums of a version without a manifest (default:
+the legacy flat layout, 2.0). The registry refuses to load unsealed
+artifacts, so check the files first: seal trusts whatever is on disk.
+"""
+
+import sys
+import pickle
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.model_registry import (
+    ModelRegistry, RegistryError, ARTIFACT_FILES, ARTIFACT_FORMAT,
+    ARTIFACT_FORMATS, REGISTRY_DIR, LEGACY_VERSION
+)
+
+
+def list_versions():
+    versions = ModelRegistry.list_versions()
+    if not versions:
+        print("⚠️  No model versions found")
+        return
+    print(f"\n📦 Model versions in {REGISTRY_DIR}:")
+    for v in versions:
+        marker = '→' if v['active'] else ' '
+        print(f"  {marker} {v['version']:<20} {v['format']:<7} "
+              f"{v['created_at'] or '(legacy flat layout)'}")
+
+
+def register(from_dir, version, artifact_format, activate):
+    """Publish the flat artifacts in from_dir as a registry version"""
+    source    = Path(from_dir)
+    artifacts = {}
+    for key, filename in ARTIFACT_FILES.items():
+        path = source / filename
+        if path.exists():
+            with open(path, 'rb') as f:
+                artifacts[key] = pickle.load(f)
+    if 'model' not in artifacts:
+        print(f"❌ No {ARTIFACT_FILES['model']} in {source}")
+        sys.exit(1)
+
+    try:
+        version = ModelRegistry.register(
+            artifacts['model'],
+            scaler=artifacts.get('scaler'),
+            label_encoders=artifacts.get('label_encoders'),
+            metadata=artifacts.get('metadata'),
+            version=version,
+            activate=activate,
+            artifact_format=artifact_format
+        )
+    except RegistryError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Registered version {version}{' (active)' if activate else ''}")
+
+
+def activate(version):
+    result = ModelRegistry.activate(version)
+    if result['status'] != 'success':
+        print(f"❌ {result['message']}")
+        sys.exit(1)
+
+
+def seal(version):
+    result = ModelRegistry.seal(version)
+    if result['status'] != 'success':
+        print(f"❌ {result['message']}")
+        sys.exit(1)
+    for filename, digest in sorted(result['files'].items()):
+        print(f"   {filename:<24} sha256 {digest[:12]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage registered model versions')
+    sub    = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('list', help='List registered versions')
+
+    reg = sub.add_parser('register', help='Publish flat artifacts as a new version')
+    reg.add_argument('--from-dir', default=str(REGISTRY_DIR),
+                     help='Directory holding best_model.pkl etc. (default: saved_models/)')
+    reg.add_argument('--version', default=None,
+                     help='Version name (default: vYYYYMMDD_HHMMSS)')
+    reg.add_argument('--format', choices=ARTIFACT_FORMATS, default=ARTIFACT_FORMAT,
+                     help=f"Artifact format (default: {ARTIFACT_FORMAT})")
+    reg.add_argument('--activate', action='store_true',
+                     help='Make the new version active')
+
+    act = sub.add_parser('activate', help='Switch the active version')
+    act.add_argument('version')
+
+    sea = sub.add_parser('seal', help='Record checksums for a version without a manifest')
+    sea.add_argument('version', nargs='?', default=LEGACY_VERSION,
+                     help=f"Version to seal (default: {LEGACY_VERSION}, the flat layout)")
+
+    args = parser.parse_args()
+    if args.command == 'list':
+        list_versions()
+    elif args.command == 'register':
+        register(args.from_dir, args.version, args.format, args.activate)
+    elif args.command == 'seal':
+        seal(args.version)
+    else:
+        activate(args.version)
+
+
+if __name__ == "__main__":
+    main()
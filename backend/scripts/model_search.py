@@ -0,0 +1,193 @@
+"""
+Model Search Helpers
+ScholarSense - AI-Powered Academic Intelligence System
+Hyper-parameter search and feature caching for the retraining script:
+- a feature-matrix cache (npz) keyed by a hash of the training data
+  snapshot, so repeated runs on unchanged data skip DB extraction
+- grid / random search over GradientBoostingClassifier and
+  HistGradientBoostingClassifier with parallel CV folds (n_jobs)
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from datetime import date
+
+import numpy as np
+from sqlalchemy import func
+
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV, StratifiedKFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from backend.database.models import Student, AcademicRecord, Attendance, BehavioralIncident
+
+# ── Constants ──────────────────────────────────────────────────────────────────
+FEATURE_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "processed" / "feature_cache"
+# Bump when the extraction logic changes so old caches are ignored
+FEATURE_SET_VERSION = 2
+
+CANDIDATES = {
+    'gb':  GradientBoostingClassifier,
+    'hgb': HistGradientBoostingClassifier,
+}
+
+# Default search spaces (overridable with --search-config JSON:
+#   {"gb": {"n_estimators": [100, 200], ...}, "hgb": {...}})
+SEARCH_SPACES = {
+    'gb': {
+        'n_estimators':      [100, 200, 300],
+        'learning_rate':     [0.05, 0.1],
+        'max_depth':         [3, 5],
+        'min_samples_leaf':  [2, 5],
+        'subsample':         [0.8, 1.0],
+    },
+    'hgb': {
+        'max_iter':          [100, 200, 300],
+        'learning_rate':     [0.05, 0.1],
+        'max_depth':         [None, 5],
+        'min_samples_leaf':  [10, 20],
+        'l2_regularization': [0.0, 1.0],
+    },
+}
+
+TOP_CANDIDATES_IN_METADATA = 10
+
+
+# ==============================================================================
+# FEATURE CACHE
+# ==============================================================================
+
+def data_snapshot_key(db, extra=None):
+    """
+    sha256 over row counts, max ids and last-modified times of every table
+    the features come from (plus today's date, since attendance windows
+    and ages are relative to it)
+    """
+    signature = []
+    for model, stamp in ((Student, Student.updated_at),
+                         (AcademicRecord, AcademicRecord.updated_at),
+                         (Attendance, Attendance.updated_at),
+                         (BehavioralIncident, BehavioralIncident.created_at)):
+        count, max_id, last = db.query(
+            func.count(model.id), func.max(model.id), func.max(stamp)
+        ).one()
+        signature.append([model.__tablename__, count, max_id, str(last)])
+
+    payload = json.dumps(
+        [FEATURE_SET_VERSION, date.today().isoformat(), signature, extra], default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_cached_features(key, cache_dir=FEATURE_CACHE_DIR):
+    """(X, y) from the cache, or None on a miss"""
+    path = Path(cache_dir) / f"features_{key[:16]}.npz"
+    if not path.exists():
+        return None
+    with np.load(path) as cached:
+        if str(cached['key']) != key:
+            return None
+        print(f"   ♻️  Feature cache hit → {path.name} ({len(cached['y'])} rows)")
+        return cached['X'], cached['y']
+
+
+def save_cached_features(key, X, y, cache_dir=FEATURE_CACHE_DIR):
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"features_{key[:16]}.npz"
+    tmp  = cache_dir / f".{path.name}.tmp.npz"
+    np.savez_compressed(tmp, X=X, y=y, key=np.array(key))
+    tmp.replace(path)
+    print(f"   💾 Feature matrix cached → {path.name}")
+
+
+# ==============================================================================
+# HYPER-PARAMETER SEARCH
+# ==============================================================================
+
+def load_search_spaces(config_path=None):
+    """Default spaces, with families overridden from a JSON file"""
+    spaces = {name: dict(space) for name, space in SEARCH_SPACES.items()}
+    if config_path:
+        with open(config_path) as f:
+            for name, space in json.load(f).items():
+                if name not in CANDIDATES:
+                    raise ValueError(f"Unknown candidate '{name}' in {config_path}")
+                spaces[name] = space
+    return spaces
+
+
+def run_search(X, y, candidates=('gb',), mode='grid', n_iter=20, cv=5,
+               n_jobs=-1, spaces=None, random_state=42):
+    """
+    Search every candidate family and keep the best by mean CV accuracy
+    The scaler is part of the searched pipeline, so each fold scales on
+    its own training split.
+    Returns: (best_pipeline, summary dict for the model metadata)
+    """
+    spaces  = spaces or SEARCH_SPACES
+    folds   = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    results = []
+    best    = None
+
+    for name in candidates:
+        pipeline = Pipeline([
+            ('scaler', StandardScaler()),
+            ('model',  CANDIDATES[name](random_state=random_state)),
+        ])
+        grid = {f"model__{param}": values for param, values in spaces[name].items()}
+
+        if mode == 'random':
+            search = RandomizedSearchCV(
+                pipeline, grid, n_iter=n_iter, cv=folds, scoring='accuracy',
+                n_jobs=n_jobs, random_state=random_state, refit=True
+            )
+        else:
+            search = GridSearchCV(
+                pipeline, grid, cv=folds, scoring='accuracy', n_jobs=n_jobs, refit=True
+            )
+
+        n_fits = int(np.prod([len(v) for v in grid.values()]))
+        if mode == 'random':
+            n_fits = min(n_iter, n_fits)
+        print(f"\n   ⏳ {CANDIDATES[name].__name__}: {n_fits} candidates x {cv} folds "
+              f"(n_jobs={n_jobs})...")
+        search.fit(X, y)
+        print(f"   ✅ Best CV accuracy: {search.best_score_ * 100:.2f}% "
+              f"with {_strip_prefix(search.best_params_)}")
+
+        cv_results = search.cv_results_
+        for i in range(len(cv_results['params'])):
+            results.append({
+                'family':     name,
+                'params':     _strip_prefix(cv_results['params'][i]),
+                'cv_mean':    float(cv_results['mean_test_score'][i]),
+                'cv_std':     float(cv_results['std_test_score'][i]),
+                'fit_time_s': float(cv_results['mean_fit_time'][i]),
+            })
+        if best is None or search.best_score_ > best[1].best_score_:
+            best = (name, search)
+
+    name, search = best
+    results.sort(key=lambda r: r['cv_mean'], reverse=True)
+    best_index = search.best_index_
+    summary = {
+        'mode':        mode,
+        'cv_folds':    cv,
+        'n_jobs':      n_jobs,
+        'candidates':  list(candidates),
+        'best_family': name,
+        'best_params': _strip_prefix(search.best_params_),
+        'cv_mean':     float(search.best_score_),
+        'cv_std':      float(search.cv_results_['std_test_score'][best_index]),
+        'evaluated':   len(results),
+        'top':         results[:TOP_CANDIDATES_IN_METADATA],
+    }
+    return search.best_estimator_, summary
+
+
+def _strip_prefix(params):
+    """{'model__max_depth': 5} → {'max_depth': 5}"""
+    return {key.split('__', 1)[-1]: value for key, value in params.items()}
@@ -0,0 +1,51 @@
+"""
+Evaluate parent notification rules for the whole school (or a class)
+and queue the alerts that are due, e.g. after an exam upload.
+
+Run from project root (venv active):
+    python backend/scripts/notification_sweep.py [--grade 8] [--section A]
+
+Options:
+    --grade:   Only students in this grade
+    --section: Only students in this section
+    --rules:   Comma-separated subset of low_gpa,failed_subjects,
+               low_attendance,high_risk (default: all)
+"""
+import sys
+import argparse
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.notification_service import (  # noqa: E402
+    NotificationService, SWEEP_RULES
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Queue due parent notifications')
+    parser.add_argument('--grade', type=int, help='Only this grade')
+    parser.add_argument('--section', help='Only this section')
+    parser.add_argument('--rules', default=','.join(SWEEP_RULES),
+                        help='Comma-separated rules to evaluate')
+    args = parser.parse_args()
+
+    result = NotificationService.sweep(
+        grade   = args.grade,
+        section = args.section,
+        rules   = [r.strip() for r in args.rules.split(',') if r.strip()]
+    )
+    if result.get('status') == 'error':
+        print(f"Error: {result.get('message')}")
+        sys.exit(1)
+
+    print(f"Students: {result['total_students']} | Queued: {result['queued']} | "
+          f"Failed: {result['failed']} | Cooldown: {result['cooldown']} | "
+          f"No trigger: {result['no_trigger']} | No parent email: {result['skipped']}")
+    for rule, count in result['by_type'].items():
+        print(f"{rule:>16}: {count}")
+
+
+if __name__ == "__main__":
+    main()
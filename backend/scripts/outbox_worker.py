@@ -0,0 +1,66 @@
+"""
+Deliver queued email from the outbox.
+
+Run from project root (venv active), as a long-running process next to
+the API (set OUTBOX_WORKER_ENABLED=0 for the API to leave delivery to it):
+    python backend/scripts/outbox_worker.py [--concurrency 4] [--once]
+
+Options:
+    --concurrency: Messages delivered in parallel (default OUTBOX_CONCURRENCY)
+    --once:        Deliver everything currently due, then exit (cron)
+    --stats:       Print queue counts and exit
+"""
+import sys
+import argparse
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.outbox_service import (  # noqa: E402
+    OutboxService, OUTBOX_CONCURRENCY, OUTBOX_POLL_SECONDS
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deliver queued outbox email')
+    parser.add_argument('--concurrency', type=int, default=OUTBOX_CONCURRENCY,
+                        help='Messages delivered in parallel')
+    parser.add_argument('--poll-seconds', type=int, default=OUTBOX_POLL_SECONDS,
+                        help='Seconds between queue polls')
+    parser.add_argument('--once', action='store_true',
+                        help='Drain what is due now, then exit')
+    parser.add_argument('--stats', action='store_true',
+                        help='Print queue counts and exit')
+    args = parser.parse_args()
+
+    if args.stats:
+        result = OutboxService.get_stats()
+        if result.get('status') != 'success':
+            print(f"Error: {result.get('message')}")
+            sys.exit(1)
+        for status, count in result['data']['by_status'].items():
+            print(f"{status:>8}: {count}")
+        print(f"Oldest queued: {result['data']['oldest_queued'] or '-'}")
+        return
+
+    if args.once:
+        result = OutboxService.drain(concurrency=args.concurrency)
+        if result.get('status') != 'success':
+            print(f"Error: {result.get('message')}")
+            sys.exit(1)
+        print(f"Claimed: {result['claimed']} | Sent: {result['sent']} | "
+              f"Retrying: {result['retrying']} | Failed: {result['failed']} | "
+              f"Throttled: {result['throttled']}")
+        return
+
+    print(f"📮 Outbox worker running (concurrency {args.concurrency}, "
+          f"polling every {args.poll_seconds}s) — Ctrl+C to stop")
+    try:
+        OutboxService.run_forever(args.concurrency, args.poll_seconds)
+    except KeyboardInterrupt:
+        print("\n📮 Outbox worker stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Rebuild the student_latest_risk projection from risk_predictions.
+
+Run from project root (venv active) after applying
+backend/database/latest_risk_migration.sql, or whenever risk_predictions
+was edited outside PredictionService:
+    python backend/scripts/rebuild_latest_risk.py
+"""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.prediction_service import PredictionService  # noqa: E402
+
+
+def main():
+    result = PredictionService.rebuild_latest_risk()
+    if 'error' in result:
+        print(f"Error: {result['error']}")
+        sys.exit(1)
+    print(f"Latest risk rows rebuilt: {result['students']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Re-score every student queued in dirty_students.
+
+Run from project root (venv active), e.g. nightly from cron:
+    python backend/scripts/rescore_dirty_students.py [--now]
+
+Options:
+    --now: Ignore the debounce window and take students marked moments ago
+"""
+import sys
+import argparse
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.rescore_service import RescoreService  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-score dirty students')
+    parser.add_argument('--now', action='store_true',
+                        help='Ignore the debounce window')
+    args = parser.parse_args()
+
+    kwargs = {'debounce_seconds': 0} if args.now else {}
+    result = RescoreService.rescore_all_pending(**kwargs)
+    if result.get('status') != 'success':
+        print(f"Error: {result.get('message')}")
+        sys.exit(1)
+    print(f"Students claimed: {result['claimed']}")
+    print(f"New predictions (changed): {result['changed']}")
+    print(f"Unchanged: {result['unchanged']} | Skipped (no data): {result['skipped']}")
+
+
+if __name__ == "__main__":
+    main()
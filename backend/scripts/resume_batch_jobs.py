@@ -0,0 +1,26 @@
+"""
+Resume batch jobs interrupted by a restart.
+
+Requeues running jobs whose owner stopped heartbeating and runs every
+queued job in this process, waiting until they finish. Run it from one
+place only (e.g. once per deploy), never from each API worker.
+
+Run from project root (venv active):
+    python backend/scripts/resume_batch_jobs.py
+"""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.services.batch_job_service import BatchJobService  # noqa: E402
+
+
+def main():
+    resumed = BatchJobService.resume_jobs()
+    print(f"Batch jobs resumed: {resumed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,25 @@ Retrains the Gradient Boosting Classifier on UCI-imported data
 from PostgreSQL database.
 
 Usage:
-    python backend/scripts/retrain_model.py
+    python backend/scripts/retrain_model.py [--search grid|random]
+           [--candidates gb hgb] [--n-iter 20] [--cv 5] [--n-jobs -1]
+           [--search-config spaces.json] [--no-cache]
+
+Options:
+    --search:        Hyper-parameter search mode (default: none, train the
+                     fixed configuration)
+    --candidates:    Model families to search: gb (GradientBoosting),
+                     hgb (HistGradientBoosting) (default: gb)
+    --n-iter:        Sampled configurations per family for --search random
+    --cv:            Cross-validation folds (default 5)
+    --n-jobs:        Parallel CV fits (default -1 = all cores)
+    --search-config: JSON file overriding the search spaces per family
+    --no-cache:      Always re-extract features from the database
 """
 
 import sys
+import time
+import argparse
 import os
 from pathlib import Path
 
@@ -18,8 +33,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import numpy as np
-import pickle
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from sqlalchemy import func
 
 # Suppress warnings
@@ -37,25 +51,17 @@ from sklearn.metrics import (
 
 # Project imports
 from backend.database.db_config import SessionLocal
-from backend.database.models import (
-    Student, AcademicRecord, Attendance, BehavioralIncident
-)
+from backend.database.models import Student
 from backend.scripts.uci_column_mapping import derive_risk_label
+from backend.scripts.model_search import (
+    data_snapshot_key, load_cached_features, save_cached_features,
+    load_search_spaces, run_search, CANDIDATES
+)
 
-# ── Model save path ────────────────────────────────────────────────────────────
-MODEL_DIR  = Path(__file__).parent.parent.parent / "models" / "saved_models"
-MODEL_PATH = MODEL_DIR / "best_model.pkl"
-SCALER_PATH    = MODEL_DIR / "scaler.pkl"
-ENCODER_PATH   = MODEL_DIR / "label_encoders.pkl"
-METADATA_PATH  = MODEL_DIR / "model_metadata.pkl"
-
-FEATURE_NAMES = [
-    'age', 'grade', 'gender', 'socioeconomic_status', 'parent_education',
-    'current_gpa', 'previous_gpa', 'grade_trend', 'attendance_rate',
-    'failed_subjects', 'assignment_submission_rate', 'behavioral_incidents',
-    'math_score', 'science_score', 'english_score', 'social_score',
-    'language_score'
-]
+from backend.services.model_registry import ModelRegistry, REGISTRY_DIR as MODEL_DIR
+from backend.services.feature_store import (
+    FeatureStore, FEATURE_NAMES, TRAINING_CHUNK_SIZE
+)
 
 RISK_LABELS = {0: 'Low', 1: 'Medium', 2: 'High', 3: 'Critical'}
 
@@ -64,9 +70,12 @@ RISK_LABELS = {0: 'Low', 1: 'Medium', 2: 'High', 3: 'Critical'}
 # STEP 1 — EXTRACT FEATURES FROM DATABASE
 # ==============================================================================
 
-def extract_features_from_db():
+def extract_features_from_db(chunk_size=TRAINING_CHUNK_SIZE):
     """
     Extract all student features from PostgreSQL for ML training.
+    Streams students through the feature store in chunks (a few grouped
+    queries per chunk), building exactly the features online inference
+    sees for the same student.
     Returns: (X, y) numpy arrays
     """
     print("\n📦 Extracting features from database...")
@@ -74,106 +83,35 @@ def extract_features_from_db():
     db = SessionLocal()
     features_list = []
     labels_list   = []
-    skipped       = 0
+    started       = time.perf_counter()
 
     try:
-        # Get all active students
-        students = db.query(Student).filter(
+        total_students = db.query(func.count(Student.id)).filter(
             Student.is_active == True
-        ).all()
-
-        print(f"   Found {len(students)} active students")
-
-        for student in students:
-
-            # ── Get latest academic record ──────────────────────────────────
-            academic = db.query(AcademicRecord).filter(
-                AcademicRecord.student_id == student.id
-            ).order_by(AcademicRecord.recorded_date.desc()).first()
-
-            if not academic:
-                skipped += 1
-                continue
-
-            # ── Get attendance rate (last 90 days) ──────────────────────────
-            ninety_days_ago = date.today() - timedelta(days=90)
-
-            total_days = db.query(func.count(Attendance.id)).filter(
-                Attendance.student_id == student.id,
-                Attendance.attendance_date >= ninety_days_ago
-            ).scalar() or 0
-
-            present_days = db.query(func.count(Attendance.id)).filter(
-                Attendance.student_id == student.id,
-                Attendance.attendance_date >= ninety_days_ago,
-                Attendance.status == 'present'
-            ).scalar() or 0
-
-            attendance_rate = (
-                round(present_days / total_days * 100, 2)
-                if total_days > 0 else 95.0
-            )
-
-            # ── Behavioral incidents (last 90 days) ─────────────────────────
-            try:
-                incident_count = db.query(
-                    func.count(BehavioralIncident.id)
-                ).filter(
-                    BehavioralIncident.student_id == student.id,
-                ).scalar() or 0
-            except Exception:
-                incident_count = 0
-
-            # ── Encode categorical features ─────────────────────────────────
-            gender_enc = 1 if student.gender == 'Male' else 0
-
-            ses_map = {'Low': 0, 'Medium': 1, 'High': 2}
-            ses_enc = ses_map.get(
-                student.socioeconomic_status or 'Medium', 1
-            )
-
-            edu_map = {
-                'None': 0, 'High School': 1,
-                'Graduate': 2, 'Post-Graduate': 3
-            }
-            edu_enc = edu_map.get(
-                student.parent_education or 'High School', 1
-            )
-
-            # ── Build feature vector ────────────────────────────────────────
-            feature_vector = [
-                student.age or 14,
-                student.grade,
-                gender_enc,
-                ses_enc,
-                edu_enc,
-                float(academic.current_gpa or 0),
-                float(academic.previous_gpa or 0),
-                float(academic.grade_trend or 0),
-                attendance_rate,
-                int(academic.failed_subjects or 0),
-                float(academic.assignment_submission_rate or 80),
-                incident_count,
-                float(academic.math_score or 0),
-                float(academic.science_score or 0),
-                float(academic.english_score or 0),
-                float(academic.social_score or 0),
-                float(academic.language_score or 0),
-            ]
+        ).scalar() or 0
+        print(f"   Found {total_students} active students")
 
+        for student, features, absences in FeatureStore.iter_training_rows(
+            db, chunk_size=chunk_size
+        ):
             # ── Derive risk label from academic data ────────────────────────
             # Convert GPA (0-100) back to 0-20 scale for risk derivation
-            g3_approx  = int((float(academic.current_gpa or 0)) / 5)
-            failures   = int(academic.failed_subjects or 0)
-            absences   = total_days - present_days
+            g3_approx = int(features['current_gpa'] / 5)
+            failures  = int(features['failed_subjects'])
 
             risk_level, _ = derive_risk_label(g3_approx, failures, absences)
 
-            features_list.append(feature_vector)
+            features_list.append(features)
             labels_list.append(risk_level)
 
-        print(f"   ✅ Features extracted: {len(features_list)} students")
-        print(f"   ⚠️  Skipped (no academic record): {skipped}")
+        # Categoricals use the same fallback codes the API applies when a
+        # model version ships without label encoders
+        X = FeatureStore.encode_matrix(features_list, feature_order=FEATURE_NAMES)
+        y = np.array(labels_list)
+
+        print(f"   ✅ Features extracted: {len(features_list)} students "
+              f"in {time.perf_counter() - started:.1f}s")
+        print(f"   ⚠️  Skipped (no academic record): {total_students - len(features_list)}")
 
         # ── Show class distribution ─────────────────────────────────────────
         from collections import Counter
@@ -186,17 +124,40 @@ def extract_features_from_db():
             bar   = '█' * int(pct // 3)
             print(f"      {label:<10}: {count:3} students ({pct:5.1f}%)  {bar}")
 
-        return np.array(features_list), np.array(labels_list)
+        return X, y
+
+    finally:
+        db.close()
 
+
+def extract_features_cached(use_cache=True):
+    """
+    Feature matrix from the on-disk cache when the data snapshot is
+    unchanged since it was written, else extracted (and cached) afresh
+    """
+    if not use_cache:
+        return extract_features_from_db()
+
+    db = SessionLocal()
+    try:
+        key = data_snapshot_key(db, extra=FEATURE_NAMES)
     finally:
         db.close()
 
+    cached = load_cached_features(key)
+    if cached is not None:
+        return cached
+
+    X, y = extract_features_from_db()
+    save_cached_features(key, X, y)
+    return X, y
+
 
 # ==============================================================================
 # STEP 2 — TRAIN THE MODEL
 # ==============================================================================
 
-def train_model(X, y):
+def train_model(X, y, cv=5, n_jobs=-1):
     """
     Train Gradient Boosting Classifier on extracted features.
     Returns: trained model, scaler, accuracy score
@@ -239,10 +200,10 @@ def train_model(X, y):
     print(f"   🎯 Test Accuracy: {accuracy * 100:.2f}%")
 
     # ── Cross validation ─────────────────────────────────────────────────────
-    print("\n   📊 Running 5-fold cross validation...")
+    print(f"\n   📊 Running {cv}-fold cross validation (n_jobs={n_jobs})...")
     cv_scores = cross_val_score(
         model, scaler.transform(X), y,
-        cv=5, scoring='accuracy'
+        cv=cv, scoring='accuracy', n_jobs=n_jobs
     )
     print(f"   CV Scores  : {[f'{s*100:.1f}%' for s in cv_scores]}")
     print(f"   CV Mean    : {cv_scores.mean()*100:.2f}%")
@@ -272,63 +233,97 @@ def train_model(X, y):
     return model, scaler, accuracy
 
 
+def train_model_search(X, y, mode, candidates, n_iter, cv, n_jobs, spaces):
+    """
+    Search hyper-parameters on the training split, then score the best
+    configuration once on the held-out test split.
+    Returns: trained model, scaler, accuracy score, search summary
+    """
+    print(f"\n🔎 Hyper-parameter search ({mode}) over {', '.join(candidates)}...")
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y,
+        test_size=0.2,
+        random_state=42,
+        stratify=y
+    )
+    print(f"   Train size : {len(X_train)} samples")
+    print(f"   Test size  : {len(X_test)} samples")
+
+    pipeline, summary = run_search(
+        X_train, y_train, candidates=candidates, mode=mode,
+        n_iter=n_iter, cv=cv, n_jobs=n_jobs, spaces=spaces
+    )
+    scaler = pipeline.named_steps['scaler']
+    model  = pipeline.named_steps['model']
+
+    y_pred   = model.predict(scaler.transform(X_test))
+    accuracy = accuracy_score(y_test, y_pred)
+    summary['test_accuracy'] = float(accuracy)
+
+    print(f"\n   🏆 Best: {type(model).__name__} {summary['best_params']}")
+    print(f"   CV Mean    : {summary['cv_mean']*100:.2f}% (±{summary['cv_std']*100:.2f}%)")
+    print(f"   🎯 Test Accuracy: {accuracy * 100:.2f}%")
+
+    print("\n   📋 Classification Report:")
+    print("   " + "-" * 55)
+    report = classification_report(
+        y_test, y_pred,
+        target_names=['Low', 'Medium', 'High', 'Critical'],
+        digits=3
+    )
+    for line in report.split('\n'):
+        print(f"   {line}")
+
+    return model, scaler, accuracy, summary
+
+
 # ==============================================================================
 # STEP 3 — SAVE MODEL & METADATA
 # ==============================================================================
 
-def save_model(model, scaler, accuracy):
+def save_model(model, scaler, accuracy, activate=True, search=None):
     """
-    Save trained model, scaler, and metadata to disk.
+    Publish the trained model, scaler, and metadata as a new registry
+    version. Running API workers pick it up on their next ACTIVE poll.
     """
-    print(f"\n💾 Saving model to {MODEL_DIR}...")
-
-    # Create directory if it doesn't exist
-    MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    print(f"\n💾 Registering model in {MODEL_DIR}...")
 
-    # ── Save model ───────────────────────────────────────────────────────────
-    with open(MODEL_PATH, 'wb') as f:
-        pickle.dump(model, f)
-    print(f"   ✅ Model saved     → {MODEL_PATH.name}")
-
-    # ── Save scaler ──────────────────────────────────────────────────────────
-    with open(SCALER_PATH, 'wb') as f:
-        pickle.dump(scaler, f)
-    print(f"   ✅ Scaler saved    → {SCALER_PATH.name}")
-
-    # ── Save metadata ────────────────────────────────────────────────────────
     metadata = {
-        'model_type'    : 'GradientBoostingClassifier',
+        'model_type'    : type(model).__name__,
         'feature_names' : FEATURE_NAMES,
         'risk_labels'   : RISK_LABELS,
         'accuracy'      : accuracy,
         'trained_on'    : date.today().isoformat(),
+        'trained_date'  : datetime.now().isoformat(),
         'n_features'    : len(FEATURE_NAMES),
         'n_classes'     : 4,
         'pass_mark'     : 35,
-        'version'       : '2.0'
     }
-    with open(METADATA_PATH, 'wb') as f:
-        pickle.dump(metadata, f)
-    print(f"   ✅ Metadata saved  → {METADATA_PATH.name}")
+    if search:
+        metadata['search'] = search
+    version = ModelRegistry.register(
+        model, scaler=scaler, metadata=metadata, activate=activate
+    )
 
     # ── File sizes ────────────────────────────────────────────────────────────
-    model_size  = MODEL_PATH.stat().st_size / 1024
-    scaler_size = SCALER_PATH.stat().st_size / 1024
-    print(f"\n   📦 Model size  : {model_size:.1f} KB")
-    print(f"   📦 Scaler size : {scaler_size:.1f} KB")
+    print(f"   ✅ Version         → {version}{' (active)' if activate else ''}")
+    for path in sorted((MODEL_DIR / version).iterdir()):
+        print(f"   📦 {path.name:<20}: {path.stat().st_size / 1024:.1f} KB")
+    return version
 
 
 # ==============================================================================
 # MAIN
 # ==============================================================================
 
-def run_retraining():
+def run_retraining(args):
     print("\n" + "=" * 65)
     print("  🤖 SCHOLARSENSE — ML MODEL RETRAINING")
     print("=" * 65)
 
     # ── Step 1: Extract features ─────────────────────────────────────────────
-    X, y = extract_features_from_db()
+    X, y = extract_features_cached(use_cache=not args.no_cache)
 
     if len(X) < 50:
         print("\n❌ Not enough data to train! Need at least 50 students.")
@@ -336,17 +331,26 @@ def run_retraining():
         sys.exit(1)
 
     # ── Step 2: Train model ──────────────────────────────────────────────────
-    model, scaler, accuracy = train_model(X, y)
+    search = None
+    if args.search == 'none':
+        model, scaler, accuracy = train_model(X, y, cv=args.cv, n_jobs=args.n_jobs)
+    else:
+        model, scaler, accuracy, search = train_model_search(
+            X, y, mode=args.search, candidates=args.candidates,
+            n_iter=args.n_iter, cv=args.cv, n_jobs=args.n_jobs,
+            spaces=load_search_spaces(args.search_config)
+        )
 
     # ── Step 3: Save model ───────────────────────────────────────────────────
-    save_model(model, scaler, accuracy)
+    version = save_model(model, scaler, accuracy, search=search)
 
     # ── Final summary ────────────────────────────────────────────────────────
     print("\n" + "=" * 65)
     print("  ✅ RETRAINING COMPLETE — SUMMARY")
     print("=" * 65)
     print(f"  🎯 Final Accuracy   : {accuracy * 100:.2f}%")
-    print(f"  📦 Model saved to   : models/saved_models/best_model.pkl")
+    print(f"  🤖 Model            : {type(model).__name__}")
+    print(f"  📦 Model version    : {version} (models/saved_models/{version}/)")
     print(f"  📅 Trained on       : {date.today().isoformat()}")
     print(f"  🔢 Features used    : {len(FEATURE_NAMES)}")
     print(f"  📊 Training samples : {len(X)}")
@@ -355,5 +359,24 @@ def run_retraining():
     print("   Your ML model is now trained on real UCI data.\n")
 
 
+def main():
+    parser = argparse.ArgumentParser(description='Retrain the ScholarSense risk model')
+    parser.add_argument('--search', choices=['none', 'grid', 'random'], default='none',
+                        help='Hyper-parameter search mode')
+    parser.add_argument('--candidates', nargs='+', choices=sorted(CANDIDATES), default=['gb'],
+                        help='Model families to search')
+    parser.add_argument('--n-iter', type=int, default=20,
+                        help='Configurations per family for random search')
+    parser.add_argument('--cv', type=int, default=5,
+                        help='Cross-validation folds')
+    parser.add_argument('--n-jobs', type=int, default=-1,
+                        help='Parallel CV fits (-1 = all cores)')
+    parser.add_argument('--search-config', default=None,
+                        help='JSON file overriding the search spaces')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-extract features even if a cached matrix matches')
+    run_retraining(parser.parse_args())
+
+
 if __name__ == "__main__":
-    run_retraining()
+    main()
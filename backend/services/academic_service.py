@@ -5,6 +5,8 @@ ScholarSense - AI-Powered Academic Intelligence System
 from datetime import datetime, date
 from backend.database.models import Student, AcademicRecord
 from backend.database.db_config import get_db
+from backend.services.analytics_service import AnalyticsService
+from backend.services.rescore_service import RescoreService
 from sqlalchemy import desc
 
 class AcademicService:
@@ -56,7 +58,9 @@ class AcademicService:
             )
             
             db.add(record)
+            RescoreService.mark_dirty(db, [record.student_id], 'academic')
             db.commit()
+            AnalyticsService.invalidate_overview()
             db.refresh(record)
             
             return record.to_dict()
@@ -133,7 +137,9 @@ class AcademicService:
                 record.grade_trend = float(record.current_gpa) - float(record.previous_gpa)
             
             record.updated_at = datetime.utcnow()
+            RescoreService.mark_dirty(db, [record.student_id], 'academic')
             db.commit()
+            AnalyticsService.invalidate_overview()
             db.refresh(record)
             
             return record.to_dict()
@@ -154,8 +160,10 @@ class AcademicService:
             if not record:
                 return {'error': 'Academic record not found'}
             
+            RescoreService.mark_dirty(db, [record.student_id], 'academic')
             db.delete(record)
             db.commit()
+            AnalyticsService.invalidate_overview()
             return {'message': 'Academic record deleted successfully'}
         except Exception as e:
             db.rollback()
@@ -0,0 +1,247 @@
+"""
+Analytics Service - School-wide overview aggregates
+ScholarSense - AI-Powered Academic Intelligence System
+Builds the school overview from two aggregate queries and keeps the
+result in a per-process snapshot until it expires or the shared write
+generation moves. Triggers on every table the overview reads advance
+that generation (analytics_generation_migration.sql), so writes from
+any process invalidate every worker's snapshot on its next read. A
+write whose transaction is still open while a snapshot is rebuilt can
+be missed until OVERVIEW_TTL_SECONDS expires.
+"""
+
+import os
+import time
+import threading
+from datetime import datetime
+from sqlalchemy import func, select, case, literal, true, text
+from backend.database.models import (
+    Student, AcademicRecord, StudentLatestRisk,
+    BehavioralIncident, Communication, Attendance
+)
+from backend.database.db_config import SessionLocal
+
+# ============================================
+# CONSTANTS
+# ============================================
+RISK_LEVELS          = ['Low', 'Medium', 'High', 'Critical']
+CONFIDENCE_BUCKETS   = ['90-100%', '75-89%', '60-74%', '<60%']
+OVERVIEW_TTL_SECONDS = int(os.getenv('ANALYTICS_SNAPSHOT_TTL', 300))
+
+GENERATION_QUERY     = text('SELECT last_value FROM analytics_overview_generation')
+
+# Snapshot store: {'data': dict, 'expires_at': float, 'version': int,
+#                  'generation': shared write generation it was built at}
+_snapshot      = {'data': None, 'expires_at': 0.0, 'version': 0, 'generation': None}
+_snapshot_lock = threading.Lock()
+_build_lock    = threading.Lock()   # one rebuild at a time
+
+
+class AnalyticsService:
+    """School overview analytics with a cached snapshot"""
+
+    # ──────────────────────────────────────────
+    # SNAPSHOT CACHE
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def invalidate_overview():
+        """
+        Drop this process's cached overview right away (other processes
+        pick the write up through the shared generation)
+        """
+        with _snapshot_lock:
+            _snapshot['data']        = None
+            _snapshot['expires_at']  = 0.0
+            _snapshot['version']    += 1
+
+    @staticmethod
+    def get_school_overview() -> dict:
+        """
+        Cached school overview
+        Concurrent callers during a rebuild wait for the one query run
+        instead of each hitting the database.
+        """
+        generation = AnalyticsService._shared_generation()
+        cached     = AnalyticsService._cached_overview(generation)
+        if cached is not None:
+            return cached
+
+        with _build_lock:
+            cached = AnalyticsService._cached_overview(generation)
+            if cached is not None:
+                return cached
+
+            with _snapshot_lock:
+                version = _snapshot['version']
+
+            data = AnalyticsService.build_school_overview()
+
+            with _snapshot_lock:
+                # A write landed while we were querying: serve, but don't cache
+                if version == _snapshot['version']:
+                    _snapshot['data']       = data
+                    _snapshot['expires_at'] = time.monotonic() + OVERVIEW_TTL_SECONDS
+                    _snapshot['generation'] = generation
+            return data
+
+    @staticmethod
+    def _cached_overview(generation):
+        """Snapshot data if still fresh and built at `generation`, else None"""
+        with _snapshot_lock:
+            if _snapshot['data'] is not None and \
+                    time.monotonic() < _snapshot['expires_at'] and \
+                    _snapshot['generation'] == generation:
+                return _snapshot['data']
+        return None
+
+    @staticmethod
+    def _shared_generation():
+        """
+        Current write generation, or None when the migration isn't
+        applied (snapshots then only expire or invalidate in-process)
+        """
+        db = SessionLocal()
+        try:
+            return db.execute(GENERATION_QUERY).scalar()
+        except Exception:
+            return None
+        finally:
+            db.close()
+
+    # ──────────────────────────────────────────
+    # AGGREGATES
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def build_school_overview() -> dict:
+        """
+        Compute the overview from scratch
+        1. Students x academic records x latest risk, ROLLUP(grade, section)
+           → school, per-grade and per-section rows in one pass
+        2. Risk / confidence bucket counts plus attendance, incident and
+           communication totals as one row
+        """
+        db = SessionLocal()
+        try:
+            is_at_risk = StudentLatestRisk.risk_label.in_(['High', 'Critical'])
+
+            rollup_rows = db.query(
+                Student.grade,
+                Student.section,
+                func.grouping(Student.grade).label('g_grade'),
+                func.grouping(Student.section).label('g_section'),
+                func.count(Student.id.distinct()).label('total'),
+                func.avg(AcademicRecord.current_gpa).label('avg_gpa'),
+                func.min(AcademicRecord.current_gpa).label('min_gpa'),
+                func.max(AcademicRecord.current_gpa).label('max_gpa'),
+                func.count(Student.id.distinct()).filter(is_at_risk).label('at_risk')
+            ).outerjoin(
+                AcademicRecord, AcademicRecord.student_id == Student.id
+            ).outerjoin(
+                StudentLatestRisk, StudentLatestRisk.student_id == Student.id
+            ).filter(
+                Student.is_active == True
+            ).group_by(
+                func.rollup(Student.grade, Student.section)
+            ).all()
+
+            total_active = 0
+            avg_gpa      = 0.0
+            grade_stats, gpa_by_grade, section_stats = [], [], []
+
+            for r in rollup_rows:
+                row_avg = round(float(r.avg_gpa or 0), 1)
+                if r.g_grade:                       # () — whole school
+                    total_active = r.total
+                    avg_gpa      = row_avg
+                elif r.g_section:                   # (grade)
+                    grade_stats.append({
+                        'grade':   r.grade,
+                        'total':   r.total,
+                        'avg_gpa': row_avg
+                    })
+                    gpa_by_grade.append({
+                        'grade':   r.grade,
+                        'avg_gpa': row_avg,
+                        'min_gpa': round(float(r.min_gpa or 0), 1),
+                        'max_gpa': round(float(r.max_gpa or 0), 1)
+                    })
+                else:                               # (grade, section)
+                    section_stats.append({
+                        'grade':         r.grade,
+                        'section':       r.section,
+                        'total':         r.total,
+                        'avg_gpa':       row_avg,
+                        'at_risk_count': r.at_risk
+                    })
+
+            grade_stats.sort(key=lambda x: x['grade'])
+            gpa_by_grade.sort(key=lambda x: x['grade'])
+            section_stats.sort(key=lambda x: (x['grade'], x['section'] or ''))
+
+            # ── Bucketed counts + totals (one row) ──────────────
+            conf = StudentLatestRisk.confidence_score
+            risk_cols = [
+                func.count().filter(StudentLatestRisk.risk_label == lbl).label(lbl)
+                for lbl in RISK_LEVELS
+            ]
+            conf_bucket = case(
+                (conf >= 90, literal(CONFIDENCE_BUCKETS[0])),
+                (conf >= 75, literal(CONFIDENCE_BUCKETS[1])),
+                (conf >= 60, literal(CONFIDENCE_BUCKETS[2])),
+                else_=literal(CONFIDENCE_BUCKETS[3])
+            )
+            conf_cols = [
+                func.count().filter(conf_bucket == bucket).label(f"conf_{i}")
+                for i, bucket in enumerate(CONFIDENCE_BUCKETS)
+            ]
+
+            bucket_counts = select(*risk_cols, *conf_cols).select_from(
+                StudentLatestRisk
+            ).subquery()
+
+            attendance_counts = select(
+                func.count(Attendance.id).label('att_total'),
+                func.count(Attendance.id).filter(
+                    Attendance.status == 'present'
+                ).label('att_present')
+            ).join(
+                Student, Student.id == Attendance.student_id
+            ).where(Student.is_active == True).subquery()
+
+            totals = db.query(
+                bucket_counts,
+                attendance_counts,
+                select(func.count(BehavioralIncident.id)).scalar_subquery().label('incidents'),
+                select(func.count(Communication.id)).scalar_subquery().label('communications')
+            ).select_from(bucket_counts).join(attendance_counts, true()).one()
+
+            risk_distribution = {lbl: getattr(totals, lbl) or 0 for lbl in RISK_LEVELS}
+            conf_dist = {
+                bucket: getattr(totals, f"conf_{i}") or 0
+                for i, bucket in enumerate(CONFIDENCE_BUCKETS)
+            }
+
+            att_total   = totals.att_total or 0
+            att_present = totals.att_present or 0
+            avg_attendance = round(
+                (att_present / att_total * 100) if att_total > 0 else 0.0, 1
+            )
+
+            return {
+                'total_active':            total_active,
+                'avg_gpa':                 avg_gpa,
+                'avg_attendance':          avg_attendance,
+                'risk_distribution':       risk_distribution,
+                'total_predictions':       sum(risk_distribution.values()),
+                'confidence_distribution': conf_dist,
+                'grade_stats':             grade_stats,
+                'gpa_by_grade':            gpa_by_grade,
+                'section_stats':           section_stats,
+                'total_incidents':         totals.incidents or 0,
+                'total_communications':    totals.communications or 0,
+                'generated_at':            datetime.utcnow().isoformat()
+            }
+        finally:
+            db.close()
@@ -5,9 +5,20 @@ ScholarSense - AI-Powered Academic Intelligence System
 from datetime import date, datetime, timedelta
 from backend.database.models import Attendance, Student
 from backend.database.db_config import get_db
+from backend.services.analytics_service import AnalyticsService
+from backend.services.rescore_service import RescoreService
 from sqlalchemy import func, and_, desc
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List, Dict, Optional
 
+ATTENDANCE_STATUSES = ('present', 'absent', 'late', 'excused')
+# Attendance is marked per day; rows for other periods are left alone
+DAY_PERIOD = 'all_day'
+
+# Rows per multi-row INSERT ... ON CONFLICT statement
+BULK_UPSERT_CHUNK_SIZE = 1000
+
+
 class AttendanceService:
     """Handle attendance tracking and reporting"""
 
@@ -22,7 +33,8 @@ class AttendanceService:
 
             existing = db.query(Attendance).filter(
                 and_(Attendance.student_id == student_id,
-                     Attendance.attendance_date == attendance_date)
+                     Attendance.attendance_date == attendance_date,
+                     Attendance.period == DAY_PERIOD)
             ).first()
 
             if existing:
@@ -36,16 +48,20 @@ class AttendanceService:
                     student_id=student_id,
                     attendance_date=attendance_date,
                     status=status,
+                    period=DAY_PERIOD,
                     remarks=remarks,
                     marked_by=marked_by
                 )
                 db.add(attendance)
                 message = 'Attendance marked'
 
+            RescoreService.mark_dirty(db, [student_id], 'attendance')
             db.commit()
+            AnalyticsService.invalidate_overview()
             record = db.query(Attendance).filter(
                 and_(Attendance.student_id == student_id,
-                     Attendance.attendance_date == attendance_date)
+                     Attendance.attendance_date == attendance_date,
+                     Attendance.period == DAY_PERIOD)
             ).first()
             return {'message': message, 'attendance': record.to_dict()}
         except Exception as e:
@@ -54,46 +70,105 @@ class AttendanceService:
         finally:
             db.close()
 
+    @staticmethod
+    def _validate_bulk_rows(attendance_list: List[Dict]):
+        """
+        Validate bulk attendance entries in one pass
+        Returns: ({(student_id, date): row}, [per-row error strings])
+        Later entries for the same student/day replace earlier ones.
+        """
+        rows, errors = {}, []
+        for index, item in enumerate(attendance_list):
+            student_id      = item.get('student_id')
+            attendance_date = item.get('date')
+            status          = item.get('status')
+
+            if not student_id or not attendance_date or not status:
+                errors.append(f"Row {index}: missing data for entry: {item}")
+                continue
+
+            try:
+                student_id = int(student_id)
+            except (TypeError, ValueError):
+                errors.append(f"Row {index}: invalid student_id '{student_id}'")
+                continue
+
+            if isinstance(attendance_date, str):
+                try:
+                    attendance_date = datetime.strptime(attendance_date, '%Y-%m-%d').date()
+                except ValueError:
+                    errors.append(f"Row {index}: invalid date '{attendance_date}'")
+                    continue
+
+            if status not in ATTENDANCE_STATUSES:
+                errors.append(f"Row {index}: invalid status '{status}'")
+                continue
+
+            rows[(student_id, attendance_date)] = {
+                'row':             index,
+                'student_id':      student_id,
+                'attendance_date': attendance_date,
+                'status':          status,
+                'remarks':         item.get('remarks'),
+            }
+        return rows, errors
+
     @staticmethod
     def mark_bulk_attendance(attendance_list: List[Dict], marked_by: int = None):
+        """
+        Mark attendance for many students in one transaction
+        Rows are validated up front, unknown students are rejected with one
+        lookup, and the rest are written with multi-row
+        INSERT ... ON CONFLICT (student_id, attendance_date, period) DO UPDATE
+        on the whole-day (DAY_PERIOD) rows.
+        """
         db = next(get_db())
-        marked_count = 0
-        errors = []
         try:
-            for item in attendance_list:
-                student_id      = item.get('student_id')
-                attendance_date = item.get('date')
-                status          = item.get('status')
-                remarks         = item.get('remarks')
-
-                if not student_id or not attendance_date or not status:
-                    errors.append(f"Missing data for entry: {item}")
-                    continue
+            rows, errors = AttendanceService._validate_bulk_rows(attendance_list)
 
-                if isinstance(attendance_date, str):
-                    attendance_date = datetime.strptime(attendance_date, '%Y-%m-%d').date()
+            student_ids = {student_id for student_id, _ in rows}
+            known = {
+                sid for (sid,) in db.query(Student.id).filter(
+                    Student.id.in_(student_ids)
+                ).all()
+            } if student_ids else set()
+
+            now    = datetime.utcnow()
+            values = []
+            for (student_id, _), row in rows.items():
+                if student_id not in known:
+                    errors.append(f"Row {row['row']}: student {student_id} not found")
+                    continue
+                values.append({
+                    'student_id':      student_id,
+                    'attendance_date': row['attendance_date'],
+                    'status':          row['status'],
+                    'period':          DAY_PERIOD,
+                    'remarks':         row['remarks'],
+                    'marked_by':       marked_by,
+                    'created_at':      now,
+                    'updated_at':      now,
+                })
 
-                existing = db.query(Attendance).filter(
-                    and_(Attendance.student_id == student_id,
-                         Attendance.attendance_date == attendance_date)
-                ).first()
-
-                if existing:
-                    existing.status     = status
-                    existing.remarks    = remarks
-                    existing.marked_by  = marked_by
-                    existing.updated_at = datetime.utcnow()
-                else:
-                    db.add(Attendance(
-                        student_id=student_id,
-                        attendance_date=attendance_date,
-                        status=status,
-                        remarks=remarks,
-                        marked_by=marked_by
-                    ))
-                marked_count += 1
+            table = Attendance.__table__
+            for start in range(0, len(values), BULK_UPSERT_CHUNK_SIZE):
+                stmt = pg_insert(table).values(
+                    values[start:start + BULK_UPSERT_CHUNK_SIZE]
+                )
+                db.execute(stmt.on_conflict_do_update(
+                    index_elements=['student_id', 'attendance_date', 'period'],
+                    set_={
+                        'status':     stmt.excluded.status,
+                        'remarks':    stmt.excluded.remarks,
+                        'marked_by':  stmt.excluded.marked_by,
+                        'updated_at': stmt.excluded.updated_at,
+                    }
+                ))
 
+            RescoreService.mark_dirty(db, [v['student_id'] for v in values], 'attendance')
             db.commit()
+            AnalyticsService.invalidate_overview()
+            marked_count = len(values)
             return {
                 'message': f'Attendance marked for {marked_count} students',
                 'marked_count': marked_count,
@@ -129,7 +204,9 @@ class AttendanceService:
             record.status     = new_status
             record.remarks    = data.get('remarks', record.remarks)
             record.updated_at = datetime.utcnow()
+            RescoreService.mark_dirty(db, [record.student_id], 'attendance')
             db.commit()
+            AnalyticsService.invalidate_overview()
             db.refresh(record)
             return {'message': 'Attendance updated', 'attendance': record.to_dict()}
         except Exception as e:
@@ -154,8 +231,10 @@ class AttendanceService:
             if not record:
                 return {'error': f'Attendance record {attendance_id} not found'}
 
+            RescoreService.mark_dirty(db, [record.student_id], 'attendance')
             db.delete(record)
             db.commit()
+            AnalyticsService.invalidate_overview()
             return {'message': f'Attendance record {attendance_id} deleted successfully'}
         except Exception as e:
             db.rollback()
@@ -178,37 +257,40 @@ class AttendanceService:
         finally:
             db.close()
 
+    @staticmethod
+    def _status_count_columns():
+        """Per-status COUNT ... FILTER columns (aggregate over attendance rows)"""
+        return [func.count(Attendance.id).label('total_days')] + [
+            func.count(Attendance.id).filter(Attendance.status == status).label(status)
+            for status in ATTENDANCE_STATUSES
+        ]
+
+    @staticmethod
+    def _stats_dict(row, days: int):
+        """Build the attendance stats payload from a status-count row"""
+        total    = row.total_days or 0
+        attended = (row.present or 0) + (row.late or 0)
+        rate     = round(attended / total * 100, 2) if total else 0.0
+        return {'total_days': total, 'present': row.present or 0,
+                'absent': row.absent or 0, 'late': row.late or 0,
+                'excused': row.excused or 0, 'attendance_rate': rate,
+                'period_days': days}
+
     @staticmethod
     def get_attendance_stats(student_id: int, days: int = 30):
         db = next(get_db())
         try:
             start_date = date.today() - timedelta(days=days)
-            total = db.query(func.count(Attendance.id)).filter(
+            row = db.query(*AttendanceService._status_count_columns()).filter(
                 and_(Attendance.student_id == student_id,
                      Attendance.attendance_date >= start_date)
-            ).scalar() or 0
+            ).one()
 
-            if total == 0:
+            if not row.total_days:
                 return {'total_days': 0, 'present': 0, 'absent': 0,
                         'late': 0, 'excused': 0, 'attendance_rate': 0.0}
 
-            def _count(status):
-                return db.query(func.count(Attendance.id)).filter(
-                    and_(Attendance.student_id == student_id,
-                         Attendance.attendance_date >= start_date,
-                         Attendance.status == status)
-                ).scalar() or 0
-
-            present  = _count('present')
-            absent   = _count('absent')
-            late     = _count('late')
-            excused  = _count('excused')
-            attended = present + late
-            rate     = round(attended / total * 100, 2) if total else 0.0
-
-            return {'total_days': total, 'present': present, 'absent': absent,
-                    'late': late, 'excused': excused, 'attendance_rate': rate,
-                    'period_days': days}
+            return AttendanceService._stats_dict(row, days)
         finally:
             db.close()
 
@@ -242,15 +324,36 @@ class AttendanceService:
 
     @staticmethod
     def get_low_attendance_students(threshold: float = 75.0, days: int = 30):
+        """
+        Active students whose attendance rate over the last `days` is below
+        threshold, lowest first. Status counts, the threshold and the
+        ordering are all evaluated in one grouped query.
+        """
         db = next(get_db())
         try:
-            students = db.query(Student).filter(Student.is_active == True).all()
-            low = []
-            for s in students:
-                stats = AttendanceService.get_attendance_stats(s.id, days)
-                if stats['total_days'] > 0 and stats['attendance_rate'] < threshold:
-                    low.append({'student': s.to_dict(), 'attendance_stats': stats})
-            low.sort(key=lambda x: x['attendance_stats']['attendance_rate'])
-            return low
+            start_date = date.today() - timedelta(days=days)
+            counts = db.query(
+                Attendance.student_id,
+                *AttendanceService._status_count_columns()
+            ).filter(
+                Attendance.attendance_date >= start_date
+            ).group_by(Attendance.student_id).subquery()
+
+            rate = func.round(
+                (counts.c.present + counts.c.late) * 100.0 / counts.c.total_days, 2
+            )
+
+            rows = db.query(Student, counts).join(
+                counts, counts.c.student_id == Student.id
+            ).filter(
+                Student.is_active == True,
+                rate < threshold
+            ).order_by(rate, Student.id).all()
+
+            return [
+                {'student': row.Student.to_dict(),
+                 'attendance_stats': AttendanceService._stats_dict(row, days)}
+                for row in rows
+            ]
         finally:
             db.close()
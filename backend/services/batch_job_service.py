@@ -0,0 +1,317 @@
+"""
+Batch Job Service - Background batch risk predictions
+ScholarSense - AI-Powered Academic Intelligence System
+Queues batch runs on a worker pool, tracks progress in batch_jobs
+and serves paginated results once a job finishes
+"""
+
+import os
+import uuid
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, update
+from backend.database.models import BatchJob
+from backend.database.db_config import SessionLocal
+from backend.services.batch_service import BatchService
+
+# ============================================
+# CONSTANTS
+# ============================================
+BATCH_JOB_WORKERS     = int(os.getenv('BATCH_JOB_WORKERS', 2))
+STALE_JOB_MINUTES     = int(os.getenv('BATCH_JOB_STALE_MINUTES', 15))
+# A running job's owner refreshes updated_at this often, so only jobs
+# whose owner is gone ever look stale
+JOB_HEARTBEAT_SECONDS = max(1, STALE_JOB_MINUTES * 60 // 4)
+DEFAULT_PAGE_SIZE     = 100
+MAX_PAGE_SIZE         = 500
+
+# Worker pool shared by every request in this process
+_executor = ThreadPoolExecutor(
+    max_workers=BATCH_JOB_WORKERS,
+    thread_name_prefix='batch-job'
+)
+
+
+class BatchJobService:
+    """Asynchronous batch prediction jobs"""
+
+    # ──────────────────────────────────────────
+    # SUBMIT
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def submit_job(filters: dict = None, triggered_by: int = None) -> dict:
+        """
+        Persist a queued job and hand it to the worker pool
+        Returns immediately with the job id
+        """
+        db = SessionLocal()
+        try:
+            job = BatchJob(
+                status       = 'queued',
+                filters      = filters or {},
+                triggered_by = triggered_by,
+                risk_summary = {}
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            payload = job.to_dict()
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Batch job submit error: {e}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            db.close()
+
+        _executor.submit(BatchJobService._run_job, payload['job_id'])
+        print(f"📥 Batch job {payload['job_id']} queued | filters={filters}")
+        return {"status": "success", "data": payload}
+
+    # ──────────────────────────────────────────
+    # WORKER
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def _claim_job(job_id: int, owner: str):
+        """
+        Atomically move a queued job to running under owner
+        Returns (filters, triggered_by) or None if another worker owns it
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            row = db.execute(
+                update(BatchJob)
+                .where(BatchJob.id == job_id, BatchJob.status == 'queued')
+                .values(status='running', worker_id=owner,
+                        started_at=now, updated_at=now)
+                .returning(BatchJob.filters, BatchJob.triggered_by)
+            ).first()
+            db.commit()
+            return row
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Batch job claim error: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def _update_job(job_id: int, owner: str, **values) -> bool:
+        """
+        Write progress/status fields for a job the owner still runs
+        Returns False once the job was requeued (and maybe taken) elsewhere
+        """
+        db = SessionLocal()
+        try:
+            values['updated_at'] = datetime.utcnow()
+            updated = db.query(BatchJob).filter(
+                BatchJob.id        == job_id,
+                BatchJob.status    == 'running',
+                BatchJob.worker_id == owner
+            ).update(values, synchronize_session=False)
+            db.commit()
+            return updated > 0
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Batch job update error: {e}")
+            return True
+        finally:
+            db.close()
+
+    @staticmethod
+    def _heartbeat(job_id: int, owner: str, stop: threading.Event):
+        """Refresh updated_at while the job runs (shards report no progress)"""
+        while not stop.wait(JOB_HEARTBEAT_SECONDS):
+            BatchJobService._update_job(job_id, owner)
+
+    @staticmethod
+    def _run_job(job_id: int):
+        """Worker entry point: run the batch and record progress/results"""
+        owner   = uuid.uuid4().hex
+        claimed = BatchJobService._claim_job(job_id, owner)
+        if not claimed:
+            return
+
+        filters, triggered_by = claimed
+        print(f"🔁 Batch job {job_id} running")
+
+        def on_progress(progress: dict):
+            BatchJobService._update_job(job_id, owner, **progress)
+
+        def finish(outcome: str, **values) -> bool:
+            if BatchJobService._update_job(job_id, owner, status=outcome,
+                                           finished_at=datetime.utcnow(), **values):
+                return True
+            print(f"⚠️  Batch job {job_id} was requeued; dropping this run's result")
+            return False
+
+        stop      = threading.Event()
+        heartbeat = threading.Thread(
+            target=BatchJobService._heartbeat, args=(job_id, owner, stop),
+            name=f'batch-job-{job_id}-heartbeat', daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = BatchService.run_batch_predictions(
+                filters           = filters or {},
+                triggered_by      = triggered_by,
+                progress_callback = on_progress
+            )
+
+            if result.get('status') == 'success':
+                summary = result['data']['summary']
+                if finish(
+                    'completed',
+                    total        = summary['total'],
+                    done         = summary['total'],
+                    success      = summary['success'],
+                    skipped      = summary['skipped'],
+                    failed       = summary['failed'],
+                    risk_summary = summary['risk_summary'],
+                    results      = result['data']['results']
+                ):
+                    print(f"✅ Batch job {job_id} completed")
+            else:
+                if finish('failed', error_message=result.get('message', 'Unknown error')):
+                    print(f"❌ Batch job {job_id} failed: {result.get('message')}")
+
+        except Exception as e:
+            if finish('failed', error_message=str(e)):
+                print(f"❌ Batch job {job_id} crashed: {e}")
+        finally:
+            stop.set()
+            heartbeat.join()
+
+    @staticmethod
+    def resume_jobs() -> int:
+        """
+        Re-queue jobs whose owner is gone and submit every queued job
+        Owners heartbeat every JOB_HEARTBEAT_SECONDS, so a running job whose
+        updated_at is older than STALE_JOB_MINUTES has no live worker.
+        Call from one place only (backend/scripts/resume_batch_jobs.py),
+        not from every API worker.
+        Returns: number of jobs handed to the worker pool
+        """
+        db = SessionLocal()
+        try:
+            stale_before = datetime.utcnow() - timedelta(minutes=STALE_JOB_MINUTES)
+            db.query(BatchJob).filter(
+                BatchJob.status == 'running',
+                BatchJob.updated_at < stale_before
+            ).update({
+                'status': 'queued', 'worker_id': None, 'done': 0, 'success': 0,
+                'skipped': 0, 'failed': 0, 'risk_summary': {}
+            }, synchronize_session=False)
+            db.commit()
+
+            queued_ids = [
+                job_id for (job_id,) in db.query(BatchJob.id).filter(
+                    BatchJob.status == 'queued'
+                ).order_by(BatchJob.id).all()
+            ]
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  Could not resume batch jobs: {e}")
+            return 0
+        finally:
+            db.close()
+
+        for job_id in queued_ids:
+            _executor.submit(BatchJobService._run_job, job_id)
+        if queued_ids:
+            print(f"🔁 Resumed {len(queued_ids)} queued batch job(s)")
+        return len(queued_ids)
+
+    # ──────────────────────────────────────────
+    # READ
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def get_job(job_id: int) -> dict:
+        """Progress for one job (done/total, risk_summary so far)"""
+        db = SessionLocal()
+        try:
+            job = db.query(BatchJob).filter(BatchJob.id == job_id).first()
+            if not job:
+                return {"status": "error", "message": f"Batch job {job_id} not found"}
+            return {"status": "success", "data": job.to_dict()}
+        except Exception as e:
+            print(f"❌ Get batch job error: {e}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            db.close()
+
+    @staticmethod
+    def list_jobs(limit: int = 20) -> dict:
+        """Most recent jobs, newest first"""
+        db = SessionLocal()
+        try:
+            jobs = db.query(BatchJob).order_by(
+                BatchJob.id.desc()
+            ).limit(limit).all()
+            return {
+                "status": "success",
+                "data": {"jobs": [j.to_dict() for j in jobs], "total": len(jobs)}
+            }
+        except Exception as e:
+            print(f"❌ List batch jobs error: {e}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_job_results(job_id: int, page: int = 1,
+                        per_page: int = DEFAULT_PAGE_SIZE) -> dict:
+        """
+        One page of per-student results for a completed job
+        The page is sliced inside PostgreSQL so only per_page rows travel.
+        """
+        page     = max(1, page or 1)
+        per_page = max(1, min(per_page or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+        db = SessionLocal()
+        try:
+            job = db.query(
+                BatchJob.status,
+                func.coalesce(func.jsonb_array_length(BatchJob.results), 0).label('count')
+            ).filter(BatchJob.id == job_id).first()
+
+            if not job:
+                return {"status": "error", "message": f"Batch job {job_id} not found"}
+            if job.status != 'completed':
+                return {
+                    "status":  "error",
+                    "message": f"Batch job {job_id} is {job.status}; results are "
+                               f"available once it completes"
+                }
+
+            start = (page - 1) * per_page
+            end   = min(start + per_page, job.count) - 1
+
+            results = []
+            if start <= end:
+                results = db.query(
+                    func.jsonb_path_query_array(
+                        BatchJob.results, f'$[{start} to {end}]'
+                    )
+                ).filter(BatchJob.id == job_id).scalar() or []
+
+            return {
+                "status": "success",
+                "data": {
+                    "job_id":   job_id,
+                    "results":  results,
+                    "page":     page,
+                    "per_page": per_page,
+                    "total":    job.count,
+                    "pages":    (job.count + per_page - 1) // per_page
+                }
+            }
+        except Exception as e:
+            print(f"❌ Get batch job results error: {e}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            db.close()
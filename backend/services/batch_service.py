@@ -4,17 +4,30 @@ ScholarSense - AI-Powered Academic Intelligence System
 Enhancement 8: Run ML predictions for all/filtered students at once
 """
 
+import os
+from decimal import Decimal
 from datetime import datetime
-from sqlalchemy import and_, func
-from backend.database.models import Student, AcademicRecord, RiskPrediction
-from backend.database.db_config import SessionLocal
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import func, tuple_
+from backend.database.models import Student, StudentLatestRisk
+from backend.database.db_config import SessionLocal, engine
 from backend.services.prediction_service import PredictionService
+from backend.services.analytics_service import AnalyticsService
 
 # ============================================
 # CONSTANTS
 # ============================================
 RISK_LEVELS = ['Low', 'Medium', 'High', 'Critical']
 
+# Students predicted per feature-extraction / inference / insert round
+BATCH_CHUNK_SIZE = 500
+
+# Largest page get_all_predictions will return
+MAX_PAGE_SIZE = 1000
+
+# Default process-pool size for run_batch_predictions (1 = in-process)
+BATCH_WORKERS = int(os.getenv('BATCH_PREDICTION_WORKERS', 1))
+
 RISK_COLORS = {
     'Low':      '#00CC44',
     'Medium':   '#FFA500',
@@ -39,11 +52,17 @@ class BatchService:
     # ──────────────────────────────────────────
 
     @staticmethod
-    def run_batch_predictions(filters: dict = {}, triggered_by: int = None) -> dict:
+    def run_batch_predictions(filters: dict = {}, triggered_by: int = None,
+                              progress_callback=None, workers: int = None) -> dict:
         """
         Run risk predictions for all/filtered students
         Filters: grade, section, risk_label (re-predict only specific risk levels)
-        Returns: summary + per-student results
+        progress_callback: optional callable receiving a progress dict
+                           (done, total, success, skipped, failed, risk_summary)
+                           after every chunk of BATCH_CHUNK_SIZE students
+        workers: process-pool size; >1 shards students by grade/section across
+                 worker processes (defaults to BATCH_PREDICTION_WORKERS env)
+        Returns: summary + per-student results (ordered by grade, section, id)
         """
         db = next(BatchService.get_db())
         try:
@@ -56,7 +75,10 @@ class BatchService:
             if 'section' in filters and filters['section']:
                 query = query.filter(Student.section == filters['section'])
 
-            students = query.all()
+            # Deterministic order: shards and results follow grade/section/id
+            students = query.order_by(
+                Student.grade, Student.section, Student.id
+            ).all()
 
             if not students:
                 return {
@@ -64,10 +86,11 @@ class BatchService:
                     "message": "No students found for selected filters"
                 }
 
+            workers = max(1, int(workers or BATCH_WORKERS))
             print(f"🔁 Batch prediction started: {len(students)} students "
-                  f"| triggered by user {triggered_by}")
+                  f"| {workers} worker(s) | triggered by user {triggered_by}")
 
-            # ── Run predictions ────────────────────────────
+            # ── Run predictions (chunked, progress reported per chunk) ──
             results     = []
             success     = 0
             failed      = 0
@@ -75,107 +98,45 @@ class BatchService:
 
             risk_summary = {r: 0 for r in RISK_LEVELS}
 
-            for student in students:
-                try:
-                    # Get latest academic record
-                    academic = db.query(AcademicRecord).filter(
-                        AcademicRecord.student_id == student.id
-                    ).order_by(
-                        AcademicRecord.created_at.desc()
-                    ).first()
-
-                    if not academic:
-                        # Still run prediction — PredictionService uses default values internally
-                        prediction = PredictionService.make_prediction(
-                            student.id,
-                            predicted_by=triggered_by
-                        )
-                        if 'error' in prediction:
-                            results.append({
-                                "student_id":   student.id,
-                                "student_code": student.student_id,
-                                "student_name": student.full_name,
-                                "grade":        student.grade,
-                                "section":      student.section,
-                                "status":       "skipped",
-                                "reason":       prediction['error']   # will say "No academic records found"
-                            })
-                            skipped += 1
-                        else:
-                            risk_label = prediction.get('risk_label', 'Low')
-                            if risk_label in risk_summary:
-                                risk_summary[risk_label] += 1
-                            results.append({
-                                "student_id":       student.id,
-                                "student_code":     student.student_id,
-                                "student_name":     student.full_name,
-                                "grade":            student.grade,
-                                "section":          student.section,
-                                "status":           "success",
-                                "risk_label":       risk_label,
-                                "confidence_score": prediction.get('confidence_score', 0),
-                                "gpa":              0,
-                                "failed_subjects":  0
-                            })
-                            success += 1
-                        continue
-
-                    # Run prediction via PredictionService
-                    prediction = PredictionService.make_prediction(
-                        student.id,
-                        predicted_by=triggered_by
-                    )
-
-                    if 'error' in prediction:
-                        results.append({
-                            "student_id":   student.id,
-                            "student_code": student.student_id,
-                            "student_name": student.full_name,
-                            "grade":        student.grade,
-                            "section":      student.section,
-                            "status":       "failed",
-                            "reason":       prediction['error']
-                        })
-                        failed += 1
-                        continue
+            total = len(students)
+            if workers > 1:
+                chunk_iter = BatchService._iter_shard_results(
+                    students, workers, triggered_by
+                )
+            else:
+                chunk_iter = (
+                    (start + BATCH_CHUNK_SIZE,
+                     BatchService._predict_chunk(
+                         db, students[start:start + BATCH_CHUNK_SIZE], triggered_by
+                     ))
+                    for start in range(0, total, BATCH_CHUNK_SIZE)
+                )
 
-                    # Track risk summary
-                    risk_label = prediction.get('risk_label', 'Low')
-                    if risk_label in risk_summary:
-                        risk_summary[risk_label] += 1
+            for done, chunk_results in chunk_iter:
+                for r in chunk_results:
+                    if r['status'] == 'success':
+                        success += 1
+                        if r['risk_label'] in risk_summary:
+                            risk_summary[r['risk_label']] += 1
+                    elif r['status'] == 'skipped':
+                        skipped += 1
+                    else:
+                        failed += 1
+                results.extend(chunk_results)
 
-                    results.append({
-                        "student_id":           student.id,
-                        "student_code":         student.student_id,
-                        "student_name":         student.full_name,
-                        "grade":                student.grade,
-                        "section":              student.section,
-                        "status":               "success",
-                        "risk_label":           risk_label,
-                        "confidence_score":     prediction.get('confidence_score',     0),
-                        "probability_low":      prediction.get('probability_low',      0),
-                        "probability_medium":   prediction.get('probability_medium',   0),
-                        "probability_high":     prediction.get('probability_high',     0),
-                        "probability_critical": prediction.get('probability_critical', 0),
-                        "gpa":                  float(academic.current_gpa or 0),
-                        "failed_subjects":      academic.failed_subjects or 0
+                if progress_callback:
+                    progress_callback({
+                        "done":         min(done, total),
+                        "total":        total,
+                        "success":      success,
+                        "skipped":      skipped,
+                        "failed":       failed,
+                        "risk_summary": dict(risk_summary)
                     })
-                    success += 1
-
 
-                except Exception as e:
-                    results.append({
-                        "student_id":   student.id,
-                        "student_code": student.student_id,
-                        "student_name": student.full_name,
-                        "grade":        student.grade,
-                        "section":      student.section,
-                        "status":       "failed",
-                        "reason":       str(e)
-                    })
-                    failed += 1
+            # Shard workers write from other processes; drop this one's snapshot
+            AnalyticsService.invalidate_overview()
 
-            total = len(students)
             print(f"✅ Batch done: {success} success | "
                   f"{skipped} skipped | {failed} failed / {total} total")
 
@@ -200,38 +161,160 @@ class BatchService:
             print(f"❌ Batch prediction error: {e}")
             return {"status": "error", "message": str(e)}
 
+    @staticmethod
+    def _build_shards(students: list) -> list:
+        """
+        Split students into shards by grade/section, capping each shard at
+        BATCH_CHUNK_SIZE so big sections still spread across workers
+        Returns: list of student-id lists, in input order
+        """
+        shards, current, current_key = [], [], None
+        for student in students:
+            key = (student.grade, student.section)
+            if current and (key != current_key or len(current) >= BATCH_CHUNK_SIZE):
+                shards.append(current)
+                current = []
+            current.append(student.id)
+            current_key = key
+        if current:
+            shards.append(current)
+        return shards
+
+    @staticmethod
+    def _iter_shard_results(students: list, workers: int, triggered_by: int = None):
+        """
+        Run shards on a process pool and yield (done, results) per shard in
+        shard order, so the merged result list is deterministic
+        """
+        shards = BatchService._build_shards(students)
+        done   = 0
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)),
+            initializer=_init_prediction_worker
+        ) as pool:
+            futures = [
+                pool.submit(_predict_shard, shard, triggered_by)
+                for shard in shards
+            ]
+            for shard, future in zip(shards, futures):
+                done += len(shard)
+                yield done, future.result()
+
+    @staticmethod
+    def _predict_chunk(db, students: list, triggered_by: int = None) -> list:
+        """
+        Predict one chunk of students: bulk feature extraction, one
+        vectorized model call and one bulk insert
+        Returns: per-student result dicts (status success/skipped/failed)
+        """
+        results = []
+
+        # ── Bulk feature extraction (a few grouped queries) ──
+        features_map = PredictionService.prepare_features_bulk(
+            [s.id for s in students], db=db
+        )
+
+        # ── Vectorized inference + bulk insert (one transaction) ──
+        predictions = PredictionService.make_predictions_batch(
+            {sid: f for sid, f in features_map.items() if 'error' not in f},
+            predicted_by=triggered_by,
+            db=db
+        )
+
+        for student in students:
+            try:
+                features = features_map.get(student.id)
+
+                if 'error' in features:
+                    results.append({
+                        "student_id":   student.id,
+                        "student_code": student.student_id,
+                        "student_name": student.full_name,
+                        "grade":        student.grade,
+                        "section":      student.section,
+                        "status":       "skipped",
+                        "reason":       features['error']   # will say "No academic records found"
+                    })
+                    continue
+
+                prediction = predictions.get(student.id, {'error': 'Prediction not run'})
+
+                if 'error' in prediction:
+                    results.append({
+                        "student_id":   student.id,
+                        "student_code": student.student_id,
+                        "student_name": student.full_name,
+                        "grade":        student.grade,
+                        "section":      student.section,
+                        "status":       "failed",
+                        "reason":       prediction['error']
+                    })
+                    continue
+
+                risk_label = prediction.get('risk_label', 'Low')
+
+                results.append({
+                    "student_id":           student.id,
+                    "student_code":         student.student_id,
+                    "student_name":         student.full_name,
+                    "grade":                student.grade,
+                    "section":              student.section,
+                    "status":               "success",
+                    "risk_label":           risk_label,
+                    "confidence_score":     prediction.get('confidence_score',     0),
+                    "probability_low":      prediction.get('probability_low',      0),
+                    "probability_medium":   prediction.get('probability_medium',   0),
+                    "probability_high":     prediction.get('probability_high',     0),
+                    "probability_critical": prediction.get('probability_critical', 0),
+                    "gpa":                  float(features.get('current_gpa', 0)),
+                    "failed_subjects":      features.get('failed_subjects', 0)
+                })
+
+            except Exception as e:
+                results.append({
+                    "student_id":   student.id,
+                    "student_code": student.student_id,
+                    "student_name": student.full_name,
+                    "grade":        student.grade,
+                    "section":      student.section,
+                    "status":       "failed",
+                    "reason":       str(e)
+                })
+
+        return results
+
     # ──────────────────────────────────────────
     # GET LATEST PREDICTIONS (No re-run)
     # ──────────────────────────────────────────
 
+    @staticmethod
+    def _encode_cursor(pred) -> str:
+        """Keyset cursor for the row after which the next page starts"""
+        return f"{pred.risk_level}:{pred.confidence_score}:{pred.student_id}"
+
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        """Parse 'risk_level:confidence:student_id' (raises ValueError)"""
+        risk_level, confidence, student_id = cursor.split(':')
+        return int(risk_level), Decimal(confidence), int(student_id)
+
     @staticmethod
     def get_all_predictions(filters: dict = {}) -> dict:
         """
         Fetch latest existing predictions for all students
         (Does NOT re-run ML — just reads stored predictions)
-        Filters: grade, section, risk_label, limit
+        Filters: grade, section, risk_label, limit, cursor, count_only
+        Rows are ordered in SQL by risk_level then confidence (highest
+        first) and paged with a keyset cursor, so only one page is loaded.
+        count_only skips the rows and returns risk counts per grade.
         Returns: list of students with their latest prediction
         """
         db = next(BatchService.get_db())
         try:
-            # Subquery: latest prediction ID per student
-            latest_pred_subq = db.query(
-                RiskPrediction.student_id,
-                func.max(RiskPrediction.id).label('max_id')
-            ).group_by(
-                RiskPrediction.student_id
-            ).subquery()
-
-            # Main query joining students + latest prediction
-            query = db.query(Student, RiskPrediction).join(
-                latest_pred_subq,
-                Student.id == latest_pred_subq.c.student_id
-            ).join(
-                RiskPrediction,
-                and_(
-                    RiskPrediction.student_id == Student.id,
-                    RiskPrediction.id == latest_pred_subq.c.max_id
-                )
+            # Students + latest prediction (projection table, one row each)
+            query = db.query(Student, StudentLatestRisk).join(
+                StudentLatestRisk,
+                StudentLatestRisk.student_id == Student.id
             ).filter(Student.is_active == True)
 
             # Apply filters
@@ -243,23 +326,62 @@ class BatchService:
 
             if 'risk_label' in filters and filters['risk_label']:
                 query = query.filter(
-                    RiskPrediction.risk_label == filters['risk_label']
+                    StudentLatestRisk.risk_label == filters['risk_label']
                 )
 
-            # Sort: Critical first
-            risk_order = {r: i for i, r in enumerate(
-                ['Critical', 'High', 'Medium', 'Low']
-            )}
-            rows = query.all()
+            # Risk counts for the whole filtered set (one grouped query)
+            count_rows = query.with_entities(
+                Student.grade,
+                StudentLatestRisk.risk_label,
+                func.count().label('count')
+            ).group_by(Student.grade, StudentLatestRisk.risk_label).all()
 
-            # Sort by risk severity
-            rows.sort(
-                key=lambda x: risk_order.get(x[1].risk_label, 99)
-            )
+            risk_summary = {r: 0 for r in RISK_LEVELS}
+            by_grade     = {}
+            for row in count_rows:
+                if row.risk_label not in risk_summary:
+                    continue
+                risk_summary[row.risk_label] += row.count
+                grade_counts = by_grade.setdefault(
+                    row.grade, {r: 0 for r in RISK_LEVELS}
+                )
+                grade_counts[row.risk_label] += row.count
 
-            # Limit
-            limit = filters.get('limit', 200)
-            rows  = rows[:limit]
+            matched = sum(risk_summary.values())
+
+            if filters.get('count_only'):
+                return {
+                    "status": "success",
+                    "data": {
+                        "total":        matched,
+                        "risk_summary": risk_summary,
+                        "by_grade":     by_grade,
+                        "filters":      filters
+                    }
+                }
+
+            # Keyset pagination: continue after the cursor row
+            if filters.get('cursor'):
+                try:
+                    cursor = BatchService._decode_cursor(filters['cursor'])
+                except ValueError:
+                    return {"status": "error", "message": "Invalid cursor"}
+                query = query.filter(tuple_(
+                    StudentLatestRisk.risk_level,
+                    StudentLatestRisk.confidence_score,
+                    StudentLatestRisk.student_id
+                ) < tuple_(*cursor))
+
+            # Sort: Critical first, most confident first within a level
+            limit = max(1, min(filters.get('limit') or 200, MAX_PAGE_SIZE))
+            rows  = query.order_by(
+                StudentLatestRisk.risk_level.desc(),
+                StudentLatestRisk.confidence_score.desc(),
+                StudentLatestRisk.student_id.desc()
+            ).limit(limit + 1).all()
+
+            has_more = len(rows) > limit
+            rows     = rows[:limit]
 
             results = []
             for student, pred in rows:
@@ -276,23 +398,22 @@ class BatchService:
                     "probability_medium":   float(pred.probability_medium or 0),
                     "probability_high":     float(pred.probability_high or 0),
                     "probability_critical": float(pred.probability_critical or 0),
-                    "predicted_at":         pred.created_at.isoformat()
-                                            if pred.created_at else None
+                    "predicted_at":         pred.predicted_at.isoformat()
+                                            if pred.predicted_at else None
                 })
 
-            # Risk level summary counts
-            risk_summary = {r: 0 for r in RISK_LEVELS}
-            for r in results:
-                lbl = r.get('risk_label', 'Low')
-                if lbl in risk_summary:
-                    risk_summary[lbl] += 1
+            next_cursor = (
+                BatchService._encode_cursor(rows[-1][1]) if has_more else None
+            )
 
             return {
                 "status": "success",
                 "data": {
                     "students":     results,
                     "total":        len(results),
+                    "matched":      matched,
                     "risk_summary": risk_summary,
+                    "next_cursor":  next_cursor,
                     "filters":      filters
                 }
             }
@@ -314,9 +435,7 @@ class BatchService:
         db = next(BatchService.get_db())
         try:
             # Students who have at least one prediction
-            predicted_ids = db.query(
-                RiskPrediction.student_id
-            ).distinct().subquery()
+            predicted_ids = db.query(StudentLatestRisk.student_id).subquery()
 
             # Students with NO prediction
             query = db.query(Student).filter(
@@ -362,19 +481,11 @@ class BatchService:
         """
         db = next(BatchService.get_db())
         try:
-            # Latest prediction per student subquery
-            latest_subq = db.query(
-                RiskPrediction.student_id,
-                func.max(RiskPrediction.id).label('max_id')
-            ).group_by(RiskPrediction.student_id).subquery()
-
+            # Latest prediction per student (projection table)
             risk_counts = db.query(
-                RiskPrediction.risk_label,
+                StudentLatestRisk.risk_label,
                 func.count().label('count')
-            ).join(
-                latest_subq,
-                RiskPrediction.id == latest_subq.c.max_id
-            ).group_by(RiskPrediction.risk_label).all()
+            ).group_by(StudentLatestRisk.risk_label).all()
 
             summary = {r: 0 for r in RISK_LEVELS}
             for row in risk_counts:
@@ -386,17 +497,14 @@ class BatchService:
             ).scalar()
 
             total_predicted  = db.query(
-                func.count(RiskPrediction.student_id.distinct())
+                func.count(StudentLatestRisk.student_id)
             ).scalar()
 
             total_unpredicted = total_active - total_predicted
 
             # Average confidence
             avg_conf = db.query(
-                func.avg(RiskPrediction.confidence_score)
-            ).join(
-                latest_subq,
-                RiskPrediction.id == latest_subq.c.max_id
+                func.avg(StudentLatestRisk.confidence_score)
             ).scalar()
 
             return {
@@ -414,3 +522,28 @@ class BatchService:
         except Exception as e:
             print(f"❌ Batch summary error: {e}")
             return {"status": "error", "message": str(e)}
+
+
+# ============================================
+# PROCESS-POOL WORKERS (module level so they pickle)
+# ============================================
+
+def _init_prediction_worker():
+    """
+    Per-process setup: drop pooled connections inherited from the parent
+    (each worker opens its own) and make sure the model is loaded
+    """
+    engine.dispose(close=False)
+    PredictionService.load_model()
+
+
+def _predict_shard(student_ids: list, triggered_by: int = None) -> list:
+    """Predict one shard of students inside a worker process"""
+    db = SessionLocal()
+    try:
+        order    = {sid: i for i, sid in enumerate(student_ids)}
+        students = db.query(Student).filter(Student.id.in_(student_ids)).all()
+        students.sort(key=lambda s: order[s.id])
+        return BatchService._predict_chunk(db, students, triggered_by)
+    finally:
+        db.close()
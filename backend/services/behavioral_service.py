@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 
 from backend.database.models import BehavioralIncident, Student, User
 from backend.database.db_config import SessionLocal
+from backend.services.rescore_service import RescoreService
 
 # ============================================
 # CONSTANTS
@@ -94,6 +95,7 @@ class BehavioralService:
             )
             
             db.add(incident)
+            RescoreService.mark_dirty(db, [incident.student_id], 'incident')
             db.commit()
             db.refresh(incident)
             
@@ -329,6 +331,7 @@ class BehavioralService:
                 if field in data:
                     setattr(incident, field, data[field])
             
+            RescoreService.mark_dirty(db, [incident.student_id], 'incident')
             db.commit()
             db.refresh(incident)
             
@@ -358,6 +361,7 @@ class BehavioralService:
             if not incident:
                 return {"status": "error", "message": "Incident not found"}
             
+            RescoreService.mark_dirty(db, [incident.student_id], 'incident')
             db.delete(incident)
             db.commit()
             
@@ -5,16 +5,17 @@ Enhancement 9: Email parents via Gmail SMTP
 """
 
 import os
-import smtplib
-import uuid
 from datetime import datetime, timedelta
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from functools import lru_cache
 from sqlalchemy import and_, desc, func
 from dotenv import load_dotenv
 
 from backend.database.models import Communication, Student, RiskPrediction
 from backend.database.db_config import SessionLocal
+from backend.services.outbox_service import OutboxService
+from backend.services.template_engine import (
+    MessageTemplate, RenderedMessage, DEFAULT_LANGUAGE
+)
 
 load_dotenv()
 
@@ -201,6 +202,62 @@ ScholarSense Academic Intelligence System
 }
 
 
+# HTML wrapper every parent communication is rendered into
+EMAIL_LAYOUT = """
+<html><body style="font-family:Arial,sans-serif;
+                   font-size:14px; color:#1a202c;
+                   line-height:1.7; padding:20px;">
+    <div style="max-width:600px; margin:0 auto;
+                border:1px solid #e2e8f0;
+                border-radius:12px; padding:30px;">
+        <div style="border-bottom:3px solid #2563eb;
+                    padding-bottom:10px; margin-bottom:20px;">
+            <h2 style="color:#2563eb; margin:0;">
+                🎓 ScholarSense
+            </h2>
+            <p style="color:#4a5568; margin:4px 0 0 0;
+                      font-size:12px;">
+                AI-Powered Academic Intelligence System
+            </p>
+        </div>
+        <div>{content}</div>
+        <div style="margin-top:30px; padding-top:15px;
+                    border-top:1px solid #e2e8f0;
+                    font-size:11px; color:#718096;">
+            This is an automated message from ScholarSense.
+            Please do not reply directly to this email.
+        </div>
+    </div>
+</body></html>
+"""
+
+# Templates per language; other languages fall back to English
+TEMPLATE_SETS = {DEFAULT_LANGUAGE: TEMPLATES}
+
+
+def _compiled_template(template_type: str,
+                       language: str = DEFAULT_LANGUAGE) -> MessageTemplate:
+    """
+    Compiled template for a type and language. The language comes from
+    the request, so it is mapped to a known template set first: the
+    cache holds one entry per set, not per client-supplied string.
+    """
+    if language not in TEMPLATE_SETS:
+        language = DEFAULT_LANGUAGE
+    return _compile_template(template_type, language)
+
+
+@lru_cache(maxsize=None)
+def _compile_template(template_type: str, language: str) -> MessageTemplate:
+    """Compile a template once per process (markdown → HTML, layout applied)"""
+    templates = TEMPLATE_SETS[language]
+    template  = templates.get(template_type, templates['Custom'])
+    return MessageTemplate.from_markdown(
+        template_type, template['subject'], template['body'], EMAIL_LAYOUT,
+        language=language, markdown_slots=('custom_message',)
+    )
+
+
 # ============================================
 # COMMUNICATION SERVICE
 # ============================================
@@ -215,115 +272,14 @@ class CommunicationService:
         finally:
             db.close()
 
-    # ──────────────────────────────────────────
-    # CORE: SEND EMAIL VIA SMTP
-    # ──────────────────────────────────────────
-
-    @staticmethod
-    def _send_email(
-        to_email: str,
-        to_name:  str,
-        subject:  str,
-        body:     str
-    ) -> dict:
-        """
-        Send email via Gmail SMTP
-        Returns: {"success": True, "message_id": "..."} or
-                 {"success": False, "error": "..."}
-        """
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From']    = f"{SENDER_NAME} <{SENDER_EMAIL}>"
-            msg['To']      = f"{to_name} <{to_email}>"
-
-            # Plain text version
-            plain_body = body.replace('**', '').replace('*', '')
-            msg.attach(MIMEText(plain_body, 'plain'))
-
-            # HTML version — convert basic markdown to HTML
-            import re
-            html_body = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', body)
-            html_body = html_body.replace('\n', '<br/>').replace('- ', '&nbsp;&nbsp;• ')
-
-            html_full = f"""
-            <html><body style="font-family:Arial,sans-serif;
-                               font-size:14px; color:#1a202c;
-                               line-height:1.7; padding:20px;">
-                <div style="max-width:600px; margin:0 auto;
-                            border:1px solid #e2e8f0;
-                            border-radius:12px; padding:30px;">
-                    <div style="border-bottom:3px solid #2563eb;
-                                padding-bottom:10px; margin-bottom:20px;">
-                        <h2 style="color:#2563eb; margin:0;">
-                            🎓 ScholarSense
-                        </h2>
-                        <p style="color:#4a5568; margin:4px 0 0 0;
-                                  font-size:12px;">
-                            AI-Powered Academic Intelligence System
-                        </p>
-                    </div>
-                    <div>{html_body}</div>
-                    <div style="margin-top:30px; padding-top:15px;
-                                border-top:1px solid #e2e8f0;
-                                font-size:11px; color:#718096;">
-                        This is an automated message from ScholarSense.
-                        Please do not reply directly to this email.
-                    </div>
-                </div>
-            </body></html>
-            """
-            msg.attach(MIMEText(html_full, 'html'))
-
-            # Send via Gmail SMTP
-            with smtplib.SMTP(EMAIL_HOST, EMAIL_PORT) as server:
-                server.ehlo()
-                server.starttls()
-                server.login(EMAIL_USER, EMAIL_PASSWORD)
-                server.sendmail(SENDER_EMAIL, to_email, msg.as_string())
-
-            message_id = str(uuid.uuid4())
-            print(f"✅ Email sent to {to_email} | ID: {message_id}")
-
-            return {
-                "success":    True,
-                "message_id": message_id
-            }
-
-        except smtplib.SMTPAuthenticationError:
-            error = "Gmail authentication failed. Check EMAIL_USER and EMAIL_PASSWORD in .env"
-            print(f"❌ SMTP Auth Error: {error}")
-            return {"success": False, "error": error}
-
-        except smtplib.SMTPException as e:
-            error = f"SMTP error: {str(e)}"
-            print(f"❌ SMTP Error: {error}")
-            return {"success": False, "error": error}
-
-        except Exception as e:
-            error = f"Email send failed: {str(e)}"
-            print(f"❌ Email error: {error}")
-            return {"success": False, "error": error}
-
     # ──────────────────────────────────────────
     # BUILD MESSAGE FROM TEMPLATE
     # ──────────────────────────────────────────
 
     @staticmethod
-    def build_message(
-        template_type: str,
-        student:       object,
-        extra_data:    dict = None
-    ) -> dict:
-        """
-        Build subject + body from template
-        Returns: {"subject": "...", "body": "..."}
-        """
-        extra_data = extra_data or {}
-        template = TEMPLATES.get(template_type, TEMPLATES['Custom'])
-
-        # Base variables
-        vars = {
+    def _template_values(student: object, extra_data: dict) -> dict:
+        """Slot values shared by every template"""
+        return {
             'student_name':   student.full_name,
             'parent_name':    student.parent_name or 'Parent/Guardian',
             'grade':          str(student.grade),
@@ -338,19 +294,152 @@ class CommunicationService:
             'custom_subject': extra_data.get('custom_subject', 'Update')
         }
 
-        subject = template['subject'].format(**vars)
-        body    = template['body'].format(**vars)
+    @staticmethod
+    def render_message(
+        template_type: str,
+        student:       object,
+        extra_data:    dict = None,
+        language:      str  = DEFAULT_LANGUAGE
+    ) -> RenderedMessage:
+        """Subject, markdown body, plain text and HTML for one student"""
+        return _compiled_template(template_type, language).render(
+            CommunicationService._template_values(student, extra_data or {})
+        )
+
+    @staticmethod
+    def build_message(
+        template_type: str,
+        student:       object,
+        extra_data:    dict = None
+    ) -> dict:
+        """
+        Build subject + body from template
+        Returns: {"subject": "...", "body": "..."}
+        """
+        rendered = CommunicationService.render_message(template_type, student, extra_data)
+        return {"subject": rendered.subject, "body": rendered.body}
+
+    # ──────────────────────────────────────────
+    # QUEUE ONE COMMUNICATION
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def _queue_communication(
+        db,
+        student:         object,
+        data:            dict,
+        sent_by:         int,
+        idempotency_key: str = None
+    ) -> dict:
+        """
+        Log the communication as 'queued' and put its email in the outbox
+        (caller commits). A request repeated with the same idempotency key
+        returns the communication created the first time.
+        """
+        comm_type = data.get('communication_type', 'Custom')
+        if comm_type not in COMM_TYPES:
+            return {
+                "status":  "error",
+                "message": f"Invalid type. Must be one of: {COMM_TYPES}"
+            }
+
+        if not student.parent_email:
+            return {
+                "status":  "error",
+                "message": f"No parent email on file for {student.full_name}"
+            }
 
-        return {"subject": subject, "body": body}
+        if idempotency_key:
+            existing = OutboxService.find(db, idempotency_key)
+            if existing:
+                return CommunicationService._duplicate(db, existing)
+
+        # Build message
+        extra_data = data.get('extra_data', {})
+        if data.get('custom_message'):
+            extra_data['custom_message'] = data['custom_message']
+        if data.get('custom_subject'):
+            extra_data['custom_subject']  = data['custom_subject']
+
+        language = data.get('language', DEFAULT_LANGUAGE)
+        rendered = CommunicationService.render_message(
+            comm_type, student, extra_data, language
+        )
+        subject, body = rendered.subject, rendered.body
+
+        message_id, message = _compiled_template(comm_type, language).mime(
+            SENDER_EMAIL, SENDER_NAME
+        ).build(
+            to_email  = student.parent_email,
+            to_name   = student.parent_name or 'Parent/Guardian',
+            subject   = subject,
+            text      = rendered.text,
+            html_body = rendered.html
+        )
+
+        # Savepoint: a concurrent request may win the idempotency key
+        savepoint = db.begin_nested()
+        comm = Communication(
+            student_id         = student.id,
+            parent_email       = student.parent_email,
+            parent_name        = student.parent_name,
+            subject            = subject,
+            message_body       = body,
+            template_used      = comm_type,
+            communication_type = comm_type,
+            risk_label         = extra_data.get('risk_label'),
+            sent_by            = sent_by,
+            sent_at            = None,          # set by the outbox worker
+            status             = 'queued',
+            sendgrid_id        = message_id,
+            created_at         = datetime.utcnow()
+        )
+        db.add(comm)
+        db.flush()
+
+        outbox_id = OutboxService.enqueue(
+            db,
+            source_type     = 'communication',
+            source_id       = comm.id,
+            from_addr       = SENDER_EMAIL,
+            to_email        = student.parent_email,
+            message         = message,
+            subject         = subject,
+            idempotency_key = idempotency_key
+        )
+        if outbox_id is None:
+            savepoint.rollback()
+            return CommunicationService._duplicate(
+                db, OutboxService.find(db, idempotency_key)
+            )
+        savepoint.commit()
+
+        print(f"📮 Communication queued: "
+              f"Student {student.id} → {student.parent_email}")
+
+        return {"status": "success", "data": comm.to_dict()}
+
+    @staticmethod
+    def _duplicate(db, outbox_row) -> dict:
+        """Response for a request whose idempotency key was already used"""
+        comm = db.query(Communication).filter(
+            Communication.id == outbox_row.source_id
+        ).first() if outbox_row.source_type == 'communication' else None
+        return {
+            "status":    "success",
+            "duplicate": True,
+            "data":      comm.to_dict() if comm else outbox_row.to_dict()
+        }
 
     # ──────────────────────────────────────────
     # SEND COMMUNICATION (Main Entry Point)
     # ──────────────────────────────────────────
 
     @staticmethod
-    def send_communication(data: dict, sent_by: int) -> dict:
+    def send_communication(data: dict, sent_by: int,
+                           idempotency_key: str = None) -> dict:
         """
-        Send email to parent + log to communications table
+        Queue an email to a parent + log it to the communications table
         Args:
             data: {
                 student_id, communication_type,
@@ -358,8 +447,10 @@ class CommunicationService:
                 extra_data (optional dict)
             }
             sent_by: user ID sending
+            idempotency_key: client key; resending with it is a no-op
         Returns:
             {"status": "success", "data": communication_dict}
+            (status 'queued'; the outbox worker moves it to sent / failed)
         """
         db = SessionLocal()
         try:
@@ -367,13 +458,6 @@ class CommunicationService:
             if 'student_id' not in data:
                 return {"status": "error", "message": "student_id required"}
 
-            comm_type = data.get('communication_type', 'Custom')
-            if comm_type not in COMM_TYPES:
-                return {
-                    "status":  "error",
-                    "message": f"Invalid type. Must be one of: {COMM_TYPES}"
-                }
-
             # Fetch student
             student = db.query(Student).filter(
                 Student.id        == data['student_id'],
@@ -386,77 +470,15 @@ class CommunicationService:
                     "message": "Student not found or inactive"
                 }
 
-            if not student.parent_email:
-                return {
-                    "status":  "error",
-                    "message": f"No parent email on file for {student.full_name}"
-                }
-
-            # Build message
-            extra_data = data.get('extra_data', {})
-            if data.get('custom_message'):
-                extra_data['custom_message'] = data['custom_message']
-            if data.get('custom_subject'):
-                extra_data['custom_subject']  = data['custom_subject']
-
-            message = CommunicationService.build_message(
-                comm_type, student, extra_data
+            result = CommunicationService._queue_communication(
+                db, student, data, sent_by,
+                idempotency_key=f"communication:{idempotency_key}"
+                                if idempotency_key else None
             )
-
-            subject = data.get('custom_subject') \
-                      if comm_type == 'Custom' \
-                      else message['subject']
-            body    = data.get('custom_message') \
-                      if comm_type == 'Custom' \
-                      else message['body']
-
-            # Send email
-            email_result = CommunicationService._send_email(
-                to_email = student.parent_email,
-                to_name  = student.parent_name or 'Parent/Guardian',
-                subject  = subject,
-                body     = body
-            )
-
-            # Log to DB
-            status      = 'sent'   if email_result['success'] else 'failed'
-            message_id  = email_result.get('message_id')
-            error_msg   = email_result.get('error')
-
-            comm = Communication(
-                student_id         = student.id,
-                parent_email       = student.parent_email,
-                parent_name        = student.parent_name,
-                subject            = subject,
-                message_body       = body,
-                template_used      = comm_type,
-                communication_type = comm_type,
-                risk_label         = extra_data.get('risk_label'),
-                sent_by            = sent_by,
-                sent_at            = datetime.utcnow(),
-                status             = status,
-                sendgrid_id        = message_id,
-                error_message      = error_msg
-            )
-            db.add(comm)
             db.commit()
-            db.refresh(comm)
-
-            print(f"{'✅' if status == 'sent' else '❌'} "
-                  f"Communication {status}: "
-                  f"Student {student.id} → {student.parent_email}")
-
-            if not email_result['success']:
-                return {
-                    "status":  "error",
-                    "message": error_msg,
-                    "data":    comm.to_dict()  # logged even if failed
-                }
-
-            return {
-                "status": "success",
-                "data":   comm.to_dict()
-            }
+            if result['status'] == 'success' and not result.get('duplicate'):
+                OutboxService.wake()
+            return result
 
         except Exception as e:
             db.rollback()
@@ -471,45 +493,73 @@ class CommunicationService:
 
     @staticmethod
     def batch_send(
-        student_ids:    list,
-        comm_type:      str,
-        extra_data:     dict = None,
-        sent_by:        int  = None
+        student_ids:     list,
+        comm_type:       str,
+        extra_data:      dict = None,
+        sent_by:         int  = None,
+        idempotency_key: str  = None
     ) -> dict:
         """
-        Send same communication type to multiple students
-        Returns: summary of sent/failed counts
+        Queue the same communication type for multiple students
+        (one transaction; delivery happens in the outbox worker)
+        Returns: summary of queued/failed counts
         """
         extra_data = extra_data or {}
         results  = []
-        sent     = 0
+        queued   = 0
         failed   = 0
 
-        for sid in student_ids:
-            res = CommunicationService.send_communication(
-                data={
-                    'student_id':       sid,
-                    'communication_type': comm_type,
-                    'extra_data':       extra_data
-                },
-                sent_by=sent_by
-            )
-            if res.get('status') == 'success':
-                sent += 1
-            else:
-                failed += 1
-            results.append({
-                'student_id': sid,
-                'status':     res.get('status'),
-                'message':    res.get('message', '')
-            })
-
-        print(f"📧 Batch send complete: {sent} sent | {failed} failed")
+        db = SessionLocal()
+        try:
+            students = {
+                s.id: s for s in db.query(Student).filter(
+                    Student.id.in_(student_ids),
+                    Student.is_active == True
+                ).all()
+            }
+
+            for sid in student_ids:
+                student = students.get(sid)
+                if not student:
+                    res = {"status": "error", "message": "Student not found or inactive"}
+                else:
+                    res = CommunicationService._queue_communication(
+                        db, student,
+                        data={
+                            'communication_type': comm_type,
+                            'extra_data':         dict(extra_data)
+                        },
+                        sent_by=sent_by,
+                        idempotency_key=f"communication:{idempotency_key}:{sid}"
+                                        if idempotency_key else None
+                    )
+
+                if res.get('status') == 'success':
+                    queued += 1
+                else:
+                    failed += 1
+                results.append({
+                    'student_id': sid,
+                    'status':     res.get('status'),
+                    'message':    res.get('message', '')
+                })
+
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Batch send error: {e}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            db.close()
+
+        OutboxService.wake()
+        print(f"📮 Batch queued: {queued} queued | {failed} failed")
 
         return {
             "status": "success",
             "data": {
-                "sent":    sent,
+                "queued":  queued,
                 "failed":  failed,
                 "total":   len(student_ids),
                 "results": results
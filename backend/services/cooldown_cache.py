@@ -0,0 +1,93 @@
+"""
+Cooldown Cache - Last alert time per (student, notification type)
+ScholarSense - AI-Powered Academic Intelligence System
+Process-local LRU with a TTL in front of the notifications table, so
+repeated cooldown checks for the same student (academic record saves,
+predictions, sweeps) do not query the database every time:
+- a lookup stores the latest sent / queued alert time, or None when
+  there is none (negative results are cached too)
+- queueing or delivering an alert advances the entry; a failed
+  delivery drops it so the next check reads the database again
+- entries expire after the TTL, which bounds how stale a process can
+  be when another process (e.g. a separate outbox worker) writes
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# ============================================
+# CONSTANTS
+# ============================================
+COOLDOWN_CACHE_TTL  = int(os.getenv('NOTIFICATION_COOLDOWN_CACHE_TTL', 300))
+COOLDOWN_CACHE_SIZE = int(os.getenv('NOTIFICATION_COOLDOWN_CACHE_SIZE', 50000))
+
+
+class CooldownCache:
+    """Thread-safe LRU of (student_id, notification_type) → last alert time"""
+
+    def __init__(self, maxsize: int = COOLDOWN_CACHE_SIZE, ttl: int = COOLDOWN_CACHE_TTL):
+        self.maxsize  = maxsize
+        self.ttl      = ttl
+        self._entries = OrderedDict()       # key → (last_at, expires_at)
+        self._lock    = threading.Lock()
+        self.hits     = 0
+        self.misses   = 0
+
+    def get(self, student_id: int, notification_type: str) -> tuple:
+        """
+        Returns: (hit, last_at); last_at is None when the student has no
+                 recent alert of this type
+        """
+        key = (student_id, notification_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, student_id: int, notification_type: str, last_at: datetime = None):
+        """
+        Store the result of a database lookup. Never moves an entry
+        backwards: an alert recorded while the lookup ran wins.
+        """
+        key = (student_id, notification_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and (
+                last_at is None or entry[0] > last_at
+            ):
+                last_at = entry[0]
+            self._entries[key] = (last_at, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def record(self, student_id: int, notification_type: str, at: datetime = None):
+        """An alert was queued or delivered just now"""
+        self.put(student_id, notification_type, at or datetime.utcnow())
+
+    def invalidate(self, student_id: int, notification_type: str):
+        """Forget the entry (e.g. the queued alert failed to deliver)"""
+        with self._lock:
+            self._entries.pop((student_id, notification_type), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+# Shared by NotificationService and the outbox workers in this process
+cooldown_cache = CooldownCache()
@@ -11,11 +11,14 @@ Uses Gmail SMTP with App Password.
 
 import smtplib
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
+import html
+from functools import lru_cache
 from datetime import datetime
 
+from backend.services.mail_delivery import MailDelivery
+from backend.services.template_engine import (
+    MessageTemplate, MimeLayout, CompiledText, DEFAULT_LANGUAGE
+)
 
 from dotenv import load_dotenv
 from pathlib import Path
@@ -33,123 +36,10 @@ EMAIL_PASSWORD  = os.getenv('EMAIL_PASSWORD', '')
 EMAIL_FROM_NAME = os.getenv('EMAIL_FROM_NAME', 'ScholarSense')
 
 
-class EmailService:
-    """Shared SMTP email sender for all ScholarSense emails"""
-
-    # ──────────────────────────────────────────────────────────────────────────
-    @staticmethod
-    def _get_smtp_connection():
-        """
-        Create and return authenticated SMTP connection.
-        Returns: smtplib.SMTP object
-        """
-        if not EMAIL_USER or not EMAIL_PASSWORD:
-            raise ValueError(
-                "Email credentials not configured. "
-                "Set EMAIL_USER and EMAIL_PASSWORD in backend/.env"
-            )
-
-        server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT)
-        server.ehlo()
-        server.starttls()
-        server.login(EMAIL_USER, EMAIL_PASSWORD)
-        return server
-
-    # ──────────────────────────────────────────────────────────────────────────
-    @staticmethod
-    def send_email(
-        to_email   : str,
-        subject    : str,
-        text_body  : str,
-        html_body  : str = None
-    ) -> dict:
-        """
-        Send an email via Gmail SMTP.
+# ── Templates (compiled once per process, see template_engine) ────────────────
+OTP_SUBJECT = "🔐 Your ScholarSense Login OTP"
 
-        Args:
-            to_email  : Recipient email address
-            subject   : Email subject line
-            text_body : Plain text version of email
-            html_body : HTML version of email (optional)
-
-        Returns:
-            dict with status: 'sent' | 'failed'
-        """
-        try:
-            # ── Build message ───────────────────────────────────────────────
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From']    = f"{EMAIL_FROM_NAME} <{EMAIL_USER}>"
-            msg['To']      = to_email
-
-            # Attach plain text
-            msg.attach(MIMEText(text_body, 'plain'))
-
-            # Attach HTML if provided
-            if html_body:
-                msg.attach(MIMEText(html_body, 'html'))
-
-            # ── Send ────────────────────────────────────────────────────────
-            server = EmailService._get_smtp_connection()
-            server.sendmail(EMAIL_USER, to_email, msg.as_string())
-            server.quit()
-
-            print(f"Email sent to {to_email} | Subject: {subject}")
-            return {
-                'status' : 'sent',
-                'message': f'Email sent to {to_email}'
-            }
-
-        except smtplib.SMTPAuthenticationError:
-            print("SMTP Authentication failed. Check EMAIL_USER and EMAIL_PASSWORD in .env")
-            return {
-                'status' : 'failed',
-                'message': 'Email authentication failed. Check credentials in .env'
-            }
-
-        except smtplib.SMTPRecipientsRefused:
-            print(f"Recipient refused: {to_email}")
-            return {
-                'status' : 'failed',
-                'message': f'Invalid recipient email: {to_email}'
-            }
-
-        except smtplib.SMTPException as e:
-            print(f"SMTP error: {e}")
-            return {
-                'status' : 'failed',
-                'message': f'SMTP error: {str(e)}'
-            }
-
-        except Exception as e:
-            print(f"Email send error: {e}")
-            return {
-                'status' : 'failed',
-                'message': str(e)
-            }
-
-    # ──────────────────────────────────────────────────────────────────────────
-    @staticmethod
-    def send_otp_email(
-        to_email  : str,
-        user_name : str,
-        otp_code  : str
-    ) -> dict:
-        """
-        Send OTP verification email to user.
-
-        Args:
-            to_email  : User's registered email
-            user_name : User's full name
-            otp_code  : 6-digit OTP code
-
-        Returns:
-            dict with status: 'sent' | 'failed'
-        """
-        subject = "🔐 Your ScholarSense Login OTP"
-
-        # ── Plain text version ───────────────────────────────────────────────
-        text_body = f"""
+OTP_TEXT = """
 Hello {user_name},
 
 Your ScholarSense login OTP is: {otp_code}
@@ -161,10 +51,9 @@ If you did not request this, please contact your system administrator immediatel
 
 Best regards,
 ScholarSense Security Team
-        """.strip()
+""".strip()
 
-        # ── HTML version ─────────────────────────────────────────────────────
-        html_body = f"""
+OTP_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -278,109 +167,53 @@ ScholarSense Security Team
 
 </body>
 </html>
-        """.strip()
-
-        return EmailService.send_email(
-            to_email  = to_email,
-            subject   = subject,
-            text_body = text_body,
-            html_body = html_body
-        )
-
-
-    @staticmethod
-    def send_parent_notification(
-        to_email      : str,
-        parent_name   : str,
-        student_name  : str,
-        student_grade : int,
-        student_section: str,
-        notification_type: str,
-        trigger_reason: str,
-        details       : dict = None
-    ) -> dict:
-        """
-        Send parent notification email for academic alerts.
-
-        Args:
-            to_email         : Parent's email address
-            parent_name      : Parent's full name
-            student_name     : Student's full name
-            student_grade    : Student's grade (6-10)
-            student_section  : Student's section (A/B/C)
-            notification_type: 'low_gpa' | 'high_risk' | 'low_attendance' | 'failed_subjects'
-            trigger_reason   : Human-readable reason
-            details          : Extra details dict (gpa, attendance_rate, etc.)
-
-        Returns:
-            dict with status: 'sent' | 'failed'
-        """
-
-        # ── Subject and icon per type ────────────────────────────────────────
-        type_config = {
-            'low_gpa': {
-                'subject' : '📉 Academic Performance Alert',
-                'icon'    : '📉',
-                'color'   : '#f59e0b',
-                'bg'      : '#fffbeb',
-                'border'  : '#fcd34d',
-                'title'   : 'Low Academic Performance Alert'
-            },
-            'high_risk': {
-                'subject' : '🚨 Student At-Risk Notification',
-                'icon'    : '🚨',
-                'color'   : '#ef4444',
-                'bg'      : '#fef2f2',
-                'border'  : '#fca5a5',
-                'title'   : 'Student At-Risk Notification'
-            },
-            'low_attendance': {
-                'subject' : '📅 Low Attendance Warning',
-                'icon'    : '📅',
-                'color'   : '#f97316',
-                'bg'      : '#fff7ed',
-                'border'  : '#fdba74',
-                'title'   : 'Low Attendance Warning'
-            },
-            'failed_subjects': {
-                'subject' : '📝 Subject Failure Alert',
-                'icon'    : '📝',
-                'color'   : '#8b5cf6',
-                'bg'      : '#f5f3ff',
-                'border'  : '#c4b5fd',
-                'title'   : 'Subject Failure Alert'
-            }
-        }
-
-        cfg     = type_config.get(notification_type, type_config['high_risk'])
-        subject = f"{cfg['subject']} — {student_name}"
-
-        # ── Build details rows ───────────────────────────────────────────────
-        details_rows = ''
-        if details:
-            for key, value in details.items():
-                details_rows += f"""
-                <tr>
-                    <td style="padding:8px 12px; color:#6b7280;
-                               font-size:14px; border-bottom:1px solid #f3f4f6;">
-                        {key}
-                    </td>
-                    <td style="padding:8px 12px; color:#1f2937;
-                               font-size:14px; font-weight:600;
-                               border-bottom:1px solid #f3f4f6;">
-                        {value}
-                    </td>
-                </tr>
-                """
-
-        # ── Plain text ───────────────────────────────────────────────────────
-        text_body = f"""
+""".strip()
+
+# Subject, icon and colours per notification type
+NOTIFICATION_TYPES = {
+    'low_gpa': {
+        'subject' : '📉 Academic Performance Alert',
+        'icon'    : '📉',
+        'color'   : '#f59e0b',
+        'bg'      : '#fffbeb',
+        'border'  : '#fcd34d',
+        'title'   : 'Low Academic Performance Alert'
+    },
+    'high_risk': {
+        'subject' : '🚨 Student At-Risk Notification',
+        'icon'    : '🚨',
+        'color'   : '#ef4444',
+        'bg'      : '#fef2f2',
+        'border'  : '#fca5a5',
+        'title'   : 'Student At-Risk Notification'
+    },
+    'low_attendance': {
+        'subject' : '📅 Low Attendance Warning',
+        'icon'    : '📅',
+        'color'   : '#f97316',
+        'bg'      : '#fff7ed',
+        'border'  : '#fdba74',
+        'title'   : 'Low Attendance Warning'
+    },
+    'failed_subjects': {
+        'subject' : '📝 Subject Failure Alert',
+        'icon'    : '📝',
+        'color'   : '#8b5cf6',
+        'bg'      : '#f5f3ff',
+        'border'  : '#c4b5fd',
+        'title'   : 'Subject Failure Alert'
+    }
+}
+
+NOTIFICATION_SUBJECT = "{type_subject} — {student_name}"
+
+NOTIFICATION_TEXT = """
 Dear {parent_name},
 
 This is an important notification regarding your child {student_name} 
 (Grade {student_grade} - Section {student_section}).
 
-{cfg['title'].upper()}
+{title_upper}
 
 Reason: {trigger_reason}
 
@@ -390,10 +223,9 @@ with the class teacher.
 Best regards,
 ScholarSense Academic Team
 Greenwood High School
-        """.strip()
+""".strip()
 
-        # ── HTML ─────────────────────────────────────────────────────────────
-        html_body = f"""
+NOTIFICATION_HTML = """
 <!DOCTYPE html>
 <html>
 <head><meta charset="UTF-8"></head>
@@ -413,7 +245,7 @@ Greenwood High School
             <tr>
                 <td style="background:linear-gradient(135deg,#1f77b4,#2563eb);
                            padding:30px 40px; text-align:center;">
-                    <div style="font-size:36px;">{cfg['icon']}</div>
+                    <div style="font-size:36px;">{icon}</div>
                     <h1 style="color:#fff; margin:10px 0 0 0;
                                font-size:22px; font-weight:800;">
                         ScholarSense
@@ -426,11 +258,11 @@ Greenwood High School
 
             <!-- Alert Banner -->
             <tr>
-                <td style="background:{cfg['bg']}; border-left:5px solid {cfg['color']};
+                <td style="background:{bg}; border-left:5px solid {color};
                            padding:16px 40px;">
-                    <p style="color:{cfg['color']}; font-size:16px;
+                    <p style="color:{color}; font-size:16px;
                               font-weight:700; margin:0;">
-                        {cfg['icon']} {cfg['title']}
+                        {icon} {title}
                     </p>
                 </td>
             </tr>
@@ -463,7 +295,7 @@ Greenwood High School
                     </div>
 
                     <!-- Alert Reason -->
-                    <div style="background:{cfg['bg']}; border:1px solid {cfg['border']};
+                    <div style="background:{bg}; border:1px solid {border};
                                 border-radius:10px; padding:16px 20px;
                                 margin-bottom:20px;">
                         <p style="color:#374151; font-size:14px;
@@ -477,19 +309,7 @@ Greenwood High School
                     </div>
 
                     <!-- Details Table -->
-                    {f'''
-                    <table width="100%" cellpadding="0" cellspacing="0"
-                           style="border:1px solid #e5e7eb; border-radius:10px;
-                                  overflow:hidden; margin-bottom:20px;">
-                        <tr style="background:#f9fafb;">
-                            <td colspan="2" style="padding:10px 12px;
-                                font-weight:700; font-size:14px; color:#374151;">
-                                📊 Academic Details
-                            </td>
-                        </tr>
-                        {details_rows}
-                    </table>
-                    ''' if details_rows else ''}
+                    {details_table}
 
                     <!-- Action Notice -->
                     <div style="background:#f0fdf4; border:1px solid #86efac;
@@ -524,15 +344,281 @@ Greenwood High School
 
 </body>
 </html>
-        """.strip()
+""".strip()
+
+DETAILS_TABLE_HTML = """
+                <table width="100%" cellpadding="0" cellspacing="0"
+                       style="border:1px solid #e5e7eb; border-radius:10px;
+                              overflow:hidden; margin-bottom:20px;">
+                    <tr style="background:#f9fafb;">
+                        <td colspan="2" style="padding:10px 12px;
+                            font-weight:700; font-size:14px; color:#374151;">
+                            📊 Academic Details
+                        </td>
+                    </tr>
+                    {details_rows}
+                </table>
+"""
+
+DETAIL_ROW_HTML = """
+            <tr>
+                <td style="padding:8px 12px; color:#6b7280;
+                           font-size:14px; border-bottom:1px solid #f3f4f6;">
+                    {key}
+                </td>
+                <td style="padding:8px 12px; color:#1f2937;
+                           font-size:14px; font-weight:600;
+                           border-bottom:1px solid #f3f4f6;">
+                    {value}
+                </td>
+            </tr>
+"""
+
+
+@lru_cache(maxsize=None)
+def _otp_template(language: str = DEFAULT_LANGUAGE) -> MessageTemplate:
+    return MessageTemplate('otp', OTP_SUBJECT, OTP_TEXT, OTP_HTML, language=language)
+
+
+@lru_cache(maxsize=None)
+def _notification_template(notification_type: str,
+                           language: str = DEFAULT_LANGUAGE) -> MessageTemplate:
+    """Notification template with its type's icon and colours filled in"""
+    cfg = NOTIFICATION_TYPES[notification_type]
+    return MessageTemplate(
+        'notification', NOTIFICATION_SUBJECT, NOTIFICATION_TEXT, NOTIFICATION_HTML,
+        language=language, raw_slots=('details_table',)
+    ).bind(
+        type_subject = cfg['subject'],
+        icon         = cfg['icon'],
+        color        = cfg['color'],
+        bg           = cfg['bg'],
+        border       = cfg['border'],
+        title        = cfg['title'],
+        title_upper  = cfg['title'].upper()
+    )
+
+
+@lru_cache(maxsize=1)
+def _mime_layout() -> MimeLayout:
+    """MIME skeleton for ad-hoc messages from this account"""
+    return MimeLayout(EMAIL_USER, EMAIL_FROM_NAME)
+
+
+_DETAILS_TABLE = CompiledText(DETAILS_TABLE_HTML)
+_DETAIL_ROW    = CompiledText(DETAIL_ROW_HTML)
+
+
+def _details_table(details: dict) -> str:
+    """Academic details table (HTML), or '' when there are no details"""
+    if not details:
+        return ''
+    rows = ''.join(
+        _DETAIL_ROW.render({
+            'key'  : html.escape(str(key),   quote=False),
+            'value': html.escape(str(value), quote=False)
+        })
+        for key, value in details.items()
+    )
+    return _DETAILS_TABLE.render({'details_rows': rows})
+
+
+class EmailService:
+    """Shared SMTP email sender for all ScholarSense emails"""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def _get_pool():
+        """
+        Shared pool of authenticated SMTP connections for this account.
+        Returns: SMTPPool (connections are logged in once and reused)
+        """
+        if not EMAIL_USER or not EMAIL_PASSWORD:
+            raise ValueError(
+                "Email credentials not configured. "
+                "Set EMAIL_USER and EMAIL_PASSWORD in backend/.env"
+            )
+
+        return MailDelivery.pool(EMAIL_HOST, EMAIL_PORT, EMAIL_USER, EMAIL_PASSWORD)
+
+    # ──────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def build_message(
+        to_email   : str,
+        subject    : str,
+        text_body  : str,
+        html_body  : str = None
+    ) -> tuple:
+        """
+        Build the MIME message send_email() delivers.
+        Also used to render messages for the email outbox.
+
+        Returns:
+            (message_id, RFC 822 message string)
+        """
+        return _mime_layout().build(to_email, subject, text_body, html_body)
+
+    # ──────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def send_email(
+        to_email   : str,
+        subject    : str,
+        text_body  : str,
+        html_body  : str = None
+    ) -> dict:
+        """
+        Send an email via Gmail SMTP.
+
+        Args:
+            to_email  : Recipient email address
+            subject   : Email subject line
+            text_body : Plain text version of email
+            html_body : HTML version of email (optional)
+
+        Returns:
+            dict with status: 'sent' | 'failed'
+        """
+        try:
+            _, message = EmailService.build_message(to_email, subject, text_body, html_body)
+
+            # ── Send ────────────────────────────────────────────────────────
+            EmailService._get_pool().send(EMAIL_USER, to_email, message)
+
+            print(f"Email sent to {to_email} | Subject: {subject}")
+            return {
+                'status' : 'sent',
+                'message': f'Email sent to {to_email}'
+            }
+
+        except smtplib.SMTPAuthenticationError:
+            print("SMTP Authentication failed. Check EMAIL_USER and EMAIL_PASSWORD in .env")
+            return {
+                'status' : 'failed',
+                'message': 'Email authentication failed. Check credentials in .env'
+            }
+
+        except smtplib.SMTPRecipientsRefused:
+            print(f"Recipient refused: {to_email}")
+            return {
+                'status' : 'failed',
+                'message': f'Invalid recipient email: {to_email}'
+            }
+
+        except smtplib.SMTPException as e:
+            print(f"SMTP error: {e}")
+            return {
+                'status' : 'failed',
+                'message': f'SMTP error: {str(e)}'
+            }
+
+        except Exception as e:
+            print(f"Email send error: {e}")
+            return {
+                'status' : 'failed',
+                'message': str(e)
+            }
+
+    # ──────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def send_otp_email(
+        to_email  : str,
+        user_name : str,
+        otp_code  : str
+    ) -> dict:
+        """
+        Send OTP verification email to user.
+
+        Args:
+            to_email  : User's registered email
+            user_name : User's full name
+            otp_code  : 6-digit OTP code
+
+        Returns:
+            dict with status: 'sent' | 'failed'
+        """
+        email = _otp_template().render({
+            'user_name': user_name,
+            'otp_code' : otp_code
+        })
 
         return EmailService.send_email(
             to_email  = to_email,
-            subject   = subject,
-            text_body = text_body,
-            html_body = html_body
+            subject   = email.subject,
+            text_body = email.text,
+            html_body = email.html
+        )
+
+
+    @staticmethod
+    def send_parent_notification(
+        to_email      : str,
+        parent_name   : str,
+        student_name  : str,
+        student_grade : int,
+        student_section: str,
+        notification_type: str,
+        trigger_reason: str,
+        details       : dict = None
+    ) -> dict:
+        """
+        Send parent notification email for academic alerts (synchronously).
+        NotificationService queues these through the outbox instead.
+
+        Returns:
+            dict with status: 'sent' | 'failed'
+        """
+        return EmailService.send_email(
+            to_email = to_email,
+            **EmailService.render_parent_notification(
+                parent_name, student_name, student_grade, student_section,
+                notification_type, trigger_reason, details
+            )
         )
 
+    # ──────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def render_parent_notification(
+        parent_name   : str,
+        student_name  : str,
+        student_grade : int,
+        student_section: str,
+        notification_type: str,
+        trigger_reason: str,
+        details       : dict = None
+    ) -> dict:
+        """
+        Render the parent notification email for academic alerts.
+
+        Args:
+            parent_name      : Parent's full name
+            student_name     : Student's full name
+            student_grade    : Student's grade (6-10)
+            student_section  : Student's section (A/B/C)
+            notification_type: 'low_gpa' | 'high_risk' | 'low_attendance' | 'failed_subjects'
+            trigger_reason   : Human-readable reason
+            details          : Extra details dict (gpa, attendance_rate, etc.)
+
+        Returns:
+            dict with subject, text_body, html_body
+        """
+
+        email = _notification_template(
+            notification_type if notification_type in NOTIFICATION_TYPES else 'high_risk'
+        ).render({
+            'parent_name'    : parent_name,
+            'student_name'   : student_name,
+            'student_grade'  : student_grade,
+            'student_section': student_section,
+            'trigger_reason' : trigger_reason,
+            'details_table'  : _details_table(details)
+        })
+
+        return {
+            'subject'  : email.subject,
+            'text_body': email.text,
+            'html_body': email.html
+        }
+
 
 
     # ──────────────────────────────────────────────────────────────────────────
@@ -546,7 +632,8 @@ Greenwood High School
             dict with status: 'connected' | 'failed'
         """
         try:
-            server = EmailService._get_smtp_connection()
+            # Fresh login, so bad credentials show up even with a warm pool
+            server = EmailService._get_pool().connect()
             server.quit()
             print(f"SMTP connection successful ({EMAIL_HOST}:{EMAIL_PORT})")
             return {
@@ -0,0 +1,249 @@
+"""
+Feature Store - One definition of the model features for training and serving
+ScholarSense - AI-Powered Academic Intelligence System
+Builds student feature dicts from a few grouped queries per chunk of
+students (students, latest academic record, attendance and incident
+aggregates). Online prediction and the retraining script both go
+through here, so windows, defaults and encodings can't drift apart.
+"""
+
+from datetime import date, timedelta
+import numpy as np
+from sqlalchemy import func, desc
+from backend.database.models import Student, AcademicRecord, Attendance, BehavioralIncident
+from backend.database.db_config import SessionLocal
+
+# ============================================
+# CONSTANTS
+# ============================================
+ATTENDANCE_WINDOW_DAYS = 30
+INCIDENT_WINDOW_DAYS   = 90
+QUERY_CHUNK_SIZE       = 1000
+TRAINING_CHUNK_SIZE    = 5000
+
+FEATURE_NAMES = [
+    'age', 'grade', 'gender', 'socioeconomic_status', 'parent_education',
+    'current_gpa', 'previous_gpa', 'grade_trend', 'attendance_rate',
+    'failed_subjects', 'assignment_submission_rate', 'behavioral_incidents',
+    'math_score', 'science_score', 'english_score', 'social_score', 'language_score'
+]
+
+# Categorical encoding used when no fitted label encoder covers a value
+CATEGORICAL_FEATURES = ('gender', 'socioeconomic_status', 'parent_education')
+FALLBACK_ENCODINGS = {
+    'gender': {'Male': 1, 'Female': 0},
+    'socioeconomic_status': {'Low': 0, 'Medium': 1, 'High': 2},
+    'parent_education': {'None': 0, 'High School': 1, 'Graduate': 2, 'Post-Graduate': 3},
+}
+FALLBACK_DEFAULTS = {'gender': 0, 'socioeconomic_status': 1, 'parent_education': 1}
+
+STUDENT_NOT_FOUND   = 'Student not found'
+NO_ACADEMIC_RECORDS = 'No academic records found for this student'
+
+
+class FeatureStore:
+    """Set-based feature extraction shared by inference and training"""
+
+    # ──────────────────────────────────────────
+    # AGGREGATES
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def _load_chunk(db, student_ids: list, as_of: date, label_window_days: int = None):
+        """
+        Rows and aggregates for one chunk of students (4 queries)
+        Returns: (students, academics, attendance, incidents) dicts keyed
+                 by student id; attendance values are
+                 (present_days, total_days, label_window_absences)
+        """
+        attendance_since = as_of - timedelta(days=ATTENDANCE_WINDOW_DAYS)
+        incidents_since  = as_of - timedelta(days=INCIDENT_WINDOW_DAYS)
+        label_since      = as_of - timedelta(days=label_window_days or ATTENDANCE_WINDOW_DAYS)
+        in_window        = Attendance.attendance_date >= attendance_since
+
+        students = {
+            s.id: s for s in
+            db.query(Student).filter(Student.id.in_(student_ids)).all()
+        }
+
+        # Latest academic record per student (DISTINCT ON)
+        academics = {
+            a.student_id: a for a in
+            db.query(AcademicRecord).distinct(
+                AcademicRecord.student_id
+            ).filter(
+                AcademicRecord.student_id.in_(student_ids)
+            ).order_by(
+                AcademicRecord.student_id,
+                desc(AcademicRecord.recorded_date),
+                desc(AcademicRecord.id)
+            ).all()
+        }
+
+        # Feature window counts, plus absences over the label window
+        attendance = {
+            row.student_id: (row.present_days, row.total_days, row.label_absences)
+            for row in db.query(
+                Attendance.student_id,
+                func.count(Attendance.id).filter(in_window).label('total_days'),
+                func.count(Attendance.id).filter(
+                    in_window, Attendance.status == 'present'
+                ).label('present_days'),
+                func.count(Attendance.id).filter(
+                    Attendance.attendance_date >= label_since,
+                    Attendance.status != 'present'
+                ).label('label_absences')
+            ).filter(
+                Attendance.student_id.in_(student_ids),
+                Attendance.attendance_date >= min(attendance_since, label_since)
+            ).group_by(Attendance.student_id).all()
+        }
+
+        incidents = dict(
+            db.query(
+                BehavioralIncident.student_id,
+                func.count(BehavioralIncident.id)
+            ).filter(
+                BehavioralIncident.student_id.in_(student_ids),
+                BehavioralIncident.incident_date >= incidents_since
+            ).group_by(BehavioralIncident.student_id).all()
+        )
+
+        return students, academics, attendance, incidents
+
+    @staticmethod
+    def build_features(student, academic, present_days: int, total_days: int,
+                       incident_count: int) -> dict:
+        """Assemble the model feature dict from already-loaded rows/aggregates"""
+        attendance_rate = (present_days / total_days * 100) if total_days > 0 else 95.0
+
+        return {
+            'student_id': student.student_id,
+            'age': student.computed_age or 15,
+            'grade': student.grade,
+            'gender': student.gender,  # Encoded at scoring time
+            'socioeconomic_status': student.socioeconomic_status or 'Medium',
+            'parent_education': student.parent_education or 'High School',
+            'current_gpa': float(academic.current_gpa) if academic.current_gpa else 75.0,
+            'previous_gpa': float(academic.previous_gpa) if academic.previous_gpa else 75.0,
+            'grade_trend': float(academic.grade_trend) if academic.grade_trend else 0.0,
+            'attendance_rate': attendance_rate,
+            'failed_subjects': academic.failed_subjects or 0,
+            'assignment_submission_rate': float(academic.assignment_submission_rate) if academic.assignment_submission_rate else 90.0,
+            'behavioral_incidents': incident_count,
+            'math_score': float(academic.math_score) if academic.math_score else 75.0,
+            'science_score': float(academic.science_score) if academic.science_score else 75.0,
+            'english_score': float(academic.english_score) if academic.english_score else 75.0,
+            'social_score': float(academic.social_score) if academic.social_score else 75.0,
+            'language_score': float(academic.language_score) if academic.language_score else 75.0
+        }
+
+    # ──────────────────────────────────────────
+    # ONLINE (INFERENCE)
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def features_for(student_ids: list, db=None, chunk_size: int = QUERY_CHUNK_SIZE) -> dict:
+        """
+        Feature dicts for specific students
+        Returns: {student_id: features}, with {'error': ...} entries for
+                 missing students or students without academic records
+        """
+        own_session = db is None
+        if own_session:
+            db = SessionLocal()
+        try:
+            as_of        = date.today()
+            features_map = {}
+            student_ids  = list(dict.fromkeys(student_ids))
+
+            for start in range(0, len(student_ids), chunk_size):
+                chunk = student_ids[start:start + chunk_size]
+                students, academics, attendance, incidents = \
+                    FeatureStore._load_chunk(db, chunk, as_of)
+
+                for sid in chunk:
+                    student = students.get(sid)
+                    if not student:
+                        features_map[sid] = {'error': STUDENT_NOT_FOUND}
+                        continue
+                    academic = academics.get(sid)
+                    if not academic:
+                        features_map[sid] = {'error': NO_ACADEMIC_RECORDS}
+                        continue
+                    present_days, total_days, _ = attendance.get(sid, (0, 0, 0))
+                    features_map[sid] = FeatureStore.build_features(
+                        student, academic, present_days, total_days,
+                        incidents.get(sid, 0)
+                    )
+
+            return features_map
+        finally:
+            if own_session:
+                db.close()
+
+    # ──────────────────────────────────────────
+    # OFFLINE (TRAINING)
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def iter_training_rows(db, chunk_size: int = TRAINING_CHUNK_SIZE,
+                           label_window_days: int = INCIDENT_WINDOW_DAYS):
+        """
+        Stream (student, features, label_absences) for every active student
+        with an academic record, chunk by chunk in id order (keyset paging,
+        so memory stays flat however many students there are)
+        label_absences: non-present days over label_window_days, for
+                        deriving the training label
+        """
+        as_of   = date.today()
+        last_id = 0
+        while True:
+            chunk = db.query(Student.id).filter(
+                Student.is_active == True,
+                Student.id > last_id
+            ).order_by(Student.id).limit(chunk_size).all()
+            if not chunk:
+                return
+            ids     = [row.id for row in chunk]
+            last_id = ids[-1]
+
+            students, academics, attendance, incidents = \
+                FeatureStore._load_chunk(db, ids, as_of, label_window_days)
+            for sid in ids:
+                academic = academics.get(sid)
+                if not academic:
+                    continue
+                present_days, total_days, label_absences = attendance.get(sid, (0, 0, 0))
+                yield students[sid], FeatureStore.build_features(
+                    students[sid], academic, present_days, total_days,
+                    incidents.get(sid, 0)
+                ), label_absences
+
+            # Rows of finished chunks are no longer needed
+            db.expunge_all()
+
+    # ──────────────────────────────────────────
+    # ENCODING
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def encode_value(key: str, value, lookups: dict = None):
+        """Encode one feature value (categoricals via the lookup tables)"""
+        if key not in CATEGORICAL_FEATURES:
+            return value
+        code = (lookups or FALLBACK_ENCODINGS)[key].get(value)
+        if code is None:
+            code = FALLBACK_DEFAULTS[key]
+        return code
+
+    @staticmethod
+    def encode_matrix(features_list: list, lookups: dict = None,
+                      feature_order: list = None):
+        """2-D float array, one encoded row per feature dict"""
+        encode = FeatureStore.encode_value
+        order  = feature_order or FEATURE_NAMES
+        return np.array([
+            [encode(feat, features[feat], lookups) for feat in order]
+            for features in features_list
+        ], dtype=float)
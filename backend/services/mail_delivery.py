@@ -0,0 +1,227 @@
+"""
+Mail Delivery - Pooled, persistent SMTP connections
+ScholarSense - AI-Powered Academic Intelligence System
+EmailService (OTPs, notifications) and CommunicationService (parent
+communications) send through here. Each SMTP account gets a small pool
+of authenticated connections: EHLO / STARTTLS / LOGIN happen once per
+connection instead of once per message, at most SMTP_POOL_SIZE
+messages are in flight at a time, and a connection the server dropped
+is replaced and the message retried once.
+"""
+
+import os
+import ssl
+import time
+import queue
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# ============================================
+# CONSTANTS
+# ============================================
+SMTP_POOL_SIZE    = int(os.getenv('SMTP_POOL_SIZE', 4))
+# Gmail drops a connection after ~100 messages; recycle before that
+SMTP_MAX_MESSAGES = int(os.getenv('SMTP_MAX_MESSAGES_PER_CONNECTION', 90))
+# Idle connections older than this are NOOP-checked before reuse
+SMTP_IDLE_SECONDS = int(os.getenv('SMTP_IDLE_SECONDS', 60))
+SMTP_TIMEOUT      = int(os.getenv('SMTP_TIMEOUT', 30))
+SMTP_STARTTLS     = os.getenv('SMTP_STARTTLS', '1') == '1'
+
+# Failures that mean the connection is gone, not that the message is bad
+RECONNECT_ERRORS  = (smtplib.SMTPServerDisconnected, OSError)
+# 421: server is closing the channel
+SERVICE_CLOSING   = 421
+
+_pools      = {}
+_pools_lock = threading.Lock()
+
+
+class _Connection:
+    """An authenticated SMTP session plus usage counters"""
+
+    __slots__ = ('server', 'sent', 'last_used')
+
+    def __init__(self, server):
+        self.server    = server
+        self.sent      = 0
+        self.last_used = time.monotonic()
+
+    def close(self):
+        try:
+            self.server.quit()
+        except Exception:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+
+
+class SMTPPool:
+    """Bounded pool of authenticated connections to one SMTP account"""
+
+    def __init__(self, host, port, user='', password='', size=SMTP_POOL_SIZE,
+                 starttls=SMTP_STARTTLS, timeout=SMTP_TIMEOUT,
+                 max_messages=SMTP_MAX_MESSAGES, idle_seconds=SMTP_IDLE_SECONDS):
+        self.host         = host
+        self.port         = port
+        self.user         = user
+        self.password     = password
+        self.size         = size
+        self.starttls     = starttls
+        self.timeout      = timeout
+        self.max_messages = max_messages
+        self.idle_seconds = idle_seconds
+        self._idle        = queue.LifoQueue()      # most recently used first
+        self._slots       = threading.BoundedSemaphore(size)
+        self.stats        = {'connects': 0, 'sent': 0, 'reconnects': 0}
+        self._stats_lock  = threading.Lock()
+
+    # ──────────────────────────────────────────
+    # CONNECTIONS
+    # ──────────────────────────────────────────
+
+    def connect(self):
+        """Fresh authenticated smtplib.SMTP (EHLO, STARTTLS, LOGIN)"""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.starttls:
+                server.starttls(context=ssl.create_default_context())
+                server.ehlo()
+            if self.user:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._count('connects')
+        return server
+
+    def _acquire(self):
+        """
+        A usable connection, reusing an idle one when possible
+        Returns: (connection, reused)
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return _Connection(self.connect()), False
+            if time.monotonic() - conn.last_used < self.idle_seconds:
+                return conn, True
+            try:
+                conn.server.noop()
+                return conn, True
+            except Exception:
+                conn.close()
+
+    def _release(self, conn, healthy=True):
+        if healthy and conn.sent < self.max_messages:
+            conn.last_used = time.monotonic()
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+    def close(self):
+        """Close every idle connection (in-flight ones close on release)"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    # ──────────────────────────────────────────
+    # SENDING
+    # ──────────────────────────────────────────
+
+    def send(self, from_addr, to_addrs, message):
+        """
+        Send one message (str or bytes) on a pooled connection
+        Raises the smtplib exception when delivery fails; a dropped
+        connection is replaced and the message retried once.
+        """
+        with self._slots:
+            conn, reused = self._acquire()
+            try:
+                conn.server.sendmail(from_addr, to_addrs, message)
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code != SERVICE_CLOSING:
+                    self._reset(conn)                 # bad message, session fine
+                    raise
+                conn = self._resend(conn, reused, e, from_addr, to_addrs, message)
+            except smtplib.SMTPRecipientsRefused:
+                self._release(conn)
+                raise
+            except RECONNECT_ERRORS as e:
+                conn = self._resend(conn, reused, e, from_addr, to_addrs, message)
+            except Exception:
+                # Unknown session state (SMTPNotSupportedError, encoding errors...)
+                conn.close()
+                raise
+            conn.sent += 1
+            self._count('sent')
+            self._release(conn)
+
+    def _resend(self, conn, reused, error, from_addr, to_addrs, message):
+        """Replace a dropped connection and retry once (reused ones only)"""
+        conn.close()
+        if not reused:
+            raise error                               # a fresh session failed: real error
+        self._count('reconnects')
+        conn = _Connection(self.connect())
+        try:
+            conn.server.sendmail(from_addr, to_addrs, message)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _reset(self, conn):
+        """RSET after a rejected message; drop the session if that fails"""
+        try:
+            conn.server.rset()
+            self._release(conn)
+        except Exception:
+            conn.close()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def send_many(self, messages, max_workers=None):
+        """
+        Send (from_addr, to_addrs, message) tuples with bounded concurrency
+        Returns: list aligned with messages, None for sent or the exception
+        """
+        def deliver(item):
+            try:
+                self.send(*item)
+                return None
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.size) as executor:
+            return list(executor.map(deliver, messages))
+
+
+class MailDelivery:
+    """Shared pools, one per SMTP account"""
+
+    @staticmethod
+    def pool(host, port, user='', password='') -> SMTPPool:
+        """The process-wide pool for an account (created on first use)"""
+        key = (host, int(port), user)
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None or pool.password != password:
+                if pool is not None:
+                    pool.close()
+                pool = _pools[key] = SMTPPool(host, int(port), user, password)
+            return pool
+
+    @staticmethod
+    def close_all():
+        with _pools_lock:
+            for pool in _pools.values():
+                pool.close()
+            _pools.clear()
@@ -5,10 +5,16 @@ Enhancement 6: Marks Entry Module
 Handles marks entry, GPA calculation, and analytics
 """
 
+import io
+import csv
+import numpy as np
 from datetime import datetime
-from sqlalchemy import and_, func, desc, text
+from sqlalchemy import and_, func, desc, text, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from backend.database.models import MarksEntry, Student, AcademicRecord
 from backend.database.db_config import SessionLocal
+from backend.services.analytics_service import AnalyticsService
+from backend.services.rescore_service import RescoreService
 
 # ============================================
 # CONSTANTS
@@ -31,6 +37,8 @@ SUBJECT_LABELS = {
 
 PASS_MARK = 35.0   # Minimum pass mark out of 100
 
+BULK_CHUNK_SIZE = 1000   # Rows per multi-row upsert statement
+
 
 # ============================================
 # MARKS SERVICE
@@ -250,24 +258,18 @@ class MarksService:
                 )
             ).first()
 
-            sem_num = MarksService._parse_semester_number(semester)
-            prev_semester_num = sem_num - 1 if sem_num > 1 else 1
-            if isinstance(semester, str) and semester.lower().startswith('semester'):
-                prev_semester = f"Semester {prev_semester_num}"
-            else:
-                prev_semester = str(prev_semester_num)
+            # Previous semester's GPA for trend calculation
+            prev_record = db.query(AcademicRecord.current_gpa).filter(
+                and_(
+                    AcademicRecord.student_id == student_id,
+                    AcademicRecord.semester   == MarksService._previous_semester(semester)
+                )
+            ).first()
+            prev_gpa, grade_trend = MarksService._gpa_trend(
+                gpa, prev_record.current_gpa if prev_record else None
+            )
 
             if existing:
-                # Fetch previous semester's GPA for trend calculation
-                prev_record = db.query(AcademicRecord).filter(
-                    and_(
-                        AcademicRecord.student_id == student_id,
-                        AcademicRecord.semester   == prev_semester
-                    )
-                ).first()
-                prev_gpa = float(prev_record.current_gpa) if (prev_record and prev_record.current_gpa) else gpa
-                grade_trend = round(gpa - prev_gpa, 2)
-
                 existing.current_gpa               = gpa
                 existing.previous_gpa              = prev_gpa
                 existing.grade_trend               = grade_trend
@@ -284,8 +286,8 @@ class MarksService:
                     student_id                 = student_id,
                     semester                   = semester_value,
                     current_gpa                = gpa,
-                    previous_gpa               = gpa,
-                    grade_trend                = 0.0,  # No trend for first semester
+                    previous_gpa               = prev_gpa,
+                    grade_trend                = grade_trend,
                     failed_subjects            = failed_subjects,
                     total_subjects             = 5,
                     math_score                 = math,
@@ -297,13 +299,24 @@ class MarksService:
                 )
                 db.add(new_record)
 
+            RescoreService.mark_dirty(db, [student_id], 'marks')
             db.commit()
+            AnalyticsService.invalidate_overview()
             print(f"🔄 Academic record synced for student {student_id} / {semester}")
 
         except Exception as e:
             db.rollback()
             print(f"⚠️  Academic sync error (non-critical): {e}")
 
+    @staticmethod
+    def _gpa_trend(gpa, previous_gpa):
+        """
+        (previous_gpa, grade_trend) for an academic record
+        Without a previous-semester GPA the record is its own baseline (trend 0).
+        """
+        previous = float(previous_gpa) if previous_gpa else gpa
+        return previous, round(gpa - previous, 2)
+
     @staticmethod
     def _parse_semester_number(semester):
         if isinstance(semester, int):
@@ -321,6 +334,257 @@ class MarksService:
             return 3
         return 1
 
+    @staticmethod
+    def _previous_semester(semester):
+        """Label of the semester before `semester` (same naming style)"""
+        sem_num = MarksService._parse_semester_number(semester)
+        prev_semester_num = sem_num - 1 if sem_num > 1 else 1
+        if isinstance(semester, str) and semester.lower().startswith('semester'):
+            return f"Semester {prev_semester_num}"
+        return str(prev_semester_num)
+
+    # ──────────────────────────────────────────
+    # BULK MARKS ENTRY (class sheet)
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def parse_marks_csv(text: str) -> list:
+        """
+        Parse a class sheet CSV into row dicts
+        Columns: student_id, math_score, science_score, english_score,
+                 social_score, language_score
+                 [, assignment_submission_rate, remarks]
+        """
+        reader = csv.DictReader(io.StringIO(text))
+        return [
+            {(k or '').strip(): (v.strip() if isinstance(v, str) else v)
+             for k, v in row.items()}
+            for row in reader
+        ]
+
+    @staticmethod
+    def _validate_bulk_rows(rows: list):
+        """
+        Validate sheet rows in one pass
+        Returns: ({student_id: parsed_row}, [per-row error strings])
+        Later rows for the same student replace earlier ones.
+        """
+        parsed, errors = {}, []
+        for index, row in enumerate(rows):
+            try:
+                student_id = int(row.get('student_id'))
+            except (TypeError, ValueError):
+                errors.append(f"Row {index}: invalid student_id '{row.get('student_id')}'")
+                continue
+
+            scores, problems = [], []
+            for subject in SUBJECTS:
+                value = row.get(f'{subject}_score')
+                if value is None or value == '':
+                    problems.append(f"missing {subject}")
+                    continue
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    problems.append(f"{subject} is not a number")
+                    continue
+                if not 0 <= value <= 100:
+                    problems.append(f"{subject} must be between 0 and 100")
+                scores.append(value)
+
+            rate = row.get('assignment_submission_rate')
+            try:
+                rate = 100.0 if rate in (None, '') else float(rate)
+                if not 0 <= rate <= 100:
+                    problems.append("assignment_submission_rate must be between 0 and 100")
+            except (TypeError, ValueError):
+                problems.append("assignment_submission_rate is not a number")
+
+            if problems:
+                errors.append(f"Row {index}: {', '.join(problems)}")
+                continue
+
+            parsed[student_id] = {
+                'row':     index,
+                'scores':  scores,
+                'rate':    rate,
+                'remarks': row.get('remarks') or None,
+            }
+        return parsed, errors
+
+    @staticmethod
+    def enter_marks_bulk(rows: list, semester: str, exam_type: str,
+                         entered_by: int) -> dict:
+        """
+        Enter marks for a whole class sheet in one transaction
+        GPA, totals and failed-subject counts are computed for all rows
+        at once with numpy; marks_entry and academic_records are written
+        with multi-row INSERT ... ON CONFLICT DO UPDATE.
+        Returns:
+            {"status": "success", "data": {saved, created, updated, records, errors}} or
+            {"status": "error",   "message": "...", "errors": [...]}
+        """
+        semester = str(semester or '').strip()
+        if not semester:
+            return {"status": "error", "message": "semester is required"}
+        if exam_type not in EXAM_TYPES:
+            return {
+                "status":  "error",
+                "message": f"Invalid exam_type. Must be one of: {EXAM_TYPES}"
+            }
+        if not rows:
+            return {"status": "error", "message": "No rows provided"}
+
+        parsed, errors = MarksService._validate_bulk_rows(rows)
+
+        db = next(MarksService.get_db())
+        try:
+            # ── One lookup for every student on the sheet ──────
+            students = {
+                s.id: s for s in db.query(
+                    Student.id, Student.grade, Student.section
+                ).filter(
+                    Student.id.in_(list(parsed)),
+                    Student.is_active == True
+                ).all()
+            } if parsed else {}
+
+            student_ids = []
+            for student_id, item in parsed.items():
+                if student_id in students:
+                    student_ids.append(student_id)
+                else:
+                    errors.append(f"Row {item['row']}: student {student_id} "
+                                  f"not found or inactive")
+
+            if not student_ids:
+                return {"status": "error", "message": "No valid rows to save",
+                        "errors": errors}
+
+            # ── Vectorized calculations ────────────────────────
+            scores = np.array([parsed[sid]['scores'] for sid in student_ids],
+                              dtype=float)
+            gpa    = np.round(scores.sum(axis=1) / len(SUBJECTS), 2)
+            total  = np.round(scores.sum(axis=1), 2)
+            failed = (scores < PASS_MARK).sum(axis=1)
+
+            # Previous-semester GPA for trend (one query)
+            prev_gpa = dict(db.query(
+                AcademicRecord.student_id, AcademicRecord.current_gpa
+            ).filter(
+                AcademicRecord.student_id.in_(student_ids),
+                AcademicRecord.semester   == MarksService._previous_semester(semester)
+            ).all())
+
+            now = datetime.utcnow()
+            marks_values, academic_values = [], []
+            for pos, sid in enumerate(student_ids):
+                item = parsed[sid]
+                math, science, english, social, language = item['scores']
+                row_gpa  = float(gpa[pos])
+                previous, trend = MarksService._gpa_trend(row_gpa, prev_gpa.get(sid))
+
+                marks_values.append({
+                    'student_id': sid, 'grade': students[sid].grade,
+                    'section': students[sid].section,
+                    'semester': semester, 'exam_type': exam_type,
+                    'math_score': math, 'science_score': science,
+                    'english_score': english, 'social_score': social,
+                    'language_score': language,
+                    'total_marks': float(total[pos]), 'gpa': row_gpa,
+                    'failed_subjects': int(failed[pos]),
+                    'assignment_submission_rate': item['rate'],
+                    'entered_by': entered_by, 'remarks': item['remarks'],
+                    'entered_at': now, 'updated_at': now,
+                })
+                academic_values.append({
+                    'student_id': sid, 'semester': semester,
+                    'current_gpa': row_gpa, 'previous_gpa': previous,
+                    'grade_trend': trend,
+                    'failed_subjects': int(failed[pos]), 'total_subjects': len(SUBJECTS),
+                    'math_score': math, 'science_score': science,
+                    'english_score': english, 'social_score': social,
+                    'language_score': language,
+                    'assignment_submission_rate': item['rate'],
+                    'recorded_date': now.date(), 'created_at': now, 'updated_at': now,
+                })
+
+            # ── Set-based upserts ──────────────────────────────
+            marks_table    = MarksEntry.__table__
+            academic_table = AcademicRecord.__table__
+            saved = []
+            for start in range(0, len(marks_values), BULK_CHUNK_SIZE):
+                stmt = pg_insert(marks_table).values(
+                    marks_values[start:start + BULK_CHUNK_SIZE]
+                )
+                saved.extend(db.execute(stmt.on_conflict_do_update(
+                    index_elements=['student_id', 'semester', 'exam_type'],
+                    set_={col: stmt.excluded[col] for col in (
+                        'grade', 'section', 'math_score', 'science_score',
+                        'english_score', 'social_score', 'language_score',
+                        'total_marks', 'gpa', 'failed_subjects',
+                        'assignment_submission_rate', 'entered_by',
+                        'remarks', 'updated_at'
+                    )}
+                ).returning(
+                    marks_table.c.id, marks_table.c.student_id,
+                    literal_column('xmax = 0').label('inserted')
+                )).all())
+
+                stmt = pg_insert(academic_table).values(
+                    academic_values[start:start + BULK_CHUNK_SIZE]
+                )
+                db.execute(stmt.on_conflict_do_update(
+                    index_elements=['student_id', 'semester'],
+                    set_={col: stmt.excluded[col] for col in (
+                        'current_gpa', 'previous_gpa', 'grade_trend',
+                        'failed_subjects', 'math_score', 'science_score',
+                        'english_score', 'social_score', 'language_score',
+                        'assignment_submission_rate', 'updated_at'
+                    )}
+                ))
+
+            RescoreService.mark_dirty(db, student_ids, 'marks')
+            db.commit()
+            AnalyticsService.invalidate_overview()
+
+            position = {sid: pos for pos, sid in enumerate(student_ids)}
+            records  = []
+            for row in saved:
+                pos = position[row.student_id]
+                records.append({
+                    'row':             parsed[row.student_id]['row'],
+                    'id':              row.id,
+                    'student_id':      row.student_id,
+                    'gpa':             float(gpa[pos]),
+                    'total_marks':     float(total[pos]),
+                    'failed_subjects': int(failed[pos]),
+                    'action':          'created' if row.inserted else 'updated'
+                })
+            records.sort(key=lambda r: r['row'])
+            created = sum(1 for r in records if r['action'] == 'created')
+
+            print(f"✅ Bulk marks saved: {len(records)} rows "
+                  f"- {semester} / {exam_type} ({len(errors)} errors)")
+
+            return {
+                "status": "success",
+                "data": {
+                    "saved":   len(records),
+                    "created": created,
+                    "updated": len(records) - created,
+                    "records": records,
+                    "errors":  errors if errors else None
+                }
+            }
+
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Bulk marks error: {e}")
+            return {"status": "error", "message": str(e), "errors": errors}
+        finally:
+            db.close()
+
     # ──────────────────────────────────────────
     # GET CLASS MARKS
     # ──────────────────────────────────────────
@@ -0,0 +1,616 @@
+"""
+Model Registry - Versioned model artifacts with an in-process cache
+ScholarSense - AI-Powered Academic Intelligence System
+Each version lives in models/saved_models/<version>/ next to a
+manifest of sha256 checksums, and the ACTIVE file names the version
+to serve. Every service in the process shares one loaded bundle, which
+activate() swaps atomically: requests already holding the old bundle
+finish with it, new requests get the new one.
+
+Two artifact formats:
+  pickle  best_model.pkl, scaler.pkl, label_encoders.pkl, model_metadata.pkl
+  joblib  model.joblib plus preprocessing.json (scaler mean/scale,
+          encoder vocabularies, metadata, compiled-model scalars) and,
+          for gradient boosting, the compiled node arrays as .npy files.
+          Those are opened with np.load(mmap_mode='r') and scored from
+          directly, so forked workers share them through the page cache;
+          model.joblib is only deserialized when something needs the
+          sklearn object itself (sklearn copies its tree arrays on load,
+          so it can't be shared)
+"""
+
+import os
+import json
+import time
+import pickle
+import hashlib
+import threading
+import joblib
+import numpy as np
+from datetime import datetime
+from backend.config.settings import MODEL_DIR
+from backend.services.compiled_model import (
+    CompiledGradientBoosting, compile_model, ARRAY_FIELDS, COMPILED_INFERENCE,
+    COMPILED_MAX_ROWS
+)
+
+# ============================================
+# CONSTANTS
+# ============================================
+REGISTRY_DIR   = MODEL_DIR
+ACTIVE_FILE    = REGISTRY_DIR / 'ACTIVE'
+MANIFEST_NAME  = 'manifest.json'
+ARTIFACT_FILES = {
+    'model':          'best_model.pkl',
+    'scaler':         'scaler.pkl',
+    'label_encoders': 'label_encoders.pkl',
+    'metadata':       'model_metadata.pkl',
+}
+JOBLIB_FILES   = {
+    'model':   'model.joblib',
+    'sidecar': 'preprocessing.json',
+}
+# Compiled node arrays, one .npy per field
+COMPILED_FILES = {field: f'compiled_{field}.npy' for field in ARRAY_FIELDS}
+ARTIFACT_FORMATS = ('pickle', 'joblib')
+# Format written by register()
+ARTIFACT_FORMAT  = os.getenv('MODEL_ARTIFACT_FORMAT', 'joblib')
+# 'r' maps the compiled node arrays read-only instead of copying them
+MMAP_MODE        = os.getenv('MODEL_MMAP_MODE', 'r') or None
+HASH_CHUNK_BYTES = 1024 * 1024
+# Flat pre-registry layout (files directly in saved_models/) is served
+# under this version so existing prediction rows keep matching
+LEGACY_VERSION = '2.0'
+# Versions are stored in risk_predictions.model_version (VARCHAR(20))
+MAX_VERSION_LENGTH = 20
+# How often a worker re-reads ACTIVE to follow activations made by
+# another process (CLI, another gunicorn worker)
+POLL_SECONDS   = int(os.getenv('MODEL_REGISTRY_POLL_SECONDS', 30))
+
+# Active bundle store: {'bundle': ModelBundle, 'checked_at': float}
+_active      = {'bundle': None, 'checked_at': 0.0}
+_active_lock = threading.Lock()
+_load_lock   = threading.Lock()   # one artifact load at a time
+
+
+class RegistryError(Exception):
+    """Unknown version, missing artifact or checksum mismatch"""
+
+
+class VerificationError(RegistryError):
+    """Artifacts without a manifest checksum, or not matching it"""
+
+
+def _encoder_classes(label_encoders) -> dict:
+    """{feature: [classes]} from fitted LabelEncoders or plain vocabularies"""
+    return {
+        key: encoder.classes_.tolist() if hasattr(encoder, 'classes_') else list(encoder)
+        for key, encoder in (label_encoders or {}).items()
+    }
+
+
+class ArrayScaler:
+    """StandardScaler.transform rebuilt from the JSON sidecar"""
+
+    __slots__ = ('mean_', 'scale_')
+
+    def __init__(self, mean, scale):
+        self.mean_  = np.asarray(mean, dtype=float)
+        self.scale_ = np.asarray(scale, dtype=float)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=float) - self.mean_) / self.scale_
+
+
+class _LazyModel:
+    """
+    model.joblib, deserialized (and re-verified) on first attribute
+    access. Bundles scored from memory-mapped arrays only pay for a
+    private copy of the sklearn model when something asks for it.
+    """
+
+    __slots__ = ('path', 'digest', '_model', '_lock')
+
+    def __init__(self, path, digest: str):
+        self.path   = path
+        self.digest = digest
+        self._model = None
+        self._lock  = threading.Lock()
+
+    @property
+    def wrapped(self):
+        """The sklearn model itself"""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    if ModelRegistry._file_digest(self.path) != self.digest:
+                        raise RegistryError(f"Checksum mismatch for {self.path}")
+                    self._model = joblib.load(self.path)
+        return self._model
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+
+class ModelBundle:
+    """One loaded, read-only model version (never mutated after load)"""
+
+    __slots__ = ('version', 'model', 'predictor', 'scaler', 'encoder_classes',
+                 'metadata', 'encoder_lookups', 'checksum', 'artifact_format',
+                 'loaded_at')
+
+    def __init__(self, version, model, scaler, label_encoders, metadata, checksum,
+                 artifact_format='pickle', predictor=None):
+        self.version         = version
+        self.model           = model
+        # What to call predict_proba on: the numpy-compiled trees when
+        # the model supports it (given when loaded from saved arrays),
+        # else the model itself
+        self.predictor       = predictor or compile_model(model) or model
+        self.scaler          = scaler
+        self.metadata        = metadata or {}
+        self.checksum        = checksum
+        self.artifact_format = artifact_format
+        self.loaded_at       = datetime.utcnow()
+        self.encoder_classes = _encoder_classes(label_encoders)
+        # {feature: {category: code}}
+        self.encoder_lookups = {
+            key: {value: code for code, value in enumerate(classes)}
+            for key, classes in self.encoder_classes.items()
+        }
+
+    def to_dict(self):
+        return {
+            'version':      self.version,
+            'loaded':       self.model is not None,
+            'checksum':     self.checksum,
+            'format':       self.artifact_format,
+            'compiled':     self.predictor is not self.model,
+            'model_type':   self.metadata.get('model_type') or self.metadata.get('model_name'),
+            'trained_date': self.metadata.get('trained_date') or self.metadata.get('trained_on'),
+            'loaded_at':    self.loaded_at.isoformat(),
+        }
+
+
+class ModelRegistry:
+    """Versioned model artifacts and the process-wide active bundle"""
+
+    # ──────────────────────────────────────────
+    # ACTIVE BUNDLE
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def get_active() -> ModelBundle:
+        """
+        Bundle to predict with. Callers should fetch it once per request
+        and use it throughout so a concurrent swap can't mix versions.
+        """
+        bundle = _active['bundle']
+        if bundle is not None and time.monotonic() - _active['checked_at'] < POLL_SECONDS:
+            return bundle
+        return ModelRegistry._refresh()
+
+    @staticmethod
+    def _refresh() -> ModelBundle:
+        """Follow the ACTIVE pointer, loading the version it names if new"""
+        with _load_lock:
+            bundle  = _active['bundle']
+            version = ModelRegistry.active_version()
+            if bundle is None or bundle.version != version:
+                try:
+                    bundle = ModelRegistry.load(version)
+                except VerificationError as e:
+                    print(f"❌ Model version {version} failed verification: {e}")
+                    if bundle is None:
+                        # An operator problem: fail loudly rather than
+                        # quietly serving dummy predictions
+                        raise
+                except Exception as e:
+                    print(f"❌ Error loading model version {version}: {e}")
+                    if bundle is None:
+                        # Nothing to keep serving: fall back to dummy predictions
+                        bundle = ModelBundle(version, None, None, None, None, None)
+            with _active_lock:
+                _active['bundle']     = bundle
+                _active['checked_at'] = time.monotonic()
+            return bundle
+
+    @staticmethod
+    def activate(version: str) -> dict:
+        """
+        Load a version, verify it, then make it the active one for this
+        process and (via ACTIVE) for every other process on next poll
+        """
+        try:
+            with _load_lock:
+                bundle = ModelRegistry.load(version)
+                if bundle.model is None:
+                    return {'status': 'error', 'message': f"Version {version} has no model"}
+                ModelRegistry._write_active(version)
+                with _active_lock:
+                    previous              = _active['bundle']
+                    _active['bundle']     = bundle
+                    _active['checked_at'] = time.monotonic()
+
+            print(f"🔁 Model version {version} activated"
+                  f"{f' (was {previous.version})' if previous else ''}")
+            return {'status': 'success', 'data': bundle.to_dict()}
+
+        except RegistryError as e:
+            return {'status': 'error', 'message': str(e)}
+        except Exception as e:
+            print(f"❌ Model activate error: {e}")
+            return {'status': 'error', 'message': str(e)}
+
+    @staticmethod
+    def active_version() -> str:
+        """Version named by ACTIVE, or the legacy flat layout"""
+        if ACTIVE_FILE.exists():
+            version = ACTIVE_FILE.read_text().strip()
+            if version:
+                return version
+        return LEGACY_VERSION
+
+    @staticmethod
+    def _write_active(version: str):
+        tmp = ACTIVE_FILE.with_suffix('.tmp')
+        tmp.write_text(version + '\n')
+        os.replace(tmp, ACTIVE_FILE)
+
+    # ──────────────────────────────────────────
+    # ARTIFACTS
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def _version_dir(version: str):
+        if version == LEGACY_VERSION:
+            return REGISTRY_DIR
+        if not version or '/' in version or '\\' in version or version.startswith('.'):
+            raise RegistryError(f"Invalid model version: {version!r}")
+        return REGISTRY_DIR / version
+
+    @staticmethod
+    def _combined_checksum(file_hashes: dict) -> str:
+        payload = json.dumps(sorted(file_hashes.items()))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _file_digest(path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _check_digest(version: str, filename: str, digest: str, expected: dict):
+        """Every artifact must match a manifest entry; unlisted files are refused"""
+        if filename not in expected:
+            raise VerificationError(f"No manifest checksum for {version}/{filename}")
+        if expected[filename] != digest:
+            raise VerificationError(f"Checksum mismatch for {version}/{filename}")
+
+    @staticmethod
+    def _verified_digest(version: str, path, expected: dict) -> str:
+        digest = ModelRegistry._file_digest(path)
+        ModelRegistry._check_digest(version, path.name, digest, expected)
+        return digest
+
+    @staticmethod
+    def _read_manifest(directory) -> dict:
+        path = directory / MANIFEST_NAME
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    @staticmethod
+    def _write_manifest(directory, version: str, artifact_format: str,
+                        file_hashes: dict, metadata: dict):
+        manifest = {
+            'version':    version,
+            'format':     artifact_format,
+            'created_at': datetime.utcnow().isoformat(),
+            'files':      file_hashes,
+            'checksum':   ModelRegistry._combined_checksum(file_hashes),
+            'metadata':   {k: v for k, v in (metadata or {}).items()
+                           if isinstance(v, (str, int, float, bool))},
+        }
+        tmp = directory / f".{MANIFEST_NAME}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, directory / MANIFEST_NAME)
+
+    @staticmethod
+    def seal(version: str = LEGACY_VERSION) -> dict:
+        """
+        Record the checksums of a version that has no manifest (the flat
+        pre-registry layout, or a hand-copied directory) so load() will
+        accept it. Run by an operator after checking the files
+        (manage_models.py seal); never done implicitly on load.
+        """
+        try:
+            directory = ModelRegistry._version_dir(version)
+            if not ModelRegistry._has_artifacts(directory):
+                raise RegistryError(f"Model version {version} not found")
+            if (directory / MANIFEST_NAME).exists():
+                raise RegistryError(f"Model version {version} already has a manifest")
+
+            filenames = [*ARTIFACT_FILES.values(), *JOBLIB_FILES.values(),
+                         *COMPILED_FILES.values()]
+            file_hashes = {
+                filename: ModelRegistry._file_digest(directory / filename)
+                for filename in filenames if (directory / filename).exists()
+            }
+            ModelRegistry._write_manifest(
+                directory, version, ModelRegistry._artifact_format(directory),
+                file_hashes, None
+            )
+            print(f"🔏 Model version {version} sealed in {directory / MANIFEST_NAME}")
+            return {'status': 'success', 'version': version, 'files': file_hashes}
+        except RegistryError as e:
+            return {'status': 'error', 'message': str(e)}
+        except Exception as e:
+            print(f"❌ Model seal error: {e}")
+            return {'status': 'error', 'message': str(e)}
+
+    @staticmethod
+    def _has_artifacts(directory) -> bool:
+        return (directory / ARTIFACT_FILES['model']).exists() or \
+            (directory / JOBLIB_FILES['model']).exists()
+
+    @staticmethod
+    def _artifact_format(directory) -> str:
+        """joblib when a version has been written/converted to it"""
+        return 'joblib' if (directory / JOBLIB_FILES['model']).exists() else 'pickle'
+
+    @staticmethod
+    def load(version: str, artifact_format: str = None) -> ModelBundle:
+        """
+        Load and checksum-verify the artifacts of one version. Files
+        without a manifest entry are refused (VerificationError); a
+        version without a manifest has to be sealed first (seal()).
+        Args:
+            artifact_format: 'pickle' or 'joblib'; defaults to joblib when
+                             the version has it, else pickle
+        """
+        directory       = ModelRegistry._version_dir(version)
+        artifact_format = artifact_format or ModelRegistry._artifact_format(directory)
+        manifest        = ModelRegistry._read_manifest(directory)
+        if not manifest and ModelRegistry._has_artifacts(directory):
+            raise VerificationError(
+                f"Model version {version} has no manifest; check its files, then "
+                f"run: python backend/scripts/manage_models.py seal {version}"
+            )
+        expected        = manifest.get('files', {})
+
+        if artifact_format == 'joblib':
+            bundle = ModelRegistry._load_joblib(version, directory, expected)
+        elif artifact_format == 'pickle':
+            bundle = ModelRegistry._load_pickle(version, directory, expected)
+        else:
+            raise RegistryError(f"Unknown artifact format: {artifact_format}")
+
+        print(f"✅ Model version {version} loaded from {directory} "
+              f"({artifact_format}, sha256 {bundle.checksum[:12]})")
+        return bundle
+
+    @staticmethod
+    def _load_pickle(version: str, directory, expected: dict) -> ModelBundle:
+        if not (directory / ARTIFACT_FILES['model']).exists():
+            raise RegistryError(f"Model version {version} not found")
+
+        artifacts, file_hashes = {}, {}
+        for key, filename in ARTIFACT_FILES.items():
+            path = directory / filename
+            if not path.exists():
+                artifacts[key] = None
+                continue
+            raw    = path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            ModelRegistry._check_digest(version, filename, digest, expected)
+            file_hashes[filename] = digest
+            artifacts[key]        = pickle.loads(raw)
+
+        return ModelBundle(
+            version, artifacts['model'], artifacts['scaler'],
+            artifacts['label_encoders'], artifacts['metadata'],
+            ModelRegistry._combined_checksum(file_hashes), 'pickle'
+        )
+
+    @staticmethod
+    def _load_joblib(version: str, directory, expected: dict) -> ModelBundle:
+        model_path   = directory / JOBLIB_FILES['model']
+        sidecar_path = directory / JOBLIB_FILES['sidecar']
+        if not model_path.exists() or not sidecar_path.exists():
+            raise RegistryError(f"Model version {version} has no joblib artifacts")
+
+        sidecar  = json.loads(sidecar_path.read_text())
+        scaler   = sidecar.get('scaler')
+        compiled = sidecar.get('compiled')
+        paths    = [model_path, sidecar_path]
+        if compiled:
+            paths += [directory / filename for filename in COMPILED_FILES.values()]
+        file_hashes = {
+            path.name: ModelRegistry._verified_digest(version, path, expected)
+            for path in paths
+        }
+
+        if compiled and COMPILED_INFERENCE:
+            # Score from the mapped arrays; with mmap every batch size stays
+            # on them, since delegating would load a private sklearn copy
+            model     = _LazyModel(model_path, file_hashes[model_path.name])
+            predictor = CompiledGradientBoosting.from_arrays(
+                {field: np.load(directory / filename, mmap_mode=MMAP_MODE)
+                 for field, filename in COMPILED_FILES.items()},
+                compiled, model=model,
+                max_rows=None if MMAP_MODE else COMPILED_MAX_ROWS
+            )
+        else:
+            model, predictor = joblib.load(model_path), None
+
+        return ModelBundle(
+            version, model,
+            ArrayScaler(scaler['mean'], scaler['scale']) if scaler else None,
+            sidecar.get('encoders'),
+            sidecar.get('metadata'),
+            ModelRegistry._combined_checksum(file_hashes), 'joblib',
+            predictor=predictor
+        )
+
+    @staticmethod
+    def _scaler_state(scaler):
+        """mean/scale of a StandardScaler for the sidecar"""
+        if scaler is None:
+            return None
+        if not isinstance(scaler, ArrayScaler) and type(scaler).__name__ != 'StandardScaler':
+            raise RegistryError(
+                f"{type(scaler).__name__} can't be stored in the joblib format "
+                f"(StandardScaler only); use MODEL_ARTIFACT_FORMAT=pickle"
+            )
+        n_features = int(scaler.n_features_in_) if hasattr(scaler, 'n_features_in_') \
+            else len(scaler.scale_)
+        mean  = getattr(scaler, 'mean_', None)
+        scale = getattr(scaler, 'scale_', None)
+        return {
+            'mean':  np.zeros(n_features).tolist() if mean is None else np.asarray(mean).tolist(),
+            'scale': np.ones(n_features).tolist() if scale is None else np.asarray(scale).tolist(),
+        }
+
+    @staticmethod
+    def _write_joblib(directory, model, scaler, label_encoders, metadata) -> dict:
+        """
+        Write model.joblib + preprocessing.json, plus the compiled node
+        arrays when the model compiles (temp names, then renamed)
+        Returns: {filename: sha256}
+        """
+        try:
+            compiled = CompiledGradientBoosting.from_sklearn(model, max_rows=None)
+        except ValueError:
+            compiled = None
+        sidecar = {
+            'scaler':   ModelRegistry._scaler_state(scaler),
+            'encoders': _encoder_classes(label_encoders),
+            'metadata': metadata or {},
+            'compiled': compiled.params() if compiled else None,
+        }
+        model_tmp   = directory / f".{JOBLIB_FILES['model']}.tmp"
+        sidecar_tmp = directory / f".{JOBLIB_FILES['sidecar']}.tmp"
+        joblib.dump(model, model_tmp, compress=0)
+        sidecar_tmp.write_text(json.dumps(sidecar, indent=2, default=str))
+
+        written = [(model_tmp, JOBLIB_FILES['model']),
+                   (sidecar_tmp, JOBLIB_FILES['sidecar'])]
+        if compiled:
+            for field, array in compiled.to_arrays().items():
+                tmp = directory / f".{COMPILED_FILES[field]}.tmp"
+                with open(tmp, 'wb') as f:          # np.save(path) appends .npy
+                    np.save(f, np.ascontiguousarray(array))
+                written.append((tmp, COMPILED_FILES[field]))
+
+        file_hashes = {}
+        for tmp, filename in written:
+            os.replace(tmp, directory / filename)
+            file_hashes[filename] = ModelRegistry._file_digest(directory / filename)
+        return file_hashes
+
+    @staticmethod
+    def register(model, scaler=None, label_encoders=None, metadata=None,
+                 version: str = None, activate: bool = False,
+                 artifact_format: str = ARTIFACT_FORMAT) -> str:
+        """
+        Publish a new version directory (written to a temp dir, then
+        renamed into place) with its manifest
+        Returns: the version name
+        """
+        version = version or datetime.utcnow().strftime('v%Y%m%d_%H%M%S')
+        if len(version) > MAX_VERSION_LENGTH:
+            raise RegistryError(f"Version name longer than {MAX_VERSION_LENGTH} chars")
+        if artifact_format not in ARTIFACT_FORMATS:
+            raise RegistryError(f"Unknown artifact format: {artifact_format}")
+        directory = ModelRegistry._version_dir(version)
+        if directory == REGISTRY_DIR or directory.exists():
+            raise RegistryError(f"Model version {version} already exists")
+
+        metadata = dict(metadata or {})
+        metadata['version'] = version
+
+        tmp_dir = REGISTRY_DIR / f".{version}.tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        if artifact_format == 'joblib':
+            file_hashes = ModelRegistry._write_joblib(
+                tmp_dir, model, scaler, label_encoders, metadata
+            )
+        else:
+            artifacts = {
+                'model': model, 'scaler': scaler,
+                'label_encoders': label_encoders, 'metadata': metadata
+            }
+            file_hashes = {}
+            for key, filename in ARTIFACT_FILES.items():
+                if artifacts[key] is None:
+                    continue
+                raw = pickle.dumps(artifacts[key])
+                (tmp_dir / filename).write_bytes(raw)
+                file_hashes[filename] = hashlib.sha256(raw).hexdigest()
+
+        ModelRegistry._write_manifest(tmp_dir, version, artifact_format, file_hashes, metadata)
+        os.replace(tmp_dir, directory)
+        print(f"📦 Model version {version} registered in {directory} ({artifact_format})")
+
+        if activate:
+            result = ModelRegistry.activate(version)
+            if result['status'] != 'success':
+                raise RegistryError(result['message'])
+        return version
+
+    @staticmethod
+    def convert_to_joblib(version: str) -> dict:
+        """
+        Add joblib artifacts to an existing pickle version in place (same
+        version name, so stored predictions and fingerprints stay valid).
+        The pickle files are kept; load() prefers joblib from now on.
+        """
+        try:
+            directory = ModelRegistry._version_dir(version)
+            bundle    = ModelRegistry.load(version, artifact_format='pickle')
+            if bundle.model is None:
+                return {'status': 'error', 'message': f"Version {version} has no model"}
+
+            manifest    = ModelRegistry._read_manifest(directory)
+            file_hashes = dict(manifest.get('files', {}))
+            file_hashes.update(ModelRegistry._write_joblib(
+                directory, bundle.model, bundle.scaler,
+                bundle.encoder_classes, bundle.metadata
+            ))
+            ModelRegistry._write_manifest(
+                directory, version, 'joblib', file_hashes, bundle.metadata
+            )
+            print(f"📦 Model version {version} converted to joblib in {directory}")
+            return {'status': 'success', 'version': version, 'files': file_hashes}
+        except RegistryError as e:
+            return {'status': 'error', 'message': str(e)}
+        except Exception as e:
+            print(f"❌ Model convert error: {e}")
+            return {'status': 'error', 'message': str(e)}
+
+    @staticmethod
+    def list_versions() -> list:
+        """Registered versions (plus the legacy flat layout if present)"""
+        active   = ModelRegistry.active_version()
+        versions = []
+        if ModelRegistry._has_artifacts(REGISTRY_DIR):
+            versions.append({'version': LEGACY_VERSION, 'created_at': None,
+                             'checksum': None, 'metadata': {},
+                             'format': ModelRegistry._artifact_format(REGISTRY_DIR)})
+        if REGISTRY_DIR.exists():
+            for manifest_path in sorted(REGISTRY_DIR.glob(f"*/{MANIFEST_NAME}")):
+                if manifest_path.parent.name.startswith('.'):
+                    continue
+                manifest = json.loads(manifest_path.read_text())
+                versions.append({
+                    'version':    manifest_path.parent.name,
+                    'created_at': manifest.get('created_at'),
+                    'checksum':   manifest.get('checksum'),
+                    'metadata':   manifest.get('metadata', {}),
+                    'format':     manifest.get('format', 'pickle'),
+                })
+        for v in versions:
+            v['active'] = v['version'] == active
+        return versions
@@ -1,123 +1,114 @@
 """
 Model Service - Handles ML model loading and predictions
 """
-import pickle
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import sys
 
-# Add backend to path
+# Add backend and project root to path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
-from config.settings import (
-    MODEL_PATH, SCALER_PATH, ENCODERS_PATH, METADATA_PATH,
-    RISK_LABELS, FEATURE_NAMES
-)
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from config.settings import RISK_LABELS, FEATURE_NAMES
+from backend.services.model_registry import ModelRegistry
 
 
 class ModelService:
-    """Service for loading and using ML models"""
+    """Service for ML predictions on the registry's shared model"""
     
     def __init__(self):
-        self.model = None
-        self.scaler = None
-        self.encoders = None
-        self.metadata = None
         self.load_models()
+
+    @property
+    def bundle(self):
+        """Active model bundle (shared with PredictionService)"""
+        return ModelRegistry.get_active()
+
+    @property
+    def model(self):
+        return self.bundle.model
+
+    @property
+    def scaler(self):
+        return self.bundle.scaler
+
+    @property
+    def encoders(self):
+        return self.bundle.encoder_classes
+
+    @property
+    def metadata(self):
+        return self.bundle.metadata
     
     def load_models(self):
-        """Load all trained models and preprocessors"""
-        try:
-            print("\n" + "="*60)
-            print("LOADING ML MODELS")
-            print("="*60)
-            
-            # Load main model
-            with open(MODEL_PATH, 'rb') as f:
-                self.model = pickle.load(f)
-            print(f"✓ Loaded prediction model: {MODEL_PATH.name}")
-            
-            # Load scaler
-            with open(SCALER_PATH, 'rb') as f:
-                self.scaler = pickle.load(f)
-            print(f"✓ Loaded feature scaler: {SCALER_PATH.name}")
-            
-            # Load encoders
-            with open(ENCODERS_PATH, 'rb') as f:
-                self.encoders = pickle.load(f)
-            print(f"✓ Loaded label encoders: {ENCODERS_PATH.name}")
-            
-            # Load metadata
-            with open(METADATA_PATH, 'rb') as f:
-                self.metadata = pickle.load(f)
-            print(f"✓ Loaded model metadata: {METADATA_PATH.name}")
-            
-            print("\n" + "="*60)
-            print(f"MODEL INFO")
-            print("="*60)
-            print(f"  Model Type: {self.metadata.get('model_name', 'Unknown')}")
-            print(f"  Accuracy: {self.metadata.get('test_accuracy', 0)*100:.2f}%")
-            print(f"  Trained: {self.metadata.get('trained_date', 'Unknown')}")
-            print("="*60 + "\n")
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error loading models: {str(e)}")
-            raise
+        """Make sure the registry's active model is loaded"""
+        bundle = self.bundle
+        if bundle.model is None:
+            raise RuntimeError(f"No trained model available (version {bundle.version})")
+
+        print("\n" + "="*60)
+        print(f"MODEL INFO")
+        print("="*60)
+        print(f"  Version: {bundle.version}")
+        print(f"  Model Type: {bundle.metadata.get('model_name', 'Unknown')}")
+        print(f"  Accuracy: {bundle.metadata.get('test_accuracy', 0)*100:.2f}%")
+        print(f"  Trained: {bundle.metadata.get('trained_date', 'Unknown')}")
+        print("="*60 + "\n")
+        return True
     
-    def encode_features(self, student_data):
+    def _encode(self, key, value, bundle=None):
+        """Encode one categorical value via the precomputed lookup table"""
+        try:
+            return (bundle or self.bundle).encoder_lookups[key][value]
+        except KeyError:
+            raise ValueError(f"Unknown {key} value: '{value}'")
+
+    def encode_features(self, student_data, bundle=None):
         """Encode categorical features"""
         try:
-            # Encode gender
-            gender_enc = self.encoders['gender'].transform([student_data['gender']])[0]
-            
-            # Encode socioeconomic status
-            ses_enc = self.encoders['socioeconomic_status'].transform(
-                [student_data['socioeconomic_status']]
-            )[0]
-            
-            # Encode parent education
-            parent_enc = self.encoders['parent_education'].transform(
-                [student_data['parent_education']]
-            )[0]
+            gender_enc = self._encode('gender', student_data['gender'], bundle)
+            ses_enc = self._encode('socioeconomic_status', student_data['socioeconomic_status'], bundle)
+            parent_enc = self._encode('parent_education', student_data['parent_education'], bundle)
             
             return gender_enc, ses_enc, parent_enc
             
         except Exception as e:
             raise ValueError(f"Error encoding features: {str(e)}")
     
+    def _feature_row(self, student_data, bundle=None):
+        """Build one encoded feature row (dict in FEATURE_NAMES order)"""
+        # Encode categorical features
+        gender_enc, ses_enc, parent_enc = self.encode_features(student_data, bundle)
+        
+        # Calculate grade trend
+        grade_trend = student_data['current_gpa'] - student_data['previous_gpa']
+        
+        # Create feature dictionary in correct order
+        return {
+            'age': student_data['age'],
+            'gender_encoded': gender_enc,
+            'grade': student_data['grade'],
+            'socioeconomic_status_encoded': ses_enc,
+            'parent_education_encoded': parent_enc,
+            'current_gpa': student_data['current_gpa'],
+            'previous_gpa': student_data['previous_gpa'],
+            'grade_trend': grade_trend,
+            'attendance_percentage': student_data['attendance_percentage'],
+            'failed_subjects': student_data['failed_subjects'],
+            'assignment_submission_rate': student_data['assignment_submission_rate'],
+            'disciplinary_incidents': student_data['disciplinary_incidents'],
+            'counseling_visits': student_data.get('counseling_visits', 0),
+            'consecutive_absences': student_data.get('consecutive_absences', 0),
+            'late_arrivals': student_data.get('late_arrivals', 0),
+            'library_visits': student_data.get('library_visits', 0),
+            'extracurricular_participation': student_data.get('extracurricular_participation', 0)
+        }
+
     def prepare_features(self, student_data):
         """Prepare features for prediction"""
         try:
-            # Encode categorical features
-            gender_enc, ses_enc, parent_enc = self.encode_features(student_data)
-            
-            # Calculate grade trend
-            grade_trend = student_data['current_gpa'] - student_data['previous_gpa']
-            
-            # Create feature dictionary in correct order
-            features_dict = {
-                'age': student_data['age'],
-                'gender_encoded': gender_enc,
-                'grade': student_data['grade'],
-                'socioeconomic_status_encoded': ses_enc,
-                'parent_education_encoded': parent_enc,
-                'current_gpa': student_data['current_gpa'],
-                'previous_gpa': student_data['previous_gpa'],
-                'grade_trend': grade_trend,
-                'attendance_percentage': student_data['attendance_percentage'],
-                'failed_subjects': student_data['failed_subjects'],
-                'assignment_submission_rate': student_data['assignment_submission_rate'],
-                'disciplinary_incidents': student_data['disciplinary_incidents'],
-                'counseling_visits': student_data.get('counseling_visits', 0),
-                'consecutive_absences': student_data.get('consecutive_absences', 0),
-                'late_arrivals': student_data.get('late_arrivals', 0),
-                'library_visits': student_data.get('library_visits', 0),
-                'extracurricular_participation': student_data.get('extracurricular_participation', 0)
-            }
-            
             # Create DataFrame
-            features_df = pd.DataFrame([features_dict])
+            features_df = pd.DataFrame([self._feature_row(student_data)])
             
             return features_df
             
@@ -126,39 +117,70 @@ class ModelService:
     
     def predict_risk(self, student_data):
         """Make risk prediction for a student"""
-        try:
-            # Prepare features
-            features_df = self.prepare_features(student_data)
-            
-            # Scale features
-            features_scaled = self.scaler.transform(features_df)
-            
-            # Make prediction
-            prediction = self.model.predict(features_scaled)[0]
-            probabilities = self.model.predict_proba(features_scaled)[0]
-            
-            # Prepare result
-            result = {
-                'success': True,
-                'prediction': RISK_LABELS[prediction],
-                'risk_level': int(prediction),
-                'confidence': float(probabilities[prediction] * 100),
-                'probabilities': {
-                    'Low Risk': float(probabilities[0] * 100),
-                    'Medium Risk': float(probabilities[1] * 100),
-                    'High Risk': float(probabilities[2] * 100),
-                    'Critical Risk': float(probabilities[3] * 100)
-                },
-                'recommendations': self.get_recommendations(prediction)
-            }
-            
-            return result
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e)
-            }
+        return self.predict_risk_batch([student_data])[0]
+
+    def predict_risk_batch(self, students_data):
+        """
+        Make risk predictions for many students at once
+        Encodes every row, scales the whole matrix once and runs a single
+        predict_proba call; the label is the argmax of the probabilities.
+        Returns: list of result dicts in the same order as students_data
+        """
+        # One model version for the whole batch, even if a swap lands
+        bundle = self.bundle
+        results = [None] * len(students_data)
+        rows = []
+        row_index = []
+
+        # Encode rows individually so one bad row doesn't fail the batch
+        for idx, student_data in enumerate(students_data):
+            try:
+                rows.append(self._feature_row(student_data, bundle))
+                row_index.append(idx)
+            except Exception as e:
+                results[idx] = {
+                    'success': False,
+                    'error': f"Error preparing features: {str(e)}"
+                }
+
+        if rows:
+            try:
+                # Scale features
+                features_scaled = bundle.scaler.transform(pd.DataFrame(rows))
+                
+                # Make prediction
+                proba = bundle.predictor.predict_proba(features_scaled)
+                classes = np.asarray(bundle.predictor.classes_)
+                predictions = classes[proba.argmax(axis=1)]
+                
+                for pos, idx in enumerate(row_index):
+                    prediction = int(predictions[pos])
+                    probabilities = proba[pos]
+                    
+                    # Prepare result
+                    results[idx] = {
+                        'success': True,
+                        'prediction': RISK_LABELS[prediction],
+                        'risk_level': prediction,
+                        'model_version': bundle.version,
+                        'confidence': float(probabilities[prediction] * 100),
+                        'probabilities': {
+                            'Low Risk': float(probabilities[0] * 100),
+                            'Medium Risk': float(probabilities[1] * 100),
+                            'High Risk': float(probabilities[2] * 100),
+                            'Critical Risk': float(probabilities[3] * 100)
+                        },
+                        'recommendations': self.get_recommendations(prediction)
+                    }
+                    
+            except Exception as e:
+                for idx in row_index:
+                    results[idx] = {
+                        'success': False,
+                        'error': str(e)
+                    }
+        
+        return results
     
     def get_recommendations(self, risk_level):
         """Get intervention recommendations based on risk level"""
@@ -192,14 +214,17 @@ class ModelService:
     
     def get_model_info(self):
         """Get model metadata"""
-        if self.metadata:
+        bundle = self.bundle
+        if bundle.metadata:
             return {
-                'model_name': self.metadata.get('model_name', 'Unknown'),
-                'accuracy': f"{self.metadata.get('test_accuracy', 0)*100:.2f}%",
-                'precision': f"{self.metadata.get('precision', 0)*100:.2f}%",
-                'recall': f"{self.metadata.get('recall', 0)*100:.2f}%",
-                'f1_score': f"{self.metadata.get('f1_score', 0)*100:.2f}%",
-                'trained_date': self.metadata.get('trained_date', 'Unknown'),
+                'version': bundle.version,
+                'checksum': bundle.checksum,
+                'model_name': bundle.metadata.get('model_name', 'Unknown'),
+                'accuracy': f"{bundle.metadata.get('test_accuracy', 0)*100:.2f}%",
+                'precision': f"{bundle.metadata.get('precision', 0)*100:.2f}%",
+                'recall': f"{bundle.metadata.get('recall', 0)*100:.2f}%",
+                'f1_score': f"{bundle.metadata.get('f1_score', 0)*100:.2f}%",
+                'trained_date': bundle.metadata.get('trained_date', 'Unknown'),
                 'features_count': len(FEATURE_NAMES)
             }
         return {}
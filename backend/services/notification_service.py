@@ -11,6 +11,10 @@ Trigger Conditions:
 Auto-triggered when:
   - Academic record is created/updated
   - ML risk prediction is made
+
+Whole-school / class checks (e.g. after an exam upload) go through
+NotificationService.sweep(), which evaluates every rule for all students
+in a handful of aggregate queries instead of per-student lookups.
 """
 
 import sys
@@ -27,10 +31,13 @@ load_dotenv(dotenv_path=env_path)
 from backend.database.db_config import SessionLocal
 from backend.database.models import (
     Student, AcademicRecord, Attendance,
-    RiskPrediction, Notification
+    RiskPrediction, StudentLatestRisk, Notification
 )
-from backend.services.email_service import EmailService
-from sqlalchemy import func
+from backend.services.email_service import EmailService, EMAIL_USER
+from backend.services.outbox_service import OutboxService
+from backend.services.cooldown_cache import cooldown_cache
+from sqlalchemy import func, or_, and_, desc, case
+from sqlalchemy.orm import aliased
 
 # ── Thresholds ─────────────────────────────────────────────────────────────────
 GPA_THRESHOLD         = 50.0    # Below this → low_gpa alert
@@ -46,6 +53,11 @@ COOLDOWN_DAYS = {
     'failed_subjects': 14
 }
 
+# ── Sweep ──────────────────────────────────────────────────────────────────────
+SWEEP_RULES           = ('low_gpa', 'failed_subjects', 'low_attendance', 'high_risk')
+ATTENDANCE_DAYS       = 30      # Window for the low_attendance rule
+SWEEP_BATCH_SIZE      = 500     # Notifications queued per commit
+
 
 class NotificationService:
     """
@@ -53,24 +65,48 @@ class NotificationService:
     All trigger methods return a result dict.
     """
 
+    # ──────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def _alert_time():
+        """
+        When an alert counts for cooldown: sent_at once delivered,
+        created_at while it is still waiting in the outbox
+        """
+        return case(
+            (Notification.status == 'sent',   Notification.sent_at),
+            (Notification.status == 'queued', Notification.created_at),
+        )
+
+    @staticmethod
+    def _within_cooldown(notification_type: str, last_at, now: datetime = None) -> bool:
+        """True if an alert at last_at still blocks a new one of this type"""
+        if last_at is None:
+            return False
+        cooldown_days = COOLDOWN_DAYS.get(notification_type, 7)
+        return last_at >= (now or datetime.utcnow()) - timedelta(days=cooldown_days)
+
     # ──────────────────────────────────────────────────────────────────────────
     @staticmethod
     def _is_in_cooldown(db, student_id: int, notification_type: str) -> bool:
         """
         Check if a notification of this type was already sent recently.
         Prevents spamming parents with the same alert.
+        Alerts still waiting in the outbox count as sent.
+        The last alert time comes from cooldown_cache when it is fresh;
+        otherwise one index-only lookup on idx_notifications_cooldown.
         """
-        cooldown_days = COOLDOWN_DAYS.get(notification_type, 7)
-        cutoff        = datetime.utcnow() - timedelta(days=cooldown_days)
-
-        recent = db.query(Notification).filter(
-            Notification.student_id        == student_id,
-            Notification.notification_type == notification_type,
-            Notification.status            == 'sent',
-            Notification.sent_at           >= cutoff
-        ).first()
-
-        return recent is not None
+        hit, last_at = cooldown_cache.get(student_id, notification_type)
+        if not hit:
+            last_at = db.query(
+                func.max(NotificationService._alert_time())
+            ).filter(
+                Notification.student_id        == student_id,
+                Notification.notification_type == notification_type,
+                Notification.status.in_(['sent', 'queued'])
+            ).scalar()
+            cooldown_cache.put(student_id, notification_type, last_at)
+
+        return NotificationService._within_cooldown(notification_type, last_at)
 
     # ──────────────────────────────────────────────────────────────────────────
     @staticmethod
@@ -127,7 +163,47 @@ class NotificationService:
 
     # ──────────────────────────────────────────────────────────────────────────
     @staticmethod
-    def _send_and_update(
+    def _queue(
+        db,
+        notification      : Notification,
+        student           : Student,
+        notification_type : str,
+        trigger_reason    : str,
+        details           : dict
+    ):
+        """
+        Render the email, put it in the outbox and mark the notification
+        queued inside the caller's transaction (nothing is committed here).
+        """
+        email = EmailService.render_parent_notification(
+            parent_name      = student.parent_name or "Parent/Guardian",
+            student_name     = f"{student.first_name} {student.last_name}",
+            student_grade    = student.grade,
+            student_section  = student.section,
+            notification_type= notification_type,
+            trigger_reason   = trigger_reason,
+            details          = details
+        )
+        _, message = EmailService.build_message(
+            student.parent_email, email['subject'],
+            email['text_body'], email['html_body']
+        )
+        OutboxService.enqueue(
+            db,
+            source_type = 'notification',
+            source_id   = notification.id,
+            from_addr   = EMAIL_USER,
+            to_email    = student.parent_email,
+            message     = message,
+            subject     = email['subject']
+        )
+
+        notification.status  = 'queued'
+        notification.message = trigger_reason
+
+    # ──────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def _queue_and_update(
         db,
         notification      : Notification,
         student           : Student,
@@ -136,59 +212,122 @@ class NotificationService:
         details           : dict
     ) -> dict:
         """
-        Send email and update notification status in DB.
+        Queue the notification email and commit. The outbox worker sends
+        it and moves the notification to sent / failed.
         Returns result dict.
         """
         try:
-            email_result = EmailService.send_parent_notification(
-                to_email         = student.parent_email,
-                parent_name      = student.parent_name or "Parent/Guardian",
-                student_name     = f"{student.first_name} {student.last_name}",
-                student_grade    = student.grade,
-                student_section  = student.section,
-                notification_type= notification_type,
-                trigger_reason   = trigger_reason,
-                details          = details
+            NotificationService._queue(
+                db, notification, student, notification_type, trigger_reason, details
             )
+            db.commit()
+            OutboxService.wake()
+            cooldown_cache.record(student.id, notification_type, notification.created_at)
 
-            if email_result['status'] == 'sent':
-                notification.status  = 'sent'
-                notification.sent_at = datetime.utcnow()
-                notification.message = trigger_reason
-                db.commit()
-
-                print(f"✅ Notification sent: {notification_type} → "
-                      f"{student.first_name} {student.last_name} "
-                      f"→ {student.parent_email}")
-
-                return {
-                    'status'           : 'sent',
-                    'notification_id'  : notification.id,
-                    'notification_type': notification_type,
-                    'sent_to'          : student.parent_email,
-                    'student'          : f"{student.first_name} {student.last_name}"
-                }
-            else:
-                notification.status        = 'failed'
-                notification.error_message = email_result['message']
-                db.commit()
-
-                print(f"❌ Notification failed: {notification_type} → "
-                      f"{student.first_name} {student.last_name}: "
-                      f"{email_result['message']}")
+            print(f"📮 Notification queued: {notification_type} → "
+                  f"{student.first_name} {student.last_name} "
+                  f"→ {student.parent_email}")
 
-                return {
-                    'status' : 'failed',
-                    'message': email_result['message']
-                }
+            return {
+                'status'           : 'queued',
+                'notification_id'  : notification.id,
+                'notification_type': notification_type,
+                'sent_to'          : student.parent_email,
+                'student'          : f"{student.first_name} {student.last_name}"
+            }
 
         except Exception as e:
-            notification.status        = 'failed'
-            notification.error_message = str(e)
-            db.commit()
+            db.rollback()
             print(f"❌ Notification exception: {e}")
             return {'status': 'failed', 'message': str(e)}
 
+    # ══════════════════════════════════════════════════════════════════════════
+    # ALERT CONTENT (shared by the per-student checks and the sweep)
+    # ══════════════════════════════════════════════════════════════════════════
+
+    @staticmethod
+    def _low_gpa_alert(student_name: str, academic: AcademicRecord) -> tuple:
+        """(reason, details) for a low_gpa alert"""
+        reason = (
+            f"{student_name}'s current GPA has dropped to "
+            f"{academic.current_gpa:.1f}% which is below the "
+            f"required threshold of {GPA_THRESHOLD}%."
+        )
+        details = {
+            'Current GPA'  : f"{academic.current_gpa:.1f}%",
+            'Previous GPA' : f"{academic.previous_gpa:.1f}%",
+            'Grade Trend'  : (
+                f"{'📈' if academic.grade_trend >= 0 else '📉'} "
+                f"{academic.grade_trend:+.1f}%"
+            ),
+            'Math Score'   : f"{academic.math_score:.1f}%",
+            'Science Score': f"{academic.science_score:.1f}%",
+            'English Score': f"{academic.english_score:.1f}%",
+        }
+        return reason, details
+
+    @staticmethod
+    def _failed_subjects_alert(student_name: str, academic: AcademicRecord) -> tuple:
+        """(reason, details) for a failed_subjects alert"""
+        failed = int(academic.failed_subjects or 0)
+        reason = (
+            f"{student_name} has failed {failed} subject(s) "
+            f"this semester. Immediate attention is required."
+        )
+        # Find which subjects failed
+        failed_list = []
+        subject_scores = {
+            'Math'    : academic.math_score,
+            'Science' : academic.science_score,
+            'English' : academic.english_score,
+            'Social'  : academic.social_score,
+            'Language': academic.language_score,
+        }
+        for subj, score in subject_scores.items():
+            if score is not None and float(score) < 35:
+                failed_list.append(f"{subj} ({score:.1f}%)")
+
+        details = {
+            'Failed Subjects' : ', '.join(failed_list) or f"{failed} subjects",
+            'Total Subjects'  : str(academic.total_subjects or 5),
+            'Current GPA'     : f"{academic.current_gpa:.1f}%",
+            'Submission Rate' : f"{academic.assignment_submission_rate:.1f}%",
+        }
+        return reason, details
+
+    @staticmethod
+    def _low_attendance_alert(student_name: str, attendance_rate: float) -> tuple:
+        """(reason, details) for a low_attendance alert"""
+        reason = (
+            f"{student_name}'s attendance has dropped to "
+            f"{attendance_rate:.1f}% in the last 30 days, "
+            f"which is below the required {ATTENDANCE_THRESHOLD}%."
+        )
+        details = {
+            'Attendance Rate' : f"{attendance_rate:.1f}%",
+            'Required Rate'   : f"{ATTENDANCE_THRESHOLD}%",
+            'Period'          : 'Last 30 days',
+            'Status'          : '⚠️ Below minimum requirement'
+        }
+        return reason, details
+
+    @staticmethod
+    def _high_risk_alert(student_name: str, risk_label: str, confidence) -> tuple:
+        """(reason, details) for a high_risk alert"""
+        risk_emoji = '🔴' if risk_label == 'Critical' else '🟠'
+        reason = (
+            f"{student_name} has been identified as {risk_emoji} "
+            f"{risk_label} Risk by our AI academic monitoring system. "
+            f"Immediate intervention is recommended."
+        )
+        details = {
+            'Risk Level'      : f"{risk_emoji} {risk_label}",
+            'Confidence'      : f"{float(confidence):.1f}%" if confidence is not None else 'N/A',
+            'Assessment Date' : datetime.utcnow().strftime('%d %b %Y'),
+            'Recommendation'  : 'Schedule parent-teacher meeting'
+        }
+        return reason, details
+
     # ══════════════════════════════════════════════════════════════════════════
     # PUBLIC TRIGGER METHODS
     # ══════════════════════════════════════════════════════════════════════════
@@ -235,27 +374,14 @@ class NotificationService:
                 if not NotificationService._is_in_cooldown(
                     db, student_id, 'low_gpa'
                 ):
-                    reason = (
-                        f"{student_name}'s current GPA has dropped to "
-                        f"{academic.current_gpa:.1f}% which is below the "
-                        f"required threshold of {GPA_THRESHOLD}%."
+                    reason, details = NotificationService._low_gpa_alert(
+                        student_name, academic
                     )
-                    details = {
-                        'Current GPA'  : f"{academic.current_gpa:.1f}%",
-                        'Previous GPA' : f"{academic.previous_gpa:.1f}%",
-                        'Grade Trend'  : (
-                            f"{'📈' if academic.grade_trend >= 0 else '📉'} "
-                            f"{academic.grade_trend:+.1f}%"
-                        ),
-                        'Math Score'   : f"{academic.math_score:.1f}%",
-                        'Science Score': f"{academic.science_score:.1f}%",
-                        'English Score': f"{academic.english_score:.1f}%",
-                    }
                     notif = NotificationService._create_notification_record(
                         db, student, 'low_gpa', reason, reason,
                         academic_record_id=academic.id
                     )
-                    result = NotificationService._send_and_update(
+                    result = NotificationService._queue_and_update(
                         db, notif, student, 'low_gpa', reason, details
                     )
                     results.append(result)
@@ -268,34 +394,14 @@ class NotificationService:
                 if not NotificationService._is_in_cooldown(
                     db, student_id, 'failed_subjects'
                 ):
-                    reason = (
-                        f"{student_name} has failed {failed} subject(s) "
-                        f"this semester. Immediate attention is required."
+                    reason, details = NotificationService._failed_subjects_alert(
+                        student_name, academic
                     )
-                    # Find which subjects failed
-                    failed_list = []
-                    subject_scores = {
-                        'Math'    : academic.math_score,
-                        'Science' : academic.science_score,
-                        'English' : academic.english_score,
-                        'Social'  : academic.social_score,
-                        'Language': academic.language_score,
-                    }
-                    for subj, score in subject_scores.items():
-                        if score is not None and float(score) < 35:
-                            failed_list.append(f"{subj} ({score:.1f}%)")
-
-                    details = {
-                        'Failed Subjects' : ', '.join(failed_list) or f"{failed} subjects",
-                        'Total Subjects'  : str(academic.total_subjects or 5),
-                        'Current GPA'     : f"{academic.current_gpa:.1f}%",
-                        'Submission Rate' : f"{academic.assignment_submission_rate:.1f}%",
-                    }
                     notif = NotificationService._create_notification_record(
                         db, student, 'failed_subjects', reason, reason,
                         academic_record_id=academic.id
                     )
-                    result = NotificationService._send_and_update(
+                    result = NotificationService._queue_and_update(
                         db, notif, student, 'failed_subjects', reason, details
                     )
                     results.append(result)
@@ -310,22 +416,14 @@ class NotificationService:
                 if not NotificationService._is_in_cooldown(
                     db, student_id, 'low_attendance'
                 ):
-                    reason = (
-                        f"{student_name}'s attendance has dropped to "
-                        f"{attendance_rate:.1f}% in the last 30 days, "
-                        f"which is below the required {ATTENDANCE_THRESHOLD}%."
+                    reason, details = NotificationService._low_attendance_alert(
+                        student_name, attendance_rate
                     )
-                    details = {
-                        'Attendance Rate' : f"{attendance_rate:.1f}%",
-                        'Required Rate'   : f"{ATTENDANCE_THRESHOLD}%",
-                        'Period'          : 'Last 30 days',
-                        'Status'          : '⚠️ Below minimum requirement'
-                    }
                     notif = NotificationService._create_notification_record(
                         db, student, 'low_attendance', reason, reason,
                         academic_record_id=academic.id
                     )
-                    result = NotificationService._send_and_update(
+                    result = NotificationService._queue_and_update(
                         db, notif, student, 'low_attendance', reason, details
                     )
                     results.append(result)
@@ -392,25 +490,16 @@ class NotificationService:
                 RiskPrediction.id == prediction_id
             ).first()
 
-            risk_emoji = '🔴' if risk_label == 'Critical' else '🟠'
-            reason = (
-                f"{student_name} has been identified as {risk_emoji} "
-                f"{risk_label} Risk by our AI academic monitoring system. "
-                f"Immediate intervention is recommended."
+            reason, details = NotificationService._high_risk_alert(
+                student_name, risk_label,
+                prediction.confidence_score if prediction else None
             )
 
-            details = {
-                'Risk Level'      : f"{risk_emoji} {risk_label}",
-                'Confidence'      : f"{float(prediction.confidence_score):.1f}%" if prediction else 'N/A',
-                'Assessment Date' : datetime.utcnow().strftime('%d %b %Y'),
-                'Recommendation'  : 'Schedule parent-teacher meeting'
-            }
-
             notif = NotificationService._create_notification_record(
                 db, student, 'high_risk', reason, reason,
                 prediction_id=prediction_id
             )
-            return NotificationService._send_and_update(
+            return NotificationService._queue_and_update(
                 db, notif, student, 'high_risk', reason, details
             )
 
@@ -463,7 +552,7 @@ class NotificationService:
                 db, student, notification_type,
                 custom_message, custom_message
             )
-            return NotificationService._send_and_update(
+            return NotificationService._queue_and_update(
                 db, notif, student, notification_type, custom_message, details
             )
 
@@ -474,6 +563,258 @@ class NotificationService:
         finally:
             db.close()
 
+    # ══════════════════════════════════════════════════════════════════════════
+    # SWEEP (set-based evaluation for many students)
+    # ══════════════════════════════════════════════════════════════════════════
+
+    @staticmethod
+    def _scope_filters(grade=None, section=None, student_ids=None) -> list:
+        """Student filters shared by every sweep query"""
+        filters = [Student.is_active == True]
+        if grade:
+            filters.append(Student.grade == grade)
+        if section:
+            filters.append(Student.section == section)
+        if student_ids:
+            filters.append(Student.id.in_(student_ids))
+        return filters
+
+    @staticmethod
+    def _recent_alerts_subquery(db, now: datetime):
+        """
+        One row per student with an alert inside the longest cooldown
+        window, with the latest alert time per notification type (same
+        rule as _is_in_cooldown: sent_at once sent, created_at while
+        queued). LEFT JOINed by the trigger queries; students without a
+        row have no recent alerts at all.
+        """
+        oldest     = now - timedelta(days=max(COOLDOWN_DAYS.values()))
+        alert_time = NotificationService._alert_time()
+        columns    = [
+            func.max(alert_time).filter(
+                Notification.notification_type == notification_type
+            ).label(notification_type)
+            for notification_type in COOLDOWN_DAYS
+        ]
+
+        return db.query(
+            Notification.student_id.label('student_id'), *columns
+        ).filter(
+            Notification.notification_type.in_(list(COOLDOWN_DAYS)),
+            Notification.status.in_(['sent', 'queued']),
+            alert_time >= oldest
+        ).group_by(Notification.student_id).subquery('recent_alerts')
+
+    @staticmethod
+    def _academic_triggers(db, scope: list, recent, now: datetime, rules) -> list:
+        """
+        Students breaching low_gpa / failed_subjects / low_attendance,
+        from one query over the latest academic record (DISTINCT ON),
+        30-day attendance counts and the latest alert time per type.
+        """
+        in_scope = db.query(Student.id).filter(*scope)
+        latest = aliased(AcademicRecord, db.query(AcademicRecord).distinct(
+            AcademicRecord.student_id
+        ).filter(
+            AcademicRecord.student_id.in_(in_scope)
+        ).order_by(
+            AcademicRecord.student_id,
+            desc(AcademicRecord.recorded_date),
+            desc(AcademicRecord.id)
+        ).subquery('latest_academic'))
+
+        since = (now - timedelta(days=ATTENDANCE_DAYS)).date()
+        attendance = db.query(
+            Attendance.student_id.label('student_id'),
+            func.count(Attendance.id).label('total'),
+            func.count(Attendance.id).filter(
+                Attendance.status == 'present'
+            ).label('present')
+        ).filter(
+            Attendance.student_id.in_(in_scope),
+            Attendance.attendance_date >= since
+        ).group_by(Attendance.student_id).subquery('recent_attendance')
+
+        fires = {
+            'low_gpa'        : func.coalesce(latest.current_gpa, 0) < GPA_THRESHOLD,
+            'failed_subjects': func.coalesce(latest.failed_subjects, 0) >= FAILED_SUBJ_THRESHOLD,
+            'low_attendance' : and_(
+                attendance.c.total > 0,
+                attendance.c.present * 100.0 < ATTENDANCE_THRESHOLD * attendance.c.total
+            ),
+        }
+        fires = {rule: expr for rule, expr in fires.items() if rule in rules}
+        if not fires:
+            return []
+
+        return db.query(
+            Student, latest,
+            attendance.c.total, attendance.c.present,
+            *[expr.label(f"{rule}_fires") for rule, expr in fires.items()],
+            *[getattr(recent.c, rule).label(f"{rule}_last") for rule in fires]
+        ).join(
+            latest, latest.student_id == Student.id
+        ).outerjoin(
+            attendance, attendance.c.student_id == Student.id
+        ).outerjoin(
+            recent, recent.c.student_id == Student.id
+        ).filter(
+            *scope,
+            Student.parent_email.isnot(None),
+            Student.parent_email != '',
+            or_(*fires.values())
+        ).all()
+
+    @staticmethod
+    def _risk_triggers(db, scope: list, recent) -> list:
+        """Students whose latest prediction is High / Critical"""
+        return db.query(
+            Student, StudentLatestRisk,
+            recent.c.high_risk.label('high_risk_last')
+        ).join(
+            StudentLatestRisk, StudentLatestRisk.student_id == Student.id
+        ).outerjoin(
+            recent, recent.c.student_id == Student.id
+        ).filter(
+            *scope,
+            Student.parent_email.isnot(None),
+            Student.parent_email != '',
+            StudentLatestRisk.risk_label.in_(HIGH_RISK_LEVELS)
+        ).all()
+
+    # ──────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def sweep(
+        grade      : int  = None,
+        section    : str  = None,
+        student_ids: list = None,
+        rules      : list = None,
+        batch_size : int  = SWEEP_BATCH_SIZE
+    ) -> dict:
+        """
+        Evaluate notification rules for every active student in scope
+        (whole school, a grade, a class or an explicit id list) and queue
+        the alerts that are due.
+
+        Rules and cooldowns are evaluated in three queries regardless of
+        the number of students (scope counts, academic rules, risk rule;
+        the cooldown lookup is a LEFT JOIN inside the last two). Only triggered
+        students are loaded and handed to the outbox, batch_size per commit.
+
+        Args:
+            rules: subset of SWEEP_RULES (default: all)
+
+        Returns: summary dict (total_students, queued, failed, cooldown,
+                 no_trigger, skipped, by_type)
+        """
+        rules = [r for r in (rules or SWEEP_RULES) if r in SWEEP_RULES]
+        db    = SessionLocal()
+        now   = datetime.utcnow()
+
+        try:
+            scope  = NotificationService._scope_filters(grade, section, student_ids)
+            recent = NotificationService._recent_alerts_subquery(db, now)
+
+            counts = db.query(
+                func.count(Student.id).label('total'),
+                func.count(Student.id).filter(or_(
+                    Student.parent_email.is_(None), Student.parent_email == ''
+                )).label('no_email')
+            ).filter(*scope).one()
+
+            summary = {
+                'total_students': counts.total,
+                'queued'        : 0,
+                'failed'        : 0,
+                'cooldown'      : 0,
+                'no_trigger'    : 0,
+                'skipped'       : counts.no_email,
+                'by_type'       : {rule: 0 for rule in rules}
+            }
+
+            # ── Evaluate rules (set-based) ───────────────────────────────────
+            due       = []          # (student, type, reason, details, academic_id, prediction_id)
+            triggered = set()
+
+            for row in NotificationService._academic_triggers(db, scope, recent, now, rules):
+                student, academic = row[0], row[1]
+                name = f"{student.first_name} {student.last_name}"
+                triggered.add(student.id)
+                for rule in ('low_gpa', 'failed_subjects', 'low_attendance'):
+                    if rule not in rules or not getattr(row, f"{rule}_fires"):
+                        continue
+                    last_at = getattr(row, f"{rule}_last")
+                    cooldown_cache.put(student.id, rule, last_at)
+                    if NotificationService._within_cooldown(rule, last_at, now):
+                        summary['cooldown'] += 1
+                        continue
+                    if rule == 'low_gpa':
+                        reason, details = NotificationService._low_gpa_alert(name, academic)
+                    elif rule == 'failed_subjects':
+                        reason, details = NotificationService._failed_subjects_alert(name, academic)
+                    else:
+                        rate = round((row.present / row.total) * 100, 2)
+                        reason, details = NotificationService._low_attendance_alert(name, rate)
+                    due.append((student, rule, reason, details, academic.id, None))
+
+            if 'high_risk' in rules:
+                for student, latest_risk, last_at in NotificationService._risk_triggers(
+                    db, scope, recent
+                ):
+                    triggered.add(student.id)
+                    cooldown_cache.put(student.id, 'high_risk', last_at)
+                    if NotificationService._within_cooldown('high_risk', last_at, now):
+                        summary['cooldown'] += 1
+                        continue
+                    reason, details = NotificationService._high_risk_alert(
+                        f"{student.first_name} {student.last_name}",
+                        latest_risk.risk_label, latest_risk.confidence_score
+                    )
+                    due.append((student, 'high_risk', reason, details,
+                                None, latest_risk.prediction_id))
+
+            summary['no_trigger'] = counts.total - counts.no_email - len(triggered)
+            print(f"🔄 Notification sweep: {counts.total} students, "
+                  f"{len(due)} alerts due, {summary['cooldown']} in cooldown")
+
+            # ── Queue the due alerts ─────────────────────────────────────────
+            for start in range(0, len(due), batch_size):
+                queued = []
+                for student, rule, reason, details, academic_id, prediction_id in \
+                        due[start:start + batch_size]:
+                    savepoint = db.begin_nested()
+                    try:
+                        notif = NotificationService._create_notification_record(
+                            db, student, rule, reason, reason,
+                            academic_record_id=academic_id,
+                            prediction_id=prediction_id
+                        )
+                        NotificationService._queue(
+                            db, notif, student, rule, reason, details
+                        )
+                        savepoint.commit()
+                        queued.append((student.id, rule, notif.created_at))
+                        summary['queued']        += 1
+                        summary['by_type'][rule] += 1
+                    except Exception as e:
+                        savepoint.rollback()
+                        summary['failed'] += 1
+                        print(f"❌ Sweep {rule} failed for student {student.id}: {e}")
+                db.commit()
+                OutboxService.wake()
+                for student_id, rule, created_at in queued:
+                    cooldown_cache.record(student_id, rule, created_at)
+
+            print(f"✅ Notification sweep complete: {summary}")
+            return summary
+
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Notification sweep error: {e}")
+            return {'status': 'error', 'message': str(e)}
+        finally:
+            db.close()
+
     # ──────────────────────────────────────────────────────────────────────────
     @staticmethod
     def get_notification_stats() -> dict:
@@ -490,6 +831,9 @@ class NotificationService:
             failed = db.query(func.count(Notification.id)).filter(
                 Notification.status == 'failed'
             ).scalar() or 0
+            queued = db.query(func.count(Notification.id)).filter(
+                Notification.status == 'queued'
+            ).scalar() or 0
             today  = db.query(func.count(Notification.id)).filter(
                 Notification.sent_at >= datetime.utcnow().date()
             ).scalar() or 0
@@ -507,13 +851,14 @@ class NotificationService:
                 'total'      : total,
                 'sent'       : sent,
                 'failed'     : failed,
+                'queued'     : queued,
                 'today'      : today,
                 'by_type'    : type_counts
             }
 
         except Exception as e:
             print(f"❌ Stats error: {e}")
-            return {'total':0,'sent':0,'failed':0,'today':0,'by_type':{}}
+            return {'total':0,'sent':0,'failed':0,'queued':0,'today':0,'by_type':{}}
         finally:
             db.close()
 
@@ -0,0 +1,481 @@
+"""
+Outbox Service - Durable outbound email queue
+ScholarSense - AI-Powered Academic Intelligence System
+API requests only enqueue: the rendered message goes into email_outbox
+in the same transaction as its communication / notification row, and
+the request returns straight away. Workers (a thread in the API process
+and/or backend/scripts/outbox_worker.py) claim due rows with SKIP
+LOCKED, deliver them over the pooled SMTP connections, and move the
+source row from queued to sent or failed. Each message is settled (and
+committed) as soon as its send returns, and the batch's locks are kept
+fresh while it runs, so neither a slow server nor a crash mid-batch
+causes other messages to be sent twice:
+- transient failures (4xx, dropped connections, timeouts) are retried
+  with exponential backoff plus jitter, up to max_attempts
+- permanent failures (5xx, refused recipients) fail at once
+- each recipient domain has a token bucket, so a large batch to one
+  provider is spread out instead of tripping its rate limits
+- idempotency keys make re-submitting the same request a no-op
+"""
+
+import os
+import time
+import uuid
+import random
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from dotenv import load_dotenv
+
+from backend.database.models import EmailOutbox, Communication, Notification
+from backend.database.db_config import SessionLocal
+from backend.services.mail_delivery import MailDelivery, SMTP_POOL_SIZE
+from backend.services.cooldown_cache import cooldown_cache
+
+load_dotenv()
+
+# ============================================
+# CONSTANTS
+# ============================================
+EMAIL_HOST     = os.getenv('EMAIL_HOST',     'smtp.gmail.com')
+EMAIL_PORT     = int(os.getenv('EMAIL_PORT', 587))
+EMAIL_USER     = os.getenv('EMAIL_USER',     '')
+EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD', '')
+
+OUTBOX_ENABLED        = os.getenv('OUTBOX_WORKER_ENABLED', '1') == '1'
+OUTBOX_POLL_SECONDS   = int(os.getenv('OUTBOX_POLL_SECONDS', 5))
+OUTBOX_BATCH_SIZE     = int(os.getenv('OUTBOX_BATCH_SIZE', 100))
+# Messages delivered in parallel; more than SMTP_POOL_SIZE only queues
+# up behind the pool's connections
+OUTBOX_CONCURRENCY    = int(os.getenv('OUTBOX_CONCURRENCY', SMTP_POOL_SIZE))
+OUTBOX_MAX_ATTEMPTS   = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 6))
+# Retry n waits BACKOFF_BASE * 2^(n-1), capped, then jittered to 50-100%
+OUTBOX_BACKOFF_BASE   = int(os.getenv('OUTBOX_BACKOFF_BASE_SECONDS', 30))
+OUTBOX_BACKOFF_MAX    = int(os.getenv('OUTBOX_BACKOFF_MAX_SECONDS', 3600))
+# A 'sending' row whose lock hasn't been refreshed for this long belongs
+# to a worker that died; live workers refresh it every heartbeat
+OUTBOX_LOCK_TIMEOUT   = int(os.getenv('OUTBOX_LOCK_TIMEOUT_SECONDS', 600))
+OUTBOX_HEARTBEAT      = max(1, OUTBOX_LOCK_TIMEOUT // 4)
+# Per recipient domain, per worker process: "gmail.com=20,yahoo.com=20"
+OUTBOX_DOMAIN_RATE    = int(os.getenv('OUTBOX_DOMAIN_RATE_PER_MINUTE', 60))
+OUTBOX_DOMAIN_LIMITS  = os.getenv('OUTBOX_DOMAIN_LIMITS', '')
+
+SOURCE_MODELS = {
+    'communication': Communication,
+    'notification':  Notification,
+}
+ERROR_MAX_LENGTH = 1000
+
+_worker = None
+_wake   = threading.Event()
+
+
+def parse_domain_limits(spec: str) -> dict:
+    """'gmail.com=20, yahoo.com=30' → {'gmail.com': 20, 'yahoo.com': 30}"""
+    limits = {}
+    for item in spec.split(','):
+        domain, _, rate = item.partition('=')
+        if domain.strip() and rate.strip():
+            limits[domain.strip().lower()] = int(rate)
+    return limits
+
+
+class DomainRateLimiter:
+    """Token bucket per recipient domain (messages per minute)"""
+
+    def __init__(self, default_per_minute=OUTBOX_DOMAIN_RATE, overrides=None):
+        self.default   = default_per_minute
+        self.overrides = overrides or {}
+        self._buckets  = {}                     # domain → [tokens, last_refill]
+        self._lock     = threading.Lock()
+
+    def rate(self, domain: str) -> int:
+        return self.overrides.get(domain, self.default)
+
+    def acquire(self, domain: str) -> float:
+        """
+        Take one token for domain
+        Returns: 0 if the message may go now, else seconds until a token frees up
+        """
+        per_minute = self.rate(domain)
+        if per_minute <= 0:
+            return 0.0                          # unlimited
+        per_second = per_minute / 60
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(domain, (per_minute, now))
+            tokens = min(per_minute, tokens + (now - last) * per_second)
+            if tokens >= 1:
+                self._buckets[domain] = (tokens - 1, now)
+                return 0.0
+            self._buckets[domain] = (tokens, now)
+            return (1 - tokens) / per_second
+
+
+_limiter = DomainRateLimiter(OUTBOX_DOMAIN_RATE, parse_domain_limits(OUTBOX_DOMAIN_LIMITS))
+
+
+class OutboxService:
+    """Enqueue outbound email and deliver it in the background"""
+
+    # ──────────────────────────────────────────
+    # ENQUEUE
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def enqueue(db, source_type: str, source_id, from_addr: str, to_email: str,
+                message: str, subject: str = None, idempotency_key: str = None,
+                max_attempts: int = OUTBOX_MAX_ATTEMPTS):
+        """
+        Queue one rendered message inside the caller's transaction
+        (nothing is committed here; call wake() after the commit)
+        Returns: the outbox id, or None if idempotency_key was already used
+        """
+        key  = idempotency_key or f"{source_type}:{source_id}"
+        stmt = pg_insert(EmailOutbox.__table__).values(
+            idempotency_key = key,
+            source_type     = source_type,
+            source_id       = source_id,
+            from_addr       = from_addr,
+            to_email        = to_email,
+            to_domain       = to_email.rsplit('@', 1)[-1].strip().lower(),
+            subject         = subject[:500] if subject else None,
+            message         = message,
+            status          = 'queued',
+            attempts        = 0,
+            max_attempts    = max_attempts,
+            next_attempt_at = datetime.utcnow(),
+            created_at      = datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=['idempotency_key'])
+        return db.execute(stmt.returning(EmailOutbox.__table__.c.id)).scalar()
+
+    @staticmethod
+    def find(db, idempotency_key: str):
+        """The outbox row for an idempotency key, or None"""
+        return db.query(EmailOutbox).filter(
+            EmailOutbox.idempotency_key == idempotency_key
+        ).first()
+
+    @staticmethod
+    def wake():
+        """Tell this process's worker there is new mail (after commit)"""
+        _wake.set()
+
+    # ──────────────────────────────────────────
+    # CLAIM
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def _release_stale(db):
+        """Put rows locked by a worker that died back in the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=OUTBOX_LOCK_TIMEOUT)
+        return db.execute(
+            update(EmailOutbox).where(
+                EmailOutbox.status    == 'sending',
+                EmailOutbox.locked_at <  cutoff
+            ).values(status='queued', locked_at=None, locked_by=None,
+                     next_attempt_at=datetime.utcnow())
+        ).rowcount
+
+    @staticmethod
+    def _claim(db, limit: int, owner: str) -> list:
+        """
+        Atomically mark up to `limit` due rows as sending by `owner`
+        (attempts + 1). SKIP LOCKED lets any number of workers drain the
+        queue without overlap.
+        """
+        now = datetime.utcnow()
+        due = select(EmailOutbox.id).where(
+            EmailOutbox.status          == 'queued',
+            EmailOutbox.next_attempt_at <= now
+        ).order_by(EmailOutbox.next_attempt_at).limit(limit).with_for_update(skip_locked=True)
+
+        return db.execute(
+            update(EmailOutbox).where(
+                EmailOutbox.id.in_(due.scalar_subquery())
+            ).values(
+                status='sending', locked_at=now, locked_by=owner,
+                attempts=EmailOutbox.attempts + 1
+            ).returning(
+                EmailOutbox.id, EmailOutbox.source_type, EmailOutbox.source_id,
+                EmailOutbox.from_addr, EmailOutbox.to_email, EmailOutbox.to_domain,
+                EmailOutbox.message, EmailOutbox.attempts, EmailOutbox.max_attempts
+            )
+        ).all()
+
+    # ──────────────────────────────────────────
+    # DELIVER
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def _is_transient(error) -> bool:
+        """True if sending the same message again later may succeed"""
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(400 <= code < 500 for code, _ in error.recipients.values())
+        if isinstance(error, smtplib.SMTPAuthenticationError):
+            return True                         # credentials can be fixed
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code < 500
+        return True                             # disconnects, timeouts, OSError
+
+    @staticmethod
+    def backoff_seconds(attempts: int) -> float:
+        """Delay before retry number `attempts` (full exponential, 50-100% jitter)"""
+        delay = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * 2 ** max(attempts - 1, 0))
+        return delay * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _settle_source(db, row, status: str, error: str = None):
+        """Mirror the delivery outcome onto the communication / notification"""
+        model = SOURCE_MODELS.get(row.source_type)
+        if model is None or row.source_id is None:
+            return
+        values = {'status': status, 'error_message': error}
+        if status == 'sent':
+            values['sent_at'] = datetime.utcnow()
+        stmt = update(model).where(model.id == row.source_id).values(**values)
+        if model is not Notification:
+            db.execute(stmt)
+            return
+
+        # Keep this process's cooldown cache in step with the notification
+        settled = db.execute(
+            stmt.returning(Notification.student_id, Notification.notification_type)
+        ).first()
+        if settled is None:
+            return
+        if status == 'sent':
+            cooldown_cache.record(settled.student_id, settled.notification_type,
+                                  values['sent_at'])
+        else:
+            cooldown_cache.invalidate(settled.student_id, settled.notification_type)
+
+    @staticmethod
+    def _heartbeat(owner: str, stop: threading.Event):
+        """Refresh locked_at on the owner's rows until stop is set"""
+        while not stop.wait(OUTBOX_HEARTBEAT):
+            db = SessionLocal()
+            try:
+                db.execute(update(EmailOutbox).where(
+                    EmailOutbox.status    == 'sending',
+                    EmailOutbox.locked_by == owner
+                ).values(locked_at=datetime.utcnow()))
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️ Outbox heartbeat error: {e}")
+            finally:
+                db.close()
+
+    @staticmethod
+    def _settle(row, owner: str, error) -> str:
+        """
+        Record one message's outcome in its own transaction
+        Returns: 'sent', 'retrying', 'failed' or 'lost' (lock taken over)
+        """
+        if error is None:
+            outcome, values = 'sent', {'status': 'sent', 'sent_at': datetime.utcnow(),
+                                       'last_error': None}
+        else:
+            message = f"{type(error).__name__}: {error}"[:ERROR_MAX_LENGTH]
+            if OutboxService._is_transient(error) and row.attempts < row.max_attempts:
+                retry_at = datetime.utcnow() + timedelta(
+                    seconds=OutboxService.backoff_seconds(row.attempts)
+                )
+                outcome, values = 'retrying', {'status': 'queued', 'last_error': message,
+                                               'next_attempt_at': retry_at}
+            else:
+                outcome, values = 'failed', {'status': 'failed', 'last_error': message}
+
+        db = SessionLocal()
+        try:
+            owned = db.execute(update(EmailOutbox).where(
+                EmailOutbox.id        == row.id,
+                EmailOutbox.status    == 'sending',
+                EmailOutbox.locked_by == owner
+            ).values(locked_at=None, locked_by=None, **values)).rowcount
+            if not owned:
+                db.rollback()
+                print(f"⚠️ Outbox: message {row.id} was re-queued by another worker "
+                      f"before it settled ({outcome})")
+                return 'lost'
+            if outcome != 'retrying':
+                OutboxService._settle_source(db, row, outcome, values['last_error'])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        if outcome == 'failed':
+            print(f"❌ Outbox: giving up on {row.to_email} after "
+                  f"{row.attempts} attempt(s): {values['last_error']}")
+        return outcome
+
+    @staticmethod
+    def process_pending(limit: int = OUTBOX_BATCH_SIZE,
+                        concurrency: int = OUTBOX_CONCURRENCY,
+                        limiter: DomainRateLimiter = None) -> dict:
+        """
+        Claim and deliver one batch of due messages
+        Returns: {'status': 'success', 'claimed', 'sent', 'retrying',
+                  'failed', 'throttled'}
+        """
+        if not EMAIL_USER or not EMAIL_PASSWORD:
+            return {'status': 'error', 'message': 'Email credentials not configured'}
+        limiter = limiter or _limiter
+
+        owner = uuid.uuid4().hex
+        db = SessionLocal()
+        try:
+            released = OutboxService._release_stale(db)
+            rows     = OutboxService._claim(db, limit, owner)
+            db.commit()
+            if released:
+                print(f"📮 Outbox: re-queued {released} messages from a stopped worker")
+
+            now        = datetime.utcnow()
+            ready      = []
+            throttled  = []
+            for row in rows:
+                wait = limiter.acquire(row.to_domain)
+                (throttled if wait else ready).append((row, wait))
+
+            # Over the domain's rate: back in the queue, attempt not counted
+            for row, wait in throttled:
+                db.execute(update(EmailOutbox).where(EmailOutbox.id == row.id).values(
+                    status='queued', locked_at=None, locked_by=None,
+                    attempts=EmailOutbox.attempts - 1,
+                    next_attempt_at=now + timedelta(seconds=wait)
+                ))
+            db.commit()
+
+            pool = MailDelivery.pool(EMAIL_HOST, EMAIL_PORT, EMAIL_USER, EMAIL_PASSWORD)
+
+            def deliver(item):
+                row, _ = item
+                try:
+                    pool.send(row.from_addr, row.to_email, row.message)
+                    error = None
+                except Exception as e:
+                    error = e
+                try:
+                    return OutboxService._settle(row, owner, error)
+                except Exception as e:
+                    # Stays 'sending' and is re-queued once its lock expires
+                    print(f"❌ Outbox: could not record the outcome of message {row.id}: {e}")
+                    return 'unsettled'
+
+            stop      = threading.Event()
+            heartbeat = threading.Thread(
+                target=OutboxService._heartbeat, args=(owner, stop),
+                name='outbox-heartbeat', daemon=True
+            )
+            heartbeat.start()
+            try:
+                with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                    outcomes = list(executor.map(deliver, ready))
+            finally:
+                stop.set()
+                heartbeat.join()
+
+            sent     = outcomes.count('sent')
+            retrying = outcomes.count('retrying')
+            failed   = outcomes.count('failed')
+
+            result = {
+                'status':    'success',
+                'claimed':   len(rows),
+                'sent':      sent,
+                'retrying':  retrying,
+                'failed':    failed,
+                'throttled': len(throttled)
+            }
+            if rows:
+                print(f"📮 Outbox: {sent} sent | {retrying} retrying | "
+                      f"{failed} failed | {len(throttled)} throttled")
+            return result
+
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Outbox error: {e}")
+            return {'status': 'error', 'message': str(e)}
+        finally:
+            db.close()
+
+    @staticmethod
+    def drain(limit: int = OUTBOX_BATCH_SIZE, concurrency: int = OUTBOX_CONCURRENCY) -> dict:
+        """Deliver batches until no due message is left"""
+        totals = {'claimed': 0, 'sent': 0, 'retrying': 0, 'failed': 0, 'throttled': 0}
+        while True:
+            result = OutboxService.process_pending(limit, concurrency)
+            if result.get('status') != 'success':
+                return {**result, **totals}
+            for key in totals:
+                totals[key] += result[key]
+            # Only throttled rows left: they are due later, stop here
+            if result['claimed'] < limit or result['throttled'] == result['claimed']:
+                return {'status': 'success', **totals}
+
+    # ──────────────────────────────────────────
+    # MONITORING
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def get_stats() -> dict:
+        """Outbox counts by status, plus the oldest due message"""
+        db = SessionLocal()
+        try:
+            by_status = dict(db.query(
+                EmailOutbox.status, func.count(EmailOutbox.id)
+            ).group_by(EmailOutbox.status).all())
+            oldest = db.query(func.min(EmailOutbox.next_attempt_at)).filter(
+                EmailOutbox.status == 'queued'
+            ).scalar()
+            return {
+                'status': 'success',
+                'data': {
+                    'by_status':     {s: by_status.get(s, 0)
+                                      for s in ('queued', 'sending', 'sent', 'failed')},
+                    'oldest_queued': oldest.isoformat() if oldest else None
+                }
+            }
+        except Exception as e:
+            print(f"❌ Outbox stats error: {e}")
+            return {'status': 'error', 'message': str(e)}
+        finally:
+            db.close()
+
+    # ──────────────────────────────────────────
+    # BACKGROUND WORKER
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def run_forever(concurrency: int = OUTBOX_CONCURRENCY,
+                    poll_seconds: int = OUTBOX_POLL_SECONDS):
+        """Drain the queue whenever woken, and at least every poll_seconds"""
+        while True:
+            _wake.wait(poll_seconds)
+            _wake.clear()
+            OutboxService.drain(concurrency=concurrency)
+
+    @staticmethod
+    def start_worker() -> bool:
+        """Start the delivery thread once per process"""
+        global _worker
+        if not OUTBOX_ENABLED or (_worker and _worker.is_alive()):
+            return False
+        if not EMAIL_USER or not EMAIL_PASSWORD:
+            print("⚠️ Outbox worker not started — email credentials not configured")
+            return False
+        _worker = threading.Thread(
+            target=OutboxService.run_forever, name='outbox-worker', daemon=True
+        )
+        _worker.start()
+        print(f"📮 Outbox worker started (concurrency {OUTBOX_CONCURRENCY}, "
+              f"polling every {OUTBOX_POLL_SECONDS}s)")
+        return True
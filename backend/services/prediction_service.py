@@ -1,329 +1,360 @@
-
-
 """
 Risk Prediction Service - ML Model Integration
 ScholarSense - AI-Powered Academic Intelligence System
 """
-import os
-import pickle
+import json
+import hashlib
 import numpy as np
 from datetime import datetime
-from backend.database.models import Student, AcademicRecord, RiskPrediction, Attendance, BehavioralIncident
+from backend.database.models import (
+    Student, AcademicRecord, RiskPrediction, StudentLatestRisk
+)
 from backend.database.db_config import get_db
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from backend.database.db_config import SessionLocal  # ← ADD THIS
+from backend.services.analytics_service import AnalyticsService
+from backend.services.rescore_service import RescoreService
+from backend.services.model_registry import ModelRegistry
+from backend.services.feature_store import (
+    FeatureStore, FEATURE_NAMES, CATEGORICAL_FEATURES, FALLBACK_ENCODINGS
+)
 
 class PredictionService:
     """Handle ML-based risk predictions"""
     
-    # Model paths
-    MODEL_DIR = 'models/saved_models'
-    MODEL_PATH = os.path.join(MODEL_DIR, 'best_model.pkl')
-    SCALER_PATH = os.path.join(MODEL_DIR, 'scaler.pkl')
-    ENCODER_PATH = os.path.join(MODEL_DIR, 'label_encoders.pkl')
-    METADATA_PATH = os.path.join(MODEL_DIR, 'model_metadata.pkl')
-    
-    # Model components
-    model = None
-    scaler = None
-    label_encoders = None
-    metadata = None
-    
-    @classmethod
-    def load_model(cls):
-        """Load the trained ML model and preprocessing components"""
-        try:
-            # Load main model
-            if os.path.exists(cls.MODEL_PATH):
-                with open(cls.MODEL_PATH, 'rb') as f:
-                    cls.model = pickle.load(f)
-                print(f"✅ ML Model loaded from {cls.MODEL_PATH}")
-            else:
-                print(f"⚠️  ML Model not found at {cls.MODEL_PATH}")
-                print(f"   Using dummy predictions")
-                return False
-            
-            # Load scaler (if exists)
-            if os.path.exists(cls.SCALER_PATH):
-                with open(cls.SCALER_PATH, 'rb') as f:
-                    cls.scaler = pickle.load(f)
-                print(f"✅ Scaler loaded from {cls.SCALER_PATH}")
-            
-            # Load label encoders (if exists)
-            if os.path.exists(cls.ENCODER_PATH):
-                with open(cls.ENCODER_PATH, 'rb') as f:
-                    cls.label_encoders = pickle.load(f)
-                print(f"✅ Label encoders loaded from {cls.ENCODER_PATH}")
-            
-            # Load metadata (if exists)
-            if os.path.exists(cls.METADATA_PATH):
-                with open(cls.METADATA_PATH, 'rb') as f:
-                    cls.metadata = pickle.load(f)
-                print(f"✅ Metadata loaded from {cls.METADATA_PATH}")
-                if 'feature_names' in cls.metadata:
-                    print(f"   Expected features: {cls.metadata['feature_names']}")
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error loading model: {e}")
-            return False
+    # Merged {feature: {category: code}} tables, cached per model bundle
+    _lookup_cache = (None, None)
+
+    # Default feature order (defined in the feature store, shared with training)
+    DEFAULT_FEATURE_ORDER = FEATURE_NAMES
+
+    # Rows per multi-row INSERT when saving batch predictions
+    BULK_INSERT_CHUNK_SIZE = 1000
     
+    @staticmethod
+    def load_model():
+        """Make sure the active registry version is loaded in this process"""
+        return ModelRegistry.get_active().model is not None
+
     @staticmethod
     def prepare_features(student_id: int):
         """
         Prepare features for ML model from database
         Returns: dict with all required features
         """
-        db = SessionLocal()
-        try:
-            # Get student
-            student = db.query(Student).filter(Student.id == student_id).first()
-            if not student:
-                return {'error': 'Student not found'}
-            
-            # Get latest academic record
-            academic = db.query(AcademicRecord).filter(
-                AcademicRecord.student_id == student_id
-            ).order_by(desc(AcademicRecord.recorded_date)).first()
-            
-            if not academic:
-                return {'error': 'No academic records found for this student'}
-            
-            # Get attendance stats (last 30 days)
-            from datetime import date, timedelta
-            thirty_days_ago = date.today() - timedelta(days=30)
-            
-            total_days = db.query(func.count(Attendance.id)).filter(
-                Attendance.student_id == student_id,
-                Attendance.attendance_date >= thirty_days_ago
-            ).scalar() or 0
-            
-            present_days = db.query(func.count(Attendance.id)).filter(
-                Attendance.student_id == student_id,
-                Attendance.attendance_date >= thirty_days_ago,
-                Attendance.status == 'present'
-            ).scalar() or 0
-            
-            attendance_rate = (present_days / total_days * 100) if total_days > 0 else 95.0
-            
-            # Get behavioral incidents (last 90 days)
-            ninety_days_ago = date.today() - timedelta(days=90)
-            incident_count = db.query(func.count(BehavioralIncident.id)).filter(
-                BehavioralIncident.student_id == student_id,
-                BehavioralIncident.incident_date >= ninety_days_ago
-            ).scalar() or 0
-            
-            # Prepare features dictionary (matching your model's expected features)
-            features = {
-                'student_id': student.student_id,
-                'age': student.computed_age or 15,
-                'grade': student.grade,
-                'gender': student.gender,  # Will be encoded if needed
-                'socioeconomic_status': student.socioeconomic_status or 'Medium',
-                'parent_education': student.parent_education or 'High School',
-                'current_gpa': float(academic.current_gpa) if academic.current_gpa else 75.0,
-                'previous_gpa': float(academic.previous_gpa) if academic.previous_gpa else 75.0,
-                'grade_trend': float(academic.grade_trend) if academic.grade_trend else 0.0,
-                'attendance_rate': attendance_rate,
-                'failed_subjects': academic.failed_subjects or 0,
-                'assignment_submission_rate': float(academic.assignment_submission_rate) if academic.assignment_submission_rate else 90.0,
-                'behavioral_incidents': incident_count,
-                'math_score': float(academic.math_score) if academic.math_score else 75.0,
-                'science_score': float(academic.science_score) if academic.science_score else 75.0,
-                'english_score': float(academic.english_score) if academic.english_score else 75.0,
-                'social_score': float(academic.social_score) if academic.social_score else 75.0,
-                'language_score': float(academic.language_score) if academic.language_score else 75.0
-            }
-            
-            return features
-        finally:
-            db.close()
-    
+        return FeatureStore.features_for([student_id])[student_id]
+
+    @staticmethod
+    def prepare_features_bulk(student_ids: list, db=None, chunk_size: int = 1000):
+        """
+        Prepare features for many students with a few grouped queries
+        (one per table per chunk) instead of ~6 round trips per student.
+        Returns: dict {student_id: features} — same dicts as prepare_features,
+                 including {'error': ...} entries for missing students/records
+        """
+        return FeatureStore.features_for(student_ids, db=db, chunk_size=chunk_size)
+
+    @staticmethod
+    def _feature_order(bundle=None) -> list:
+        """Feature column order expected by the model"""
+        metadata = (bundle or ModelRegistry.get_active()).metadata
+        # Use metadata feature order if available
+        if metadata and 'feature_names' in metadata:
+            return metadata['feature_names']
+        return PredictionService.DEFAULT_FEATURE_ORDER
+
+    @classmethod
+    def _encoder_lookups(cls, bundle) -> dict:
+        """
+        {category: code} lookup tables for a bundle so batches are encoded
+        with dict lookups instead of one LabelEncoder.transform call per
+        value; built once per model version.
+        """
+        cached_bundle, lookups = cls._lookup_cache
+        if cached_bundle is bundle:
+            return lookups
+
+        lookups = {}
+        for key in CATEGORICAL_FEATURES:
+            lookup = dict(FALLBACK_ENCODINGS[key])
+            # Fitted classes win; unseen values fall back to the manual map
+            lookup.update(bundle.encoder_lookups.get(key, {}))
+            lookups[key] = lookup
+        cls._lookup_cache = (bundle, lookups)
+        return lookups
+
+    @staticmethod
+    def encode_and_scale_batch(features_list: list, bundle=None):
+        """
+        Apply label encoding and scaling to many feature dicts at once
+        Returns: 2-D numpy array (one row per feature dict) ready for the model
+        """
+        bundle        = bundle or ModelRegistry.get_active()
+        feature_order = PredictionService._feature_order(bundle)
+        lookups       = PredictionService._encoder_lookups(bundle)
+
+        feature_array = FeatureStore.encode_matrix(features_list, lookups, feature_order)
+
+        # Apply scaling once for the whole matrix
+        if bundle.scaler:
+            feature_array = bundle.scaler.transform(feature_array)
+
+        return feature_array
+
     @staticmethod
     def encode_and_scale_features(features: dict):
         """
         Apply label encoding and scaling to features
         Returns: numpy array ready for model prediction
         """
-        # Define feature order (adjust based on your model's training)
-        feature_order = [
-            'age', 'grade', 'gender', 'socioeconomic_status', 'parent_education',
-            'current_gpa', 'previous_gpa', 'grade_trend', 'attendance_rate',
-            'failed_subjects', 'assignment_submission_rate', 'behavioral_incidents',
-            'math_score', 'science_score', 'english_score', 'social_score', 'language_score'
+        return PredictionService.encode_and_scale_batch([features])
+
+    @staticmethod
+    def _model_version(bundle=None) -> str:
+        """Version string stored on prediction rows (the registry version)"""
+        bundle = bundle or ModelRegistry.get_active()
+        return bundle.version if bundle.model is not None else '1.0-dummy'
+
+    @staticmethod
+    def feature_fingerprint(features: dict, bundle=None) -> str:
+        """
+        Stable sha256 of the encoded feature vector and the model version
+        (plus the training timestamp, so a retrained model never matches)
+        """
+        bundle  = bundle or ModelRegistry.get_active()
+        lookups = PredictionService._encoder_lookups(bundle)
+        encode  = FeatureStore.encode_value
+        vector  = []
+        for feat in PredictionService._feature_order(bundle):
+            value = encode(feat, features.get(feat), lookups)
+            vector.append(round(value, 6) if isinstance(value, float) else value)
+        trained = bundle.metadata.get('trained_date')
+        payload = json.dumps(
+            [PredictionService._model_version(bundle), str(trained), vector], default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _confirm_unchanged(db, fingerprints: dict, bundle=None) -> dict:
+        """
+        Find students whose latest prediction has the same fingerprint and
+        model version, and bump its last_confirmed_at instead of re-scoring
+        Args:
+            fingerprints: {student_id: feature_hash}
+        Returns: {student_id: prediction dict} for the confirmed students
+                 (not committed — caller owns the transaction)
+        """
+        if not fingerprints:
+            return {}
+
+        latest_rows = db.query(StudentLatestRisk).filter(
+            StudentLatestRisk.student_id.in_(list(fingerprints)),
+            StudentLatestRisk.model_version == PredictionService._model_version(bundle)
+        ).all()
+        unchanged = [
+            row for row in latest_rows
+            if row.feature_hash and row.feature_hash == fingerprints[row.student_id]
         ]
-        
-        # Use metadata feature order if available
-        if PredictionService.metadata and 'feature_names' in PredictionService.metadata:
-            feature_order = PredictionService.metadata['feature_names']
-        
-        # Encode categorical variables
-        encoded_features = {}
-        for key, value in features.items():
-            if key in ['gender', 'socioeconomic_status', 'parent_education']:
-                # Use label encoders if available
-                if PredictionService.label_encoders and key in PredictionService.label_encoders:
-                    try:
-                        encoded_features[key] = PredictionService.label_encoders[key].transform([value])[0]
-                    except:
-                        # Fallback manual encoding
-                        if key == 'gender':
-                            encoded_features[key] = 1 if value == 'Male' else 0
-                        elif key == 'socioeconomic_status':
-                            encoded_features[key] = {'Low': 0, 'Medium': 1, 'High': 2}.get(value, 1)
-                        elif key == 'parent_education':
-                            encoded_features[key] = {'None': 0, 'High School': 1, 'Graduate': 2, 'Post-Graduate': 3}.get(value, 1)
-                else:
-                    # Manual encoding
-                    if key == 'gender':
-                        encoded_features[key] = 1 if value == 'Male' else 0
-                    elif key == 'socioeconomic_status':
-                        encoded_features[key] = {'Low': 0, 'Medium': 1, 'High': 2}.get(value, 1)
-                    elif key == 'parent_education':
-                        encoded_features[key] = {'None': 0, 'High School': 1, 'Graduate': 2, 'Post-Graduate': 3}.get(value, 1)
-            else:
-                encoded_features[key] = value
-        
-        # Create feature array in correct order
-        feature_array = np.array([[encoded_features[feat] for feat in feature_order]])
-        
-        # Apply scaling if scaler exists
-        if PredictionService.scaler:
-            feature_array = PredictionService.scaler.transform(feature_array)
-        
-        return feature_array
-    
+        if not unchanged:
+            return {}
+
+        now = datetime.utcnow()
+        db.query(RiskPrediction).filter(
+            RiskPrediction.id.in_([row.prediction_id for row in unchanged])
+        ).update({'last_confirmed_at': now}, synchronize_session=False)
+        for row in unchanged:
+            row.last_confirmed_at = now
+        db.flush()
+
+        return {row.student_id: row.to_dict() for row in unchanged}
+
+    @staticmethod
+    def predict_batch(features_list: list, bundle=None) -> list:
+        """
+        Score many feature dicts with a single predict_proba call
+        Returns: list of (risk_level, [p_low, p_medium, p_high, p_critical])
+                 in the same order as features_list
+        """
+        if not features_list:
+            return []
+
+        bundle = bundle or ModelRegistry.get_active()
+        model  = bundle.predictor
+        if model is None:
+            return [PredictionService._dummy_prediction(f) for f in features_list]
+
+        feature_array = PredictionService.encode_and_scale_batch(features_list, bundle)
+        n_rows        = feature_array.shape[0]
+        probabilities = np.zeros((n_rows, 4))
+
+        if hasattr(model, 'predict_proba'):
+            proba   = model.predict_proba(feature_array)
+            classes = getattr(model, 'classes_', np.arange(proba.shape[1]))
+            # Align probability columns with risk levels 0-3
+            for col, cls in enumerate(classes):
+                probabilities[:, int(cls)] = proba[:, col]
+            risk_levels = np.asarray(classes)[proba.argmax(axis=1)].astype(int)
+        else:
+            # If model doesn't support predict_proba, create one-hot
+            risk_levels = np.asarray(model.predict(feature_array)).astype(int)
+            probabilities[np.arange(n_rows), risk_levels] = 1.0
+
+        return [
+            (int(level), probabilities[i].tolist())
+            for i, level in enumerate(risk_levels)
+        ]
+
     @staticmethod
-    def make_prediction(student_id: int, predicted_by: int = None):
+    def _dummy_prediction(features: dict):
+        """
+        Rule-based fallback used when no trained model is loaded
+        Returns: (risk_level, probabilities)
+        """
+        risk_level = 0  # Start with Low
+
+        # GPA factor (most important)
+        gpa = features.get('current_gpa', 0)
+        if gpa < 40:
+            risk_level = 3  # Critical
+        elif gpa < 50:
+            risk_level = 2  # High
+        elif gpa < 65:
+            risk_level = 1  # Medium
+
+        # Grade trend factor (declining trend increases risk)
+        grade_trend = features.get('grade_trend', 0)
+        if grade_trend < -5:
+            risk_level = min(3, risk_level + 2)  # Significant decline
+        elif grade_trend < 0:
+            risk_level = min(3, risk_level + 1)  # Slight decline
+
+        # Attendance factor (poor attendance increases risk)
+        attendance_rate = features.get('attendance_rate', 100)
+        if attendance_rate < 60:
+            risk_level = min(3, risk_level + 2)  # Very low attendance
+        elif attendance_rate < 75:
+            risk_level = min(3, risk_level + 1)  # Low attendance
+
+        # Failed subjects factor
+        failed_subjects = features.get('failed_subjects', 0)
+        if failed_subjects >= 3:
+            risk_level = min(3, risk_level + 2)  # Multiple failures
+        elif failed_subjects >= 1:
+            risk_level = min(3, risk_level + 1)  # Some failures
+
+        # Behavioral incidents
+        behavioral_incidents = features.get('behavioral_incidents', 0)
+        if behavioral_incidents >= 3:
+            risk_level = min(3, risk_level + 1)  # Behavioral issues
+
+        # Assignment submission rate (engagement indicator)
+        assignment_rate = features.get('assignment_submission_rate', 100)
+        if assignment_rate < 60:
+            risk_level = min(3, risk_level + 1)  # Poor engagement
+
+        # Cap risk level at 3 (Critical)
+        risk_level = min(3, max(0, risk_level))
+
+        # Assign probabilities based on risk level
+        if risk_level == 0:
+            probabilities = [0.75, 0.18, 0.05, 0.02]
+        elif risk_level == 1:
+            probabilities = [0.15, 0.70, 0.12, 0.03]
+        elif risk_level == 2:
+            probabilities = [0.05, 0.15, 0.70, 0.10]
+        else:  # risk_level == 3
+            probabilities = [0.02, 0.05, 0.15, 0.78]
+
+        return risk_level, probabilities
+
+    @staticmethod
+    def _build_prediction(student_id: int, features: dict, risk_level: int,
+                          probabilities, predicted_by: int = None,
+                          bundle=None) -> RiskPrediction:
+        """Build an (unsaved) RiskPrediction row from a scored feature dict"""
+        bundle = bundle or ModelRegistry.get_active()
+        # Map risk level to label
+        risk_labels = {0: 'Low', 1: 'Medium', 2: 'High', 3: 'Critical'}
+        risk_label = risk_labels.get(risk_level, 'Low')
+
+        # Ensure we have 4 probabilities
+        if len(probabilities) < 4:
+            probabilities = list(probabilities) + [0.0] * (4 - len(probabilities))
+
+        now = datetime.utcnow()
+        return RiskPrediction(
+            student_id=student_id,
+            prediction_date=now,
+            risk_level=int(risk_level),
+            risk_label=risk_label,
+            # Confidence = probability of predicted class
+            confidence_score=float(probabilities[risk_level] * 100),
+            probability_low=float(probabilities[0] * 100),
+            probability_medium=float(probabilities[1] * 100),
+            probability_high=float(probabilities[2] * 100),
+            probability_critical=float(probabilities[3] * 100),
+
+            features_used=features,
+            model_version=PredictionService._model_version(bundle),
+            predicted_by=predicted_by,
+            feature_hash=PredictionService.feature_fingerprint(features, bundle),
+            last_confirmed_at=now
+        )
+
+    @staticmethod
+    def make_prediction(student_id: int, predicted_by: int = None, features: dict = None):
         """
         Make risk prediction for a student
         Args:
             student_id: Database ID of student
             predicted_by: User ID who requested prediction
+            features: Pre-built features (e.g. from prepare_features_bulk);
+                      loaded from the database when omitted
         Returns: Prediction result with probabilities
         """
         db = SessionLocal()
         try:
             # Prepare features
-            features = PredictionService.prepare_features(student_id)
+            if features is None:
+                features = PredictionService.prepare_features(student_id)
             
             if 'error' in features:
                 return features
+
+            # One model version for the whole request, even if a swap lands
+            bundle = ModelRegistry.get_active()
+
+            # Same inputs + model as the latest prediction: confirm, don't re-score
+            fingerprint = PredictionService.feature_fingerprint(features, bundle)
+            confirmed = PredictionService._confirm_unchanged(
+                db, {student_id: fingerprint}, bundle
+            )
+            if confirmed:
+                db.commit()
+                print(f"♻️  Prediction unchanged for student {student_id} (confirmed)")
+                return confirmed[student_id]
             
             # Make prediction
-            if PredictionService.model is not None:
-                # Use actual trained model
-                feature_array = PredictionService.encode_and_scale_features(features)
-                
-                # Predict
-                risk_level = int(PredictionService.model.predict(feature_array)[0])
-                
-                # Get probabilities
-                if hasattr(PredictionService.model, 'predict_proba'):
-                    probabilities = PredictionService.model.predict_proba(feature_array)[0]
-                else:
-                    # If model doesn't support predict_proba, create one-hot
-                    probabilities = [0.0, 0.0, 0.0, 0.0]
-                    probabilities[risk_level] = 1.0
-                
+            risk_level, probabilities = PredictionService.predict_batch([features], bundle)[0]
+            if bundle.model is not None:
                 print(f"🤖 ML Model Prediction: Risk Level {risk_level}")
-                
             else:
-                # Fallback to improved dummy prediction using multiple features
-                risk_level = 0  # Start with Low
-                
-                # GPA factor (most important)
-                gpa = features.get('current_gpa', 0)
-                if gpa < 40:
-                    risk_level = 3  # Critical
-                elif gpa < 50:
-                    risk_level = 2  # High
-                elif gpa < 65:
-                    risk_level = 1  # Medium
-                
-                # Grade trend factor (declining trend increases risk)
-                grade_trend = features.get('grade_trend', 0)
-                if grade_trend < -5:
-                    risk_level = min(3, risk_level + 2)  # Significant decline
-                elif grade_trend < 0:
-                    risk_level = min(3, risk_level + 1)  # Slight decline
-                
-                # Attendance factor (poor attendance increases risk)
-                attendance_rate = features.get('attendance_rate', 100)
-                if attendance_rate < 60:
-                    risk_level = min(3, risk_level + 2)  # Very low attendance
-                elif attendance_rate < 75:
-                    risk_level = min(3, risk_level + 1)  # Low attendance
-                
-                # Failed subjects factor
-                failed_subjects = features.get('failed_subjects', 0)
-                if failed_subjects >= 3:
-                    risk_level = min(3, risk_level + 2)  # Multiple failures
-                elif failed_subjects >= 1:
-                    risk_level = min(3, risk_level + 1)  # Some failures
-                
-                # Behavioral incidents
-                behavioral_incidents = features.get('behavioral_incidents', 0)
-                if behavioral_incidents >= 3:
-                    risk_level = min(3, risk_level + 1)  # Behavioral issues
-                
-                # Assignment submission rate (engagement indicator)
-                assignment_rate = features.get('assignment_submission_rate', 100)
-                if assignment_rate < 60:
-                    risk_level = min(3, risk_level + 1)  # Poor engagement
-                
-                # Cap risk level at 3 (Critical)
-                risk_level = min(3, max(0, risk_level))
-                
-                # Assign probabilities based on risk level
-                if risk_level == 0:
-                    probabilities = [0.75, 0.18, 0.05, 0.02]
-                elif risk_level == 1:
-                    probabilities = [0.15, 0.70, 0.12, 0.03]
-                elif risk_level == 2:
-                    probabilities = [0.05, 0.15, 0.70, 0.10]
-                else:  # risk_level == 3
-                    probabilities = [0.02, 0.05, 0.15, 0.78]
-                
-                print(f"⚠️  Dummy Prediction: Risk Level {risk_level} (GPA:{gpa:.1f}, Att:{attendance_rate:.0f}%, Fail:{failed_subjects})")
-            
-            # Map risk level to label
-            risk_labels = {0: 'Low', 1: 'Medium', 2: 'High', 3: 'Critical'}
-            risk_label = risk_labels.get(risk_level, 'Low')
-            
-            # Ensure we have 4 probabilities
-            if len(probabilities) < 4:
-                probabilities = list(probabilities) + [0.0] * (4 - len(probabilities))
-            
-            # Get confidence score (probability of predicted class)
-            confidence_score = float(probabilities[risk_level] * 100)
-
-            # Convert numpy arrays to native Python types
-            prob_low = float(probabilities[0] * 100)
-            prob_medium = float(probabilities[1] * 100)
-            prob_high = float(probabilities[2] * 100)
-            prob_critical = float(probabilities[3] * 100)
+                print(f"⚠️  Dummy Prediction: Risk Level {risk_level} "
+                      f"(GPA:{features.get('current_gpa', 0):.1f}, "
+                      f"Att:{features.get('attendance_rate', 100):.0f}%, "
+                      f"Fail:{features.get('failed_subjects', 0)})")
 
             # Save prediction to database
-            prediction = RiskPrediction(
-                student_id=student_id,
-                prediction_date=datetime.utcnow(),
-                risk_level=int(risk_level),
-                risk_label=risk_label,
-                confidence_score=confidence_score,
-                probability_low=prob_low,
-                probability_medium=prob_medium,
-                probability_high=prob_high,
-                probability_critical=prob_critical,
-
-                features_used=features,
-                model_version='2.0' if PredictionService.model else '1.0-dummy',
-                predicted_by=predicted_by
+            prediction = PredictionService._build_prediction(
+                student_id, features, risk_level, probabilities, predicted_by, bundle
             )
             
             db.add(prediction)
+            db.flush()
+            PredictionService._upsert_latest_risk(db, [prediction])
             db.commit()
+            AnalyticsService.invalidate_overview()
             db.refresh(prediction)
             
             return prediction.to_dict()
@@ -335,7 +366,210 @@ class PredictionService:
             return {'error': str(e)}
         finally:
             db.close()
-    
+
+    @staticmethod
+    def make_predictions_batch(features_map: dict, predicted_by: int = None,
+                               db=None) -> dict:
+        """
+        Score many students with one vectorized model call and save all rows
+        with bulk INSERTs in a single transaction
+        Args:
+            features_map: {student_id: features} from prepare_features_bulk
+            predicted_by: User ID who requested the predictions
+            db: Optional session to reuse (avoids holding a second connection)
+        Returns: {student_id: prediction dict or {'error': ...}}
+        """
+        results = {
+            sid: features for sid, features in features_map.items()
+            if 'error' in features
+        }
+        scorable = [
+            (sid, features) for sid, features in features_map.items()
+            if 'error' not in features
+        ]
+        if not scorable:
+            return results
+
+        bundle = ModelRegistry.get_active()
+
+        # Students whose inputs match their latest prediction are only confirmed
+        own_session = db is None
+        session = SessionLocal() if own_session else db
+        try:
+            confirmed = PredictionService._confirm_unchanged(session, {
+                sid: PredictionService.feature_fingerprint(features, bundle)
+                for sid, features in scorable
+            }, bundle)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"⚠️  Fingerprint check failed, re-scoring all: {e}")
+            confirmed = {}
+        finally:
+            if own_session:
+                session.close()
+
+        results.update(confirmed)
+        scorable = [(sid, f) for sid, f in scorable if sid not in confirmed]
+        if confirmed:
+            print(f"♻️  {len(confirmed)} predictions unchanged (confirmed, not re-scored)")
+        if not scorable:
+            return results
+
+        try:
+            scored = PredictionService.predict_batch([f for _, f in scorable], bundle)
+        except Exception as e:
+            print(f"❌ Batch inference error: {e}")
+            results.update({sid: {'error': str(e)} for sid, _ in scorable})
+            return results
+
+        print(f"🤖 Batch inference: {len(scorable)} students scored in one call")
+
+        predictions = [
+            PredictionService._build_prediction(
+                sid, features, risk_level, probabilities, predicted_by, bundle
+            )
+            for (sid, features), (risk_level, probabilities) in zip(scorable, scored)
+        ]
+
+        saved = PredictionService.save_predictions_bulk(predictions, db=db)
+        if 'error' in saved:
+            results.update({sid: saved for sid, _ in scorable})
+            return results
+
+        results.update({pred['student_id']: pred for pred in saved['predictions']})
+        return results
+
+    @staticmethod
+    def save_predictions_bulk(predictions: list, db=None,
+                              chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> dict:
+        """
+        Persist many RiskPrediction rows with multi-row INSERT ... RETURNING,
+        chunked to bound statement size, and committed once at the end.
+        Expects at most one row per student (ids are matched by student_id).
+        Returns: {'predictions': [to_dict() payloads with ids]} or {'error': ...}
+        """
+        own_session = db is None
+        if own_session:
+            db = SessionLocal()
+        try:
+            table   = RiskPrediction.__table__
+            columns = [col.name for col in table.columns if col.name != 'id']
+            now     = datetime.utcnow()
+
+            for start in range(0, len(predictions), chunk_size):
+                chunk = predictions[start:start + chunk_size]
+                for prediction in chunk:
+                    prediction.created_at = prediction.created_at or now
+
+                rows = [
+                    {col: getattr(prediction, col) for col in columns}
+                    for prediction in chunk
+                ]
+                returned = db.execute(
+                    insert(table).values(rows).returning(table.c.id, table.c.student_id)
+                ).all()
+
+                ids = {row.student_id: row.id for row in returned}
+                for prediction in chunk:
+                    prediction.id = ids[prediction.student_id]
+
+                PredictionService._upsert_latest_risk(db, chunk)
+
+            db.commit()
+            AnalyticsService.invalidate_overview()
+            print(f"💾 Saved {len(predictions)} predictions in one transaction")
+            return {'predictions': [prediction.to_dict() for prediction in predictions]}
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Bulk prediction insert error: {e}")
+            return {'error': str(e)}
+        finally:
+            if own_session:
+                db.close()
+
+    @staticmethod
+    def _upsert_latest_risk(db, predictions: list):
+        """
+        Mirror freshly inserted predictions into student_latest_risk
+        (same transaction). Only a newer prediction id replaces a row.
+        """
+        if not predictions:
+            return
+        table = StudentLatestRisk.__table__
+        rows = [{
+            'student_id':           p.student_id,
+            'prediction_id':        p.id,
+            'risk_level':           p.risk_level,
+            'risk_label':           p.risk_label,
+            'confidence_score':     p.confidence_score,
+            'probability_low':      p.probability_low,
+            'probability_medium':   p.probability_medium,
+            'probability_high':     p.probability_high,
+            'probability_critical': p.probability_critical,
+            'model_version':        p.model_version,
+            'prediction_date':      p.prediction_date,
+            'predicted_at':         p.created_at or p.prediction_date,
+            'feature_hash':         p.feature_hash,
+            'last_confirmed_at':    p.last_confirmed_at or p.created_at,
+            'updated_at':           datetime.utcnow()
+        } for p in predictions]
+
+        stmt = pg_insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.student_id],
+            set_={col: stmt.excluded[col] for col in rows[0] if col != 'student_id'},
+            where=table.c.prediction_id < stmt.excluded.prediction_id
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def rebuild_latest_risk() -> dict:
+        """
+        Rebuild student_latest_risk from the full prediction history
+        (backfill after migrations or manual edits to risk_predictions)
+        """
+        db = SessionLocal()
+        try:
+            table = StudentLatestRisk.__table__
+            latest = select(
+                RiskPrediction.student_id,
+                RiskPrediction.id,
+                RiskPrediction.risk_level,
+                RiskPrediction.risk_label,
+                RiskPrediction.confidence_score,
+                RiskPrediction.probability_low,
+                RiskPrediction.probability_medium,
+                RiskPrediction.probability_high,
+                RiskPrediction.probability_critical,
+                RiskPrediction.model_version,
+                RiskPrediction.prediction_date,
+                RiskPrediction.created_at,
+                RiskPrediction.feature_hash,
+                func.coalesce(RiskPrediction.last_confirmed_at, RiskPrediction.created_at),
+                func.now()
+            ).distinct(RiskPrediction.student_id).order_by(
+                RiskPrediction.student_id, desc(RiskPrediction.id)
+            )
+
+            db.execute(table.delete())
+            result = db.execute(table.insert().from_select([
+                'student_id', 'prediction_id', 'risk_level', 'risk_label',
+                'confidence_score', 'probability_low', 'probability_medium',
+                'probability_high', 'probability_critical', 'model_version',
+                'prediction_date', 'predicted_at', 'feature_hash',
+                'last_confirmed_at', 'updated_at'
+            ], latest))
+            db.commit()
+            AnalyticsService.invalidate_overview()
+            return {'status': 'success', 'students': result.rowcount}
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Latest risk rebuild error: {e}")
+            return {'error': str(e)}
+        finally:
+            db.close()
+
     @staticmethod
     def get_student_predictions(student_id: int, limit: int = 10):
         """Get prediction history for a student"""
@@ -369,21 +603,12 @@ class PredictionService:
         """Get list of high-risk students"""
         db = SessionLocal()
         try:
-            # Subquery to get latest prediction for each student (by ID for determinism)
-            subquery = db.query(
-                RiskPrediction.student_id,
-                func.max(RiskPrediction.id).label('max_id')
-            ).group_by(RiskPrediction.student_id).subquery()
-            
-            query = db.query(Student, RiskPrediction).join(
-                RiskPrediction, Student.id == RiskPrediction.student_id
-            ).join(
-                subquery,
-                (RiskPrediction.student_id == subquery.c.student_id) &
-                (RiskPrediction.id == subquery.c.max_id)
+            # Latest prediction per student comes from the projection table
+            query = db.query(Student, StudentLatestRisk).join(
+                StudentLatestRisk, Student.id == StudentLatestRisk.student_id
             ).filter(
                 Student.is_active == True,
-                RiskPrediction.risk_level >= 2  # High or Critical
+                StudentLatestRisk.risk_level >= 2  # High or Critical
             )
             
             if grade:
@@ -393,8 +618,8 @@ class PredictionService:
             
             return [{
                 'student': student.to_dict(),
-                'prediction': prediction.to_dict()
-            } for student, prediction in results]
+                'prediction': latest.to_dict()
+            } for student, latest in results]
         finally:
             db.close()
 
@@ -441,7 +666,9 @@ class PredictionService:
                 )
                 db.add(new_record)
 
+            RescoreService.mark_dirty(db, [student_id], 'marks')
             db.commit()
+            AnalyticsService.invalidate_overview()
             return {'status': 'success', 'message': 'Marks synced to academic record'}
         except Exception as e:
             db.rollback()
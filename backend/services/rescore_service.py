@@ -0,0 +1,243 @@
+"""
+Rescore Service - Incremental re-prediction of changed students
+ScholarSense - AI-Powered Academic Intelligence System
+Writers (marks, attendance, incidents, academic records) mark students
+dirty inside their own transaction; a background worker re-scores only
+those students and saves a new prediction when the result changed
+"""
+
+import os
+import time
+import uuid
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, update, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from backend.database.models import DirtyStudent, StudentLatestRisk
+from backend.database.db_config import SessionLocal
+from backend.services.model_registry import ModelRegistry
+
+# ============================================
+# CONSTANTS
+# ============================================
+RESCORE_ENABLED          = os.getenv('RESCORE_ENABLED', '1') == '1'
+RESCORE_INTERVAL_SECONDS = int(os.getenv('RESCORE_INTERVAL_SECONDS', 60))
+# Students are re-scored only once they have been quiet this long, so a
+# burst of writes (a marks upload, roll call) coalesces into one prediction
+RESCORE_DEBOUNCE_SECONDS = int(os.getenv('RESCORE_DEBOUNCE_SECONDS', 120))
+RESCORE_BATCH_SIZE       = int(os.getenv('RESCORE_BATCH_SIZE', 500))
+# A lease older than this belongs to a batch that died; its students
+# are claimed again
+RESCORE_LEASE_SECONDS    = int(os.getenv('RESCORE_LEASE_SECONDS', 600))
+# Probabilities are stored as percentages with two decimals
+PROBABILITY_TOLERANCE    = 0.01
+
+PROBABILITY_FIELDS = [
+    'probability_low', 'probability_medium',
+    'probability_high', 'probability_critical'
+]
+
+_worker = None
+
+
+class RescoreService:
+    """Dirty-student tracking and incremental re-scoring"""
+
+    # ──────────────────────────────────────────
+    # ENQUEUE
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def mark_dirty(db, student_ids, reason: str):
+        """
+        Queue students for re-scoring inside the caller's transaction
+        (nothing is committed here). Re-marking a queued student only
+        refreshes marked_at, which restarts its debounce window, and
+        drops a running batch's lease so the student is scored again.
+        """
+        ids = sorted({int(sid) for sid in student_ids if sid})
+        if not ids:
+            return
+        now  = datetime.utcnow()
+        stmt = pg_insert(DirtyStudent.__table__).values([
+            {'student_id': sid, 'reason': reason, 'marked_at': now} for sid in ids
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['student_id'],
+            set_={'reason': stmt.excluded.reason, 'marked_at': stmt.excluded.marked_at,
+                  'claimed_at': None, 'claimed_by': None}
+        ))
+
+    # ──────────────────────────────────────────
+    # RE-SCORE
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def _claim(db, limit: int, debounce_seconds: int, owner: str) -> list:
+        """
+        Lease up to `limit` settled students to `owner` (caller commits
+        straight away, so writers never wait on the batch). SKIP LOCKED
+        lets several app processes drain the queue without overlap;
+        expired leases are taken over.
+        """
+        now     = datetime.utcnow()
+        cutoff  = now - timedelta(seconds=debounce_seconds)
+        expired = now - timedelta(seconds=RESCORE_LEASE_SECONDS)
+        settled = select(DirtyStudent.student_id).where(
+            DirtyStudent.marked_at <= cutoff,
+            or_(DirtyStudent.claimed_at.is_(None), DirtyStudent.claimed_at < expired)
+        ).order_by(DirtyStudent.marked_at).limit(limit).with_for_update(skip_locked=True)
+
+        return db.execute(
+            update(DirtyStudent).where(
+                DirtyStudent.student_id.in_(settled.scalar_subquery())
+            ).values(
+                claimed_at=now, claimed_by=owner
+            ).returning(DirtyStudent.student_id)
+        ).scalars().all()
+
+    @staticmethod
+    def _complete(db, owner: str):
+        """
+        Remove the owner's leased rows (caller's transaction). Students
+        re-marked during the batch lost the lease and stay queued.
+        """
+        db.execute(delete(DirtyStudent).where(DirtyStudent.claimed_by == owner))
+
+    @staticmethod
+    def _release(db, owner: str):
+        """Hand the owner's leased rows back for a later retry"""
+        db.execute(update(DirtyStudent).where(DirtyStudent.claimed_by == owner).values(
+            claimed_at=None, claimed_by=None, reason='retry', marked_at=datetime.utcnow()
+        ))
+
+    @staticmethod
+    def _changed(prediction, latest) -> bool:
+        """True if the new prediction differs from the stored latest one"""
+        if latest is None or prediction.risk_label != latest.risk_label:
+            return True
+        return any(
+            abs(float(getattr(prediction, field) or 0) - float(getattr(latest, field) or 0))
+            >= PROBABILITY_TOLERANCE
+            for field in PROBABILITY_FIELDS
+        )
+
+    @staticmethod
+    def rescore_pending(limit: int = RESCORE_BATCH_SIZE,
+                        debounce_seconds: int = RESCORE_DEBOUNCE_SECONDS) -> dict:
+        """
+        Re-score one batch of dirty students
+        Only students whose label or probabilities changed get a new
+        RiskPrediction row; the rest are left as they are.
+        Returns: {'status': 'success', 'claimed', 'changed', 'unchanged', 'skipped'}
+        """
+        # Imported here: prediction_service itself marks students dirty
+        from backend.services.prediction_service import PredictionService
+
+        owner = uuid.uuid4().hex
+        db = SessionLocal()
+        try:
+            student_ids = RescoreService._claim(db, limit, debounce_seconds, owner)
+            db.commit()
+            if not student_ids:
+                return {'status': 'success', 'claimed': 0, 'changed': 0,
+                        'unchanged': 0, 'skipped': 0}
+
+            try:
+                bundle       = ModelRegistry.get_active()
+                features_map = PredictionService.prepare_features_bulk(student_ids, db=db)
+                scorable = [
+                    (sid, features) for sid, features in features_map.items()
+                    if 'error' not in features
+                ]
+                scored = PredictionService.predict_batch(
+                    [features for _, features in scorable], bundle
+                ) if scorable else []
+
+                latest = {
+                    row.student_id: row for row in db.query(StudentLatestRisk).filter(
+                        StudentLatestRisk.student_id.in_([sid for sid, _ in scorable])
+                    ).all()
+                } if scorable else {}
+
+                changed = []
+                for (sid, features), (risk_level, probabilities) in zip(scorable, scored):
+                    prediction = PredictionService._build_prediction(
+                        sid, features, risk_level, probabilities, bundle=bundle
+                    )
+                    if RescoreService._changed(prediction, latest.get(sid)):
+                        changed.append(prediction)
+
+                # Dequeue and save in one transaction: a crash before the
+                # commit leaves the lease to expire and the students queued
+                RescoreService._complete(db, owner)
+                if changed:
+                    saved = PredictionService.save_predictions_bulk(changed, db=db)
+                    if 'error' in saved:
+                        raise RuntimeError(saved['error'])
+                else:
+                    db.commit()
+
+            except Exception:
+                # Back in the queue; the fresh marked_at restarts the
+                # debounce window so the retry is not immediate
+                db.rollback()
+                RescoreService._release(db, owner)
+                db.commit()
+                raise
+
+            result = {
+                'status':    'success',
+                'claimed':   len(student_ids),
+                'changed':   len(changed),
+                'unchanged': len(scorable) - len(changed),
+                'skipped':   len(student_ids) - len(scorable)
+            }
+            print(f"🔄 Rescored {result['claimed']} dirty students: "
+                  f"{result['changed']} changed | {result['unchanged']} unchanged | "
+                  f"{result['skipped']} skipped")
+            return result
+
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Rescore error: {e}")
+            return {'status': 'error', 'message': str(e)}
+        finally:
+            db.close()
+
+    @staticmethod
+    def rescore_all_pending(debounce_seconds: int = RESCORE_DEBOUNCE_SECONDS) -> dict:
+        """Drain the queue batch by batch (nightly job / manual run)"""
+        totals = {'claimed': 0, 'changed': 0, 'unchanged': 0, 'skipped': 0}
+        while True:
+            result = RescoreService.rescore_pending(debounce_seconds=debounce_seconds)
+            if result.get('status') != 'success':
+                return {**result, **totals}
+            for key in totals:
+                totals[key] += result[key]
+            if result['claimed'] < RESCORE_BATCH_SIZE:
+                return {'status': 'success', **totals}
+
+    # ──────────────────────────────────────────
+    # BACKGROUND WORKER
+    # ──────────────────────────────────────────
+
+    @staticmethod
+    def _worker_loop():
+        while True:
+            time.sleep(RESCORE_INTERVAL_SECONDS)
+            RescoreService.rescore_all_pending()
+
+    @staticmethod
+    def start_worker() -> bool:
+        """Start the periodic re-scorer thread once per process"""
+        global _worker
+        if not RESCORE_ENABLED or (_worker and _worker.is_alive()):
+            return False
+        _worker = threading.Thread(
+            target=RescoreService._worker_loop, name='rescore-worker', daemon=True
+        )
+        _worker.start()
+        print(f"🔄 Rescore worker started (every {RESCORE_INTERVAL_SECONDS}s, "
+              f"debounce {RESCORE_DEBOUNCE_SECONDS}s)")
+        return True
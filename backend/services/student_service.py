@@ -5,7 +5,12 @@ ScholarSense - AI-Powered Academic Intelligence System
 from datetime import datetime, date
 from backend.database.models import Student, AcademicRecord
 from backend.database.db_config import get_db
-from sqlalchemy import or_, and_
+from backend.config.settings import VALID_GRADES
+from sqlalchemy import or_, and_, case, func, literal
+
+# Global search limits (GET /api/students/search)
+SEARCH_MIN_LENGTH  = 2
+SEARCH_MAX_RESULTS = 25
 
 class StudentService:
     """Handle student CRUD operations"""
@@ -113,15 +118,9 @@ class StudentService:
                 query = query.filter(Student.grade == grade)
             if section:
                 query = query.filter(Student.section == section)
-            if search:
-                pattern = f"%{search}%"
+            if search and search.strip():
                 query = query.filter(
-                    or_(
-                        Student.first_name.ilike(pattern),
-                        Student.last_name.ilike(pattern),
-                        Student.student_id.ilike(pattern),
-                        Student.parent_name.ilike(pattern)
-                    )
+                    StudentService._search_filter(search.strip().lower())
                 )
 
             total = query.count()
@@ -134,19 +133,66 @@ class StudentService:
             db.close()
     
     @staticmethod
-    def search_students(search_term: str):
-        """Search students by name, student ID, or parent name"""
+    def _escape_like(term: str) -> str:
+        """Escape LIKE wildcards so user input matches literally"""
+        return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    @staticmethod
+    def _search_filter(term: str, fuzzy: bool = False):
+        """
+        Match condition on the trigram-indexed search_text column:
+        literal substring (covers prefixes). fuzzy (ranked search only)
+        also accepts typos (word similarity: the term against its best
+        matching words, not the whole name/ID/parent string) and grade
+        numbers.
+        """
+        escaped   = StudentService._escape_like(term)
+        condition = Student.search_text.like(f"%{escaped}%", escape='\\')
+        if fuzzy:
+            condition = or_(condition, literal(term).op('<%')(Student.search_text))
+            if term.isdigit():
+                condition = or_(condition, Student.grade == int(term))
+        return condition
+
+    @staticmethod
+    def search_students(search_term: str, limit: int = SEARCH_MAX_RESULTS):
+        """
+        Search students by name, student ID, or parent name
+        Ranked: exact ID, then prefix matches, then substring/fuzzy matches
+        ordered by trigram word similarity. Never returns more than
+        SEARCH_MAX_RESULTS rows. Single-character terms are only searched
+        when they name a grade.
+        """
+        term  = (search_term or '').strip().lower()
+        limit = max(1, min(limit or SEARCH_MAX_RESULTS, SEARCH_MAX_RESULTS))
+        # A single digit is still a useful query when it names a grade
+        is_grade = term.isdigit() and int(term) in VALID_GRADES
+        if len(term) < SEARCH_MIN_LENGTH and not is_grade:
+            return []
+
         db = next(get_db())
         try:
-            search_pattern = f"%{search_term}%"
+            escaped = StudentService._escape_like(term)
+            prefix  = f"{escaped}%"
+            rank = case(
+                (func.lower(Student.student_id) == term, 0),
+                (or_(
+                    func.lower(Student.student_id).like(prefix, escape='\\'),
+                    func.lower(Student.first_name).like(prefix, escape='\\'),
+                    func.lower(Student.last_name).like(prefix, escape='\\')
+                ), 1),
+                else_=2
+            )
+
             students = db.query(Student).filter(
-                or_(
-                    Student.first_name.ilike(search_pattern),
-                    Student.last_name.ilike(search_pattern),
-                    Student.student_id.ilike(search_pattern),
-                    Student.parent_name.ilike(search_pattern)
-                )
-            ).filter(Student.is_active == True).limit(50).all()
+                Student.is_active == True,
+                StudentService._search_filter(term, fuzzy=True)
+            ).order_by(
+                rank,
+                func.word_similarity(term, Student.search_text).desc(),
+                Student.last_name,
+                Student.id
+            ).limit(limit).all()
             return [student.to_dict() for student in students]
         finally:
             db.close()
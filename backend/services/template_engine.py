@@ -0,0 +1,309 @@
+"""
+Template Engine - Compile-once email templates
+ScholarSense - AI-Powered Academic Intelligence System
+Every email template (parent communications, notifications, OTP) is
+compiled once per process:
+- the {slot} source is split into literal runs and slot names, so
+  rendering a message is a single ''.join of literals and values
+- markdown bodies are converted to HTML at compile time and wrapped in
+  their pre-rendered HTML layout; only user-supplied markdown slots
+  (custom messages) are converted per message, and those are cached
+- the multipart/alternative skeleton (boundary, From, part headers) is
+  built once per template, language and sender; per message only the
+  recipient headers and the base64 bodies are written
+"""
+
+import re
+import html
+import base64
+import string
+import threading
+from functools import lru_cache
+from typing import NamedTuple
+from email.utils import formataddr, formatdate, make_msgid
+
+# ============================================
+# CONSTANTS
+# ============================================
+DEFAULT_LANGUAGE = 'en'
+CHARSET          = 'utf-8'
+# An encoded-word is at most 75 characters: 45 bytes → 60 base64 chars
+ENCODED_WORD_BYTES = 45
+
+_BOLD      = re.compile(r'\*\*(.*?)\*\*')
+_formatter = string.Formatter()
+
+
+# ──────────────────────────────────────────
+# MARKDOWN
+# ──────────────────────────────────────────
+
+def markdown_to_html(text: str) -> str:
+    """The small markdown subset parent emails use: **bold**, '- ' bullets, newlines"""
+    text = _BOLD.sub(r'<b>\1</b>', text)
+    return text.replace('\n', '<br/>').replace('- ', '&nbsp;&nbsp;• ')
+
+
+def markdown_to_text(text: str) -> str:
+    """Plain-text version of a markdown body (emphasis markers dropped)"""
+    return text.replace('**', '').replace('*', '')
+
+
+@lru_cache(maxsize=1024)
+def _user_markdown_html(text: str) -> str:
+    # A batch sends the same custom message to every parent: convert it once
+    return markdown_to_html(html.escape(text, quote=False))
+
+
+@lru_cache(maxsize=1024)
+def _user_markdown_text(text: str) -> str:
+    return markdown_to_text(text)
+
+
+def escape_braces(text: str) -> str:
+    """Make literal text safe to embed in a {slot} template"""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+# ──────────────────────────────────────────
+# COMPILED TEXT
+# ──────────────────────────────────────────
+
+class CompiledText:
+    """A str.format-style template split once into literals and slots"""
+
+    __slots__ = ('literals', 'fields', 'tail')
+
+    def __init__(self, source: str = '', _parts=None):
+        if _parts is None:
+            _parts = [
+                (literal, (name, spec) if name is not None else None)
+                for literal, name, spec, _ in _formatter.parse(source)
+            ]
+        literals, fields, pending = [], [], ''
+        for literal, field in _parts:
+            pending += literal
+            if field is not None:
+                literals.append(pending)
+                fields.append(field)
+                pending = ''
+        self.literals = tuple(literals)
+        self.fields   = tuple(fields)
+        self.tail     = pending
+
+    @property
+    def slots(self) -> set:
+        return {name for name, _ in self.fields}
+
+    def bind(self, values: dict) -> 'CompiledText':
+        """Fill some slots now (compile time); the rest stay open"""
+        parts = []
+        for literal, (name, spec) in zip(self.literals, self.fields):
+            if name in values:
+                parts.append((literal + format(values[name], spec), None))
+            else:
+                parts.append((literal, (name, spec)))
+        parts.append((self.tail, None))
+        return CompiledText(_parts=parts)
+
+    def render(self, values: dict) -> str:
+        """Fill every slot (values must already be escaped as needed)"""
+        out = []
+        for literal, (name, spec) in zip(self.literals, self.fields):
+            out.append(literal)
+            out.append(format(values[name], spec) if spec else str(values[name]))
+        out.append(self.tail)
+        return ''.join(out)
+
+
+# ──────────────────────────────────────────
+# MESSAGE TEMPLATES
+# ──────────────────────────────────────────
+
+class RenderedMessage(NamedTuple):
+    subject: str
+    text:    str
+    html:    str
+    body:    str       # markdown source after filling ('' for text/html templates)
+
+
+class MessageTemplate:
+    """
+    Subject + plain text + HTML for one email, compiled once
+    raw_slots:      values inserted into the HTML as-is (pre-rendered HTML)
+    markdown_slots: user-supplied markdown, converted per message (cached)
+    Every other value is HTML-escaped in the HTML part.
+    """
+
+    def __init__(self, name: str, subject: str, text: str, html_source: str,
+                 language: str = DEFAULT_LANGUAGE, body: str = None,
+                 raw_slots=(), markdown_slots=()):
+        self.name           = name
+        self.language       = language
+        self.subject        = CompiledText(subject)
+        self.text           = CompiledText(text)
+        self.html           = CompiledText(html_source)
+        self.body           = CompiledText(body) if body is not None else None
+        self.raw_slots      = frozenset(raw_slots)
+        self.markdown_slots = frozenset(markdown_slots)
+        self._mime          = {}
+        self._mime_lock     = threading.Lock()
+
+    @classmethod
+    def from_markdown(cls, name: str, subject: str, body: str, layout: str,
+                      language: str = DEFAULT_LANGUAGE, markdown_slots=()):
+        """
+        Compile a markdown body: plain text drops the emphasis, HTML is
+        converted once and placed in layout's {content} slot
+        """
+        content = markdown_to_html(body)
+        return cls(
+            name, subject,
+            text           = markdown_to_text(body),
+            html_source    = escape_braces(layout).replace('{{content}}', content),
+            language       = language,
+            body           = body,
+            markdown_slots = markdown_slots
+        )
+
+    def bind(self, **values) -> 'MessageTemplate':
+        """
+        Specialise the template with values known at compile time
+        (e.g. the colours and icon of a notification type)
+        """
+        bound = MessageTemplate.__new__(MessageTemplate)
+        bound.__dict__.update(self.__dict__)
+        escaped = {k: html.escape(str(v), quote=False) for k, v in values.items()}
+        bound.subject   = self.subject.bind(values)
+        bound.text      = self.text.bind(values)
+        bound.html      = self.html.bind(escaped)
+        bound.body      = self.body.bind(values) if self.body is not None else None
+        bound._mime     = {}
+        bound._mime_lock = threading.Lock()
+        return bound
+
+    def render(self, values: dict) -> RenderedMessage:
+        """Fill the slots: string joins only, no parsing or regex"""
+        text_values = values
+        html_values = {}
+        for key, value in values.items():
+            if key in self.raw_slots:
+                html_values[key] = value
+            elif key in self.markdown_slots:
+                html_values[key] = _user_markdown_html(str(value))
+            else:
+                html_values[key] = html.escape(str(value), quote=False)
+        if self.markdown_slots:
+            text_values = {
+                key: _user_markdown_text(str(value)) if key in self.markdown_slots else value
+                for key, value in values.items()
+            }
+        return RenderedMessage(
+            subject = self.subject.render(values),
+            text    = self.text.render(text_values),
+            html    = self.html.render(html_values),
+            body    = self.body.render(values) if self.body is not None else ''
+        )
+
+    def mime(self, from_addr: str, from_name: str = None) -> 'MimeLayout':
+        """The cached MIME skeleton for this template and sender"""
+        key = (from_addr, from_name)
+        layout = self._mime.get(key)
+        if layout is None:
+            with self._mime_lock:
+                layout = self._mime.setdefault(key, MimeLayout(from_addr, from_name))
+        return layout
+
+
+# ──────────────────────────────────────────
+# MIME
+# ──────────────────────────────────────────
+
+def _encode_header(value: str) -> str:
+    """
+    RFC 2047 base64 encoded-words for a non-ASCII header value
+    (email.header.Header does the same, but measures every candidate
+    split with quoted-printable first and dominates rendering time)
+    """
+    if value.isascii():
+        return value
+    words, chunk, size = [], [], 0
+    for char in value:
+        width = len(char.encode(CHARSET))
+        if size + width > ENCODED_WORD_BYTES:
+            words.append(''.join(chunk))
+            chunk, size = [], 0
+        chunk.append(char)
+        size += width
+    words.append(''.join(chunk))
+    return '\n '.join(
+        f"=?{CHARSET}?b?{base64.b64encode(word.encode(CHARSET)).decode('ascii')}?="
+        for word in words
+    )
+
+
+def _header_value(name: str, value: str) -> str:
+    """
+    A header value for the raw header block: CR/LF would end the header
+    and start a new one (email.header raises HeaderParseError for the same)
+    """
+    if value and ('\r' in value or '\n' in value):
+        raise ValueError(f"{name} header must not contain line breaks")
+    return value
+
+
+def _b64(text: str) -> str:
+    return base64.encodebytes(text.encode(CHARSET)).decode('ascii')
+
+
+class MimeLayout:
+    """
+    Pre-built multipart/alternative (plain + HTML, UTF-8, base64) message
+    for one sender. build() only writes the per-message headers and bodies.
+    """
+
+    def __init__(self, from_addr: str, from_name: str = None):
+        boundary      = '=' * 15 + make_msgid().strip('<>').replace('@', '.') + '=='
+        self.from_addr = from_addr
+        self.domain    = from_addr.rsplit('@', 1)[-1] or None
+        self.head      = (
+            f'Content-Type: multipart/alternative; boundary="{boundary}"\n'
+            'MIME-Version: 1.0\n'
+        )
+        self.sender    = (
+            f"From: {formataddr((from_name, from_addr), charset=CHARSET) if from_name else from_addr}\n"
+        )
+        part = (
+            f'--{boundary}\n'
+            'Content-Type: text/{subtype}; charset="utf-8"\n'
+            'MIME-Version: 1.0\n'
+            'Content-Transfer-Encoding: base64\n\n'
+        )
+        self.text_part = part.format(subtype='plain')
+        self.html_part = part.format(subtype='html')
+        self.end       = f'--{boundary}--\n'
+
+    def build(self, to_email: str, subject: str, text: str, html_body: str = None,
+              to_name: str = None, message_id: str = None):
+        """
+        Returns: (message_id, RFC 822 message string)
+        Raises:  ValueError if Subject or To contains CR/LF
+        """
+        message_id = message_id or make_msgid(domain=self.domain)
+        subject    = _header_value('Subject', subject)
+        to_email   = _header_value('To', to_email)
+        to_name    = _header_value('To', to_name)
+        to_header  = formataddr((to_name, to_email), charset=CHARSET) if to_name else to_email
+        parts = [
+            self.head,
+            f"Subject: {_encode_header(subject)}\n",
+            self.sender,
+            f"To: {to_header}\n",
+            f"Message-ID: {message_id}\n",
+            f"Date: {formatdate(localtime=False)}\n\n",
+            self.text_part, _b64(text), '\n',
+        ]
+        if html_body:
+            parts += [self.html_part, _b64(html_body), '\n']
+        parts.append(self.end)
+        return message_id, ''.join(parts)
@@ -10,6 +10,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+import time
 import streamlit as st
 import requests
 import pandas as pd
@@ -140,6 +141,60 @@ def api_post(endpoint, payload):
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+def run_batch_job(payload, progress_bar, poll_seconds=1.0):
+    """
+    Queue a background batch job, poll its progress and collect the
+    paginated results. Returns the same shape as the old /batch/run.
+    """
+    submitted = api_post("/batch/jobs", payload)
+    if submitted.get('status') != 'success':
+        return submitted
+
+    job_id = submitted['data']['job_id']
+    while True:
+        job = api_get(f"/batch/jobs/{job_id}")
+        if job.get('status') != 'success':
+            return job
+        job = job['data']
+        if job['status'] == 'completed':
+            break
+        if job['status'] == 'failed':
+            return {"status": "error", "message": job.get('error_message')}
+
+        progress_bar.progress(
+            min(int(job['progress_pct']), 99),
+            text=f"🤖 Job #{job_id}: {job['done']} / {job['total'] or '?'} students"
+        )
+        time.sleep(poll_seconds)
+
+    results, page = [], 1
+    while True:
+        res = api_get(f"/batch/jobs/{job_id}/results",
+                      params={"page": page, "per_page": 500})
+        if res.get('status') != 'success':
+            return res
+        results.extend(res['data']['results'])
+        if page >= res['data']['pages']:
+            break
+        page += 1
+
+    return {
+        "status": "success",
+        "data": {
+            "summary": {
+                "total":        job['total'],
+                "success":      job['success'],
+                "skipped":      job['skipped'],
+                "failed":       job['failed'],
+                "risk_summary": job['risk_summary'],
+                "run_at":       job['finished_at'],
+                "triggered_by": job['triggered_by'],
+                "filters":      job['filters']
+            },
+            "results": results
+        }
+    }
+
 # ============================================
 # SIDEBAR
 # ============================================
@@ -259,15 +314,13 @@ with tab1:
         if run_section != 'All':
             payload['section'] = run_section
 
-        progress_bar = st.progress(0, text="🔁 Starting batch prediction...")
+        progress_bar = st.progress(0, text="🔁 Queuing batch prediction job...")
 
         with st.spinner(
             f"🤖 Running ML predictions... "
             f"{'(All students)' if not payload else str(payload)}"
         ):
-            progress_bar.progress(30, text="🔄 Fetching students...")
-            result = api_post("/batch/run", payload)
-            progress_bar.progress(90, text="💾 Saving predictions...")
+            result = run_batch_job(payload, progress_bar)
 
         progress_bar.progress(100, text="✅ Done!")
 
@@ -790,11 +843,12 @@ with tab3:
                     type="primary",
                     width='stretch'
                 ):
-                    with st.spinner("🤖 Running predictions..."):
-                        quick_result = api_post("/batch/run", {})
+                    quick_result = api_post("/batch/jobs", {})
                     if quick_result.get('status') == 'success':
-                        st.success("✅ Done! Refresh to see updated results.")
-                        st.rerun()
+                        st.success(
+                            f"✅ Batch job #{quick_result['data']['job_id']} queued! "
+                            f"Refresh in a moment to see updated results."
+                        )
                     else:
                         st.error(
                             f"❌ {quick_result.get('message', 'Failed')}"
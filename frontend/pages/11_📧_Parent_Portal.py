@@ -137,7 +137,7 @@ if report_mode == "👤 Single Student":
                         'pdf_report': True
                     })
                 if result.get('status') == 'success':
-                    st.success(f"✅ PDF Report emailed successfully to **{parent_email}**!")
+                    st.success(f"✅ PDF Report queued for delivery to **{parent_email}**!")
                     st.balloons()
                 else:
                     st.warning("⚠️ Email failed — download the PDF manually below.")
@@ -947,22 +947,14 @@ with tab3:
         unsafe_allow_html=True
     )
 
-    # Fetch per-grade risk breakdown
+    # Fetch per-grade risk breakdown (one grouped count query)
     with st.spinner("Loading grade risk breakdown..."):
         grade_risk_data = {}
-        for grade in [6, 7, 8, 9, 10]:
-            res = api_get(
-                "/batch/predictions",
-                params={"grade": grade, "limit": 500}
-            )
-            if res.get('status') == 'success':
-                students = res['data'].get('students', [])
-                counts   = {'Low': 0, 'Medium': 0,
-                            'High': 0, 'Critical': 0}
-                for s in students:
-                    lbl = s.get('risk_label', 'Low')
-                    if lbl in counts:
-                        counts[lbl] += 1
+        res = api_get("/batch/predictions", params={"count_only": 1})
+        if res.get('status') == 'success':
+            by_grade = res['data'].get('by_grade', {})
+            for grade in [6, 7, 8, 9, 10]:
+                counts = by_grade.get(str(grade), {})
                 if any(v > 0 for v in counts.values()):
                     grade_risk_data[grade] = counts
 
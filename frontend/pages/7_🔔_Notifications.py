@@ -228,7 +228,7 @@ if send_mode == "👤 Single Student":
             with st.spinner("📤 Sending..."):
                 result = api_post("/communications/send", payload)
             if result.get('status') == 'success':
-                st.success(f"✅ Message sent to **{parent_email}**!")
+                st.success(f"✅ Message queued for delivery to **{parent_email}**!")
                 st.balloons()
             else:
                 st.error(f"❌ Failed: {result.get('message', 'Unknown error')}")
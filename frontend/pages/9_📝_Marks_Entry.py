@@ -460,6 +460,46 @@ with tab1:
             else:
                 st.error(f"❌ Failed: {result.get('message', 'Unknown error')}")
 
+    # ── Bulk: whole class sheet in one request ─────────────
+    st.markdown("---")
+    with st.expander("📤 Upload Class Sheet (CSV)"):
+        st.caption(
+            "Columns: student_id, math_score, science_score, english_score, "
+            "social_score, language_score [, assignment_submission_rate, remarks]. "
+            f"Semester: **{sel_semester}**"
+        )
+        bulk_exam_type = st.selectbox(
+            "📋 Exam Type *", options=EXAM_TYPES, index=2, key="bulk_exam_type"
+        )
+        sheet = st.file_uploader("Class sheet", type=["csv"], key="bulk_marks_csv")
+
+        if sheet and st.button("💾 Save Class Sheet", type="primary"):
+            with st.spinner("💾 Saving class sheet..."):
+                try:
+                    r = requests.post(
+                        f"{API_BASE}/marks/bulk",
+                        headers=get_headers(),
+                        files={"file": (sheet.name, sheet.getvalue(), "text/csv")},
+                        data={"semester": sel_semester, "exam_type": bulk_exam_type},
+                        timeout=30
+                    )
+                    bulk_result = r.json()
+                except Exception as e:
+                    bulk_result = {"status": "error", "message": str(e)}
+
+            if bulk_result.get('status') == 'success':
+                bd = bulk_result['data']
+                st.success(
+                    f"✅ Saved {bd['saved']} row(s) — "
+                    f"{bd['created']} created, {bd['updated']} updated"
+                )
+            else:
+                st.error(f"❌ Failed: {bulk_result.get('message', 'Unknown error')}")
+                bd = bulk_result
+
+            for err in (bd.get('errors') or []):
+                st.warning(f"⚠️ {err}")
+
 
 # ============================================================
 # TAB 2 — ANALYTICS
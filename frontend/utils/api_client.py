@@ -171,6 +171,22 @@ class APIClient:
         except Exception as e:
             return {'error': str(e)}
     
+    @staticmethod
+    def search_students(query: str, limit: int = 25) -> List[Dict]:
+        """Ranked server-side search (name, student ID, parent name)"""
+        try:
+            response = requests.get(
+                f"{APIClient.BASE_URL}/students/search",
+                headers=APIClient.get_headers(),
+                params={'q': query, 'limit': limit},
+                timeout=5
+            )
+            if response.status_code == 200:
+                return response.json().get('students', [])
+            return []
+        except Exception as e:
+            return []
+    
     @staticmethod
     def get_students_count() -> int:
         try:
@@ -4,6 +4,9 @@ Global Search — Search across students, incidents, predictions.
 import streamlit as st
 from frontend.utils.api_client import APIClient
 
+SEARCH_LIMIT = 25
+GRADE_QUERIES = {'6', '7', '8', '9'}
+
 
 def render_global_search():
     """
@@ -12,50 +15,36 @@ def render_global_search():
     """
     search_query = st.text_input(
         "🔍 Global Search",
-        placeholder="Search students, grades, risk levels...",
+        placeholder="Search students by name, ID, parent or grade...",
         key="global_search_input",
         label_visibility="collapsed"
     )
 
-    if not search_query or len(search_query.strip()) < 2:
+    query = (search_query or '').strip()
+    # Single characters only when they name a grade (6-9)
+    if len(query) < 2 and query not in GRADE_QUERIES:
         st.markdown(
             "<p style='color:#a0aec0; font-size:0.85rem; margin-top:0.25rem;'>"
-            "Type at least 2 characters to search across all students...</p>",
+            "Type at least 2 characters (or a grade) to search across all students...</p>",
             unsafe_allow_html=True
         )
         return
 
-    query = search_query.strip().lower()
-
+    # ── Ranked server-side match (capped result set) ──────
     with st.spinner("Searching..."):
-        all_students = APIClient.get_students()
-
-    if not all_students or not isinstance(all_students, list):
-        st.warning("⚠️ Could not fetch data for search.")
-        return
-
-    # ── Match students ────────────────────────────────────
-    matched = []
-    for s in all_students:
-        full_name  = f"{s.get('first_name','')} {s.get('last_name','')}".lower()
-        student_id = str(s.get('student_id', '')).lower()
-        grade      = str(s.get('grade', '')).lower()
-        parent     = str(s.get('parent_name', '')).lower()
-        gender     = str(s.get('gender', '')).lower()
-
-        if any(query in field for field in
-               [full_name, student_id, grade, parent, gender]):
-            matched.append(s)
+        matched = APIClient.search_students(query, limit=SEARCH_LIMIT)
 
     # ── Render results ────────────────────────────────────
-    total = len(matched)
+    total    = len(matched)
+    cap_note = (f" — showing the top {SEARCH_LIMIT}, refine to narrow"
+                if total >= SEARCH_LIMIT else "")
 
     st.markdown(f"""
     <div style="background:#ebf8ff; border:1px solid #bee3f8;
                 border-radius:8px; padding:0.5rem 1rem;
                 margin:0.5rem 0; font-size:0.875rem; color:#2c5282;">
         🔍 Found <strong>{total}</strong> result(s) for
-        "<strong>{search_query}</strong>"
+        "<strong>{search_query}</strong>"{cap_note}
     </div>
     """, unsafe_allow_html=True)
 
@@ -0,0 +1,142 @@
+"""
+Compiled Model Parity Tests
+Checks that the numpy tree evaluator reproduces
+GradientBoostingClassifier.predict_proba to within 1e-9
+
+Run: python -m pytest tests/test_compiled_model.py -q
+"""
+import sys
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from backend.services.compiled_model import CompiledGradientBoosting, compile_model
+
+TOLERANCE = 1e-9
+N_FEATURES = 17          # same width as the production feature vector
+
+
+def make_data(n_classes, n_samples=600, seed=0):
+    X, y = make_classification(
+        n_samples=n_samples, n_features=N_FEATURES, n_informative=10,
+        n_classes=n_classes, n_clusters_per_class=1, random_state=seed
+    )
+    return X * 25 + 50, y            # feature scale similar to GPA / percentages
+
+
+def fit(n_classes, **params):
+    X, y = make_data(n_classes)
+    model = GradientBoostingClassifier(
+        n_estimators=params.pop('n_estimators', 50),
+        max_depth=params.pop('max_depth', 5),
+        random_state=42, **params
+    ).fit(X, y)
+    return model, X
+
+
+def assert_parity(model, X):
+    # max_rows=None: score every batch with the numpy arrays
+    compiled = CompiledGradientBoosting.from_sklearn(model, max_rows=None)
+    expected = model.predict_proba(X)
+    actual   = compiled.predict_proba(X)
+    assert actual.shape == expected.shape
+    assert np.max(np.abs(actual - expected)) < TOLERANCE
+    assert np.array_equal(compiled.predict(X), model.predict(X))
+
+
+def test_multiclass_parity():
+    model, X = fit(4)
+    assert_parity(model, X)
+
+
+def test_binary_parity():
+    model, X = fit(2)
+    assert_parity(model, X)
+
+
+def test_unseen_rows_parity():
+    model, _ = fit(4)
+    X_new, _ = make_data(4, n_samples=300, seed=7)
+    assert_parity(model, X_new)
+
+
+def test_single_row_parity():
+    model, X = fit(4)
+    for row in X[:20]:
+        assert_parity(model, row.reshape(1, -1))
+
+
+def test_batch_larger_than_chunk():
+    model, X = fit(4, n_estimators=10)
+    big = np.tile(X, (5, 1))          # 3000 rows → spans several chunks
+    assert_parity(model, big)
+
+
+def test_large_batches_delegate_to_model():
+    model, X = fit(4, n_estimators=10)
+    compiled = CompiledGradientBoosting.from_sklearn(model, max_rows=64)
+    assert np.array_equal(compiled.predict_proba(X), model.predict_proba(X))
+    assert np.max(np.abs(compiled.predict_proba(X[:64]) - model.predict_proba(X[:64]))) < TOLERANCE
+
+
+def test_subsample_and_learning_rate():
+    model, X = fit(4, subsample=0.7, learning_rate=0.05, max_depth=3)
+    assert_parity(model, X)
+
+
+def test_zero_init():
+    model, X = fit(4, init='zero', n_estimators=30)
+    assert_parity(model, X)
+
+
+def test_string_classes():
+    X, y = make_data(4)
+    labels = np.array(['Low', 'Medium', 'High', 'Critical'])[y]
+    model = GradientBoostingClassifier(n_estimators=20, random_state=42).fit(X, labels)
+    assert_parity(model, X)
+
+
+def test_threshold_ties_use_float32():
+    model, X = fit(4, n_estimators=20)
+    compiled = CompiledGradientBoosting.from_sklearn(model, max_rows=None)
+    # Rows sitting exactly on split thresholds exercise the <= branch
+    tree = model.estimators_[0, 0].tree_
+    split = tree.children_left != -1
+    X_ties = np.tile(X[:1], (split.sum(), 1))
+    X_ties[np.arange(split.sum()), tree.feature[split]] = tree.threshold[split]
+    assert np.max(np.abs(compiled.predict_proba(X_ties) - model.predict_proba(X_ties))) < TOLERANCE
+
+
+def test_memory_mapped_arrays_parity(tmp_path):
+    model, X = fit(4, n_estimators=20)
+    compiled = CompiledGradientBoosting.from_sklearn(model, max_rows=None)
+    arrays = {}
+    for field, array in compiled.to_arrays().items():
+        np.save(tmp_path / f"{field}.npy", array)
+        arrays[field] = np.load(tmp_path / f"{field}.npy", mmap_mode='r')
+    mapped = CompiledGradientBoosting.from_arrays(arrays, json.loads(json.dumps(compiled.params())))
+    assert all(isinstance(array, np.memmap) for array in mapped.to_arrays().values())
+    assert np.max(np.abs(mapped.predict_proba(X) - model.predict_proba(X))) < TOLERANCE
+    assert np.array_equal(mapped.predict(X), model.predict(X))
+
+
+def test_nan_rejected():
+    model, X = fit(4, n_estimators=5)
+    X = X[:3].copy()
+    X[0, 0] = np.nan
+    with pytest.raises(ValueError):
+        CompiledGradientBoosting.from_sklearn(model, max_rows=None).predict_proba(X)
+
+
+def test_unsupported_model_falls_back():
+    X, y = make_data(4)
+    forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    with pytest.raises(ValueError):
+        CompiledGradientBoosting.from_sklearn(forest)
+    assert compile_model(forest) is None
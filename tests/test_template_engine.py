@@ -0,0 +1,52 @@
+"""
+Template Engine MIME Tests
+Checks that the pre-built MIME layout parses back to the same message
+and rejects header values that would inject extra headers
+
+Run: python -m pytest tests/test_template_engine.py -q
+"""
+import sys
+from email import message_from_string
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from backend.services.template_engine import MimeLayout
+
+SENDER = 'school@example.org'
+
+
+def layout():
+    return MimeLayout(SENDER, 'ScholarSense')
+
+
+def test_build_round_trip():
+    _, raw = layout().build('p@example.org', 'Attendance ✓', 'plain body',
+                            '<b>html</b>', to_name='Parent')
+    msg = message_from_string(raw)
+    assert msg['To'] == 'Parent <p@example.org>'
+    assert msg['Bcc'] is None
+    text, html = msg.get_payload()
+    assert text.get_payload(decode=True).decode() == 'plain body'
+    assert html.get_payload(decode=True).decode() == '<b>html</b>'
+
+
+@pytest.mark.parametrize('subject', [
+    'Hello\nBcc: victim@evil.com',
+    'Hello\r\nBcc: victim@evil.com',
+    'Hello\rBcc: victim@evil.com',
+    'Héllo\nBcc: victim@evil.com',
+])
+def test_subject_line_breaks_rejected(subject):
+    with pytest.raises(ValueError):
+        layout().build('p@example.org', subject, 'body')
+
+
+def test_recipient_line_breaks_rejected():
+    with pytest.raises(ValueError):
+        layout().build('p@example.org\nBcc: victim@evil.com', 'Hello', 'body')
+    with pytest.raises(ValueError):
+        layout().build('p@example.org', 'Hello', 'body',
+                       to_name='Parent\r\nBcc: victim@evil.com')